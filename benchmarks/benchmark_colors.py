@@ -0,0 +1,36 @@
+# Measures the time it takes to convert FL Studio colors to MCU Screen Color codes, with and without the cache
+# Runs outside of FL Studio: python benchmarks/benchmark_colors.py [step], step 1 sweeps the full 24-bit color space
+
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import mcu_colors
+
+# the colors of 8 strips, as converted on every screen color update
+StripColors = [-10261391, 0x5F7581, 0xA53F3F, 0x3FA55D, 0x3F6BA5, 0xA5A23F, 0x8C3FA5, 0x3FA5A0]
+
+def RunStrips(iterations = 20000, repeat = 7):
+    """ Returns the time (in microseconds) to convert the colors of 8 strips, uncached and cached """
+    calculated = min(timeit.repeat(lambda: [mcu_colors.CalculateMcuColor(color) for color in StripColors], number = iterations, repeat = repeat))
+    cached = min(timeit.repeat(lambda: [mcu_colors.GetMcuColor(color) for color in StripColors], number = iterations, repeat = repeat))
+    return calculated / iterations * 1e6, cached / iterations * 1e6
+
+def RunSweep(step = 1):
+    """ Converts the colors of the 24-bit color space (every 'step' color), returns the number of colors and the time (in seconds) """
+    mcu_colors.McuColorCache.clear()
+    start = time.perf_counter()
+    for intValue in range(0, 1 << 24, step):
+        if mcu_colors.GetMcuColor(intValue) != mcu_colors.CalculateMcuColor(intValue):
+            raise AssertionError('Different color for ' + hex(intValue))
+    return len(range(0, 1 << 24, step)), time.perf_counter() - start
+
+if __name__ == '__main__':
+    calculated, cached = RunStrips()
+    print('8 strips, calculated {:8.2f} us'.format(calculated))
+    print('8 strips, cached     {:8.2f} us'.format(cached))
+    count, seconds = RunSweep(int(sys.argv[1]) if len(sys.argv) > 1 else 17)
+    print('sweep of {} colors, all equal, {:.2f} us/color'.format(count, seconds / count * 1e6))
@@ -0,0 +1,89 @@
+# Measures how bank and page changes scale with the number of extenders (1 to 8), in the FL Studio simulator
+# Reports the outgoing messages (including dispatches to the extenders), FL Studio API calls and callback time per extender count
+# and flags the scenarios where the cost of an extra extender grows (superlinear growth)
+#
+#   python benchmarks/benchmark_extender_scaling.py
+
+import collections
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__))) # for the other benchmarks, also when imported by the tests
+
+from benchmark_midi_traffic import Setup, FaderBankLeftButton, FaderBankRightButton, PanButton, PageNames
+from benchmark_refresh_calls import CountCalls
+
+ExtenderCounts = range(1, 9)
+GrowthTolerance = 1.5 # an extra extender may cost this much more than the first extra extender did
+CheckedMetrics = ['messages', 'apiCalls'] # the callback time depends on the machine, it's reported but not checked
+
+Scenarios = dict([
+    ('bank left', FaderBankLeftButton),
+    ('bank right', FaderBankRightButton),
+] + [('page ' + PageNames[page], PanButton + page) for page in range(0, len(PageNames))])
+
+def Measure(extenderCount: int, button: int) -> dict:
+    """ Presses a button on the main unit and returns the cost of handling it on all devices """
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup = Setup(extenderCount)
+        try:
+            setup.simulator.Init()
+            if button >= PanButton and button < PanButton + len(PageNames):
+                # start from another page
+                setup.PressButton(setup.main, PanButton + (button - PanButton + 1) % len(PageNames))
+            setup.Settle()
+            counts = collections.Counter()
+            CountCalls(counts)
+            setup.simulator.ClearOutput()
+            start = time.perf_counter()
+            setup.PressButton(setup.main, button)
+            setup.Settle()
+            seconds = time.perf_counter() - start
+            return {
+                'messages': sum(len(device.output) for device in setup.devices),
+                'apiCalls': sum(counts.values()),
+                'callbackTimeMs': round(seconds * 1000, 3),
+            }
+        finally:
+            setup.Close()
+
+def Run() -> dict:
+    """ Returns scenario name -> extender count -> metrics """
+    return dict((name, dict((extenderCount, Measure(extenderCount, button)) for extenderCount in ExtenderCounts)) for name, button in Scenarios.items())
+
+def FindSuperlinearGrowth(values: list, tolerance: float = GrowthTolerance) -> list:
+    """
+    Returns the indices of the values that grew more than the first step did (times the tolerance)
+    values are the costs for 1, 2, 3, ... extenders, with linear growth every extender adds about the same cost
+    """
+    firstStep = max(values[1] - values[0], 1) if len(values) > 1 else 0
+    return [n for n in range(2, len(values)) if values[n] - values[n - 1] > firstStep * tolerance]
+
+def CheckScaling(results: dict, metrics = CheckedMetrics) -> list:
+    """ Returns a description of every scenario and metric that grows superlinearly with the number of extenders """
+    failures = []
+    for name, byExtenderCount in results.items():
+        extenderCounts = sorted(byExtenderCount.keys())
+        for metric in metrics:
+            values = [byExtenderCount[extenderCount][metric] for extenderCount in extenderCounts]
+            for n in FindSuperlinearGrowth(values):
+                failures.append('{}: {} grows from {} to {} with {} extenders'.format(name, metric, values[n - 1], values[n], extenderCounts[n]))
+    return failures
+
+def main():
+    results = Run()
+    for name, byExtenderCount in results.items():
+        print(name)
+        for extenderCount, result in byExtenderCount.items():
+            print('  {} extender(s) {:6} messages {:6} API calls {:10.2f} ms'.format(extenderCount, result['messages'], result['apiCalls'], result['callbackTimeMs']))
+    failures = CheckScaling(results)
+    for failure in failures:
+        print('Superlinear: ' + failure)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
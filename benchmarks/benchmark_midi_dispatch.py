@@ -0,0 +1,182 @@
+# Measures the time it takes OnMidiMsg to handle a single incoming MIDI event, with the dispatch table and with the if/elif chain it replaced
+# Runs outside of FL Studio using the FL Studio API stubs (see requirements.txt): python benchmarks/benchmark_midi_dispatch.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import midi
+
+import mcu_buttons
+import device_XTouch
+
+class MidiEvent:
+    """ Minimal stand-in for the event object FL Studio passes to OnMidiMsg """
+
+    def __init__(self, midiId, midiChan, data1, data2, pmeFlags = midi.PME_System | midi.PME_System_Safe):
+        self.midiId = midiId
+        self.status = midiId + midiChan
+        self.midiChan = midiChan
+        self.midiChanEx = midiChan
+        self.data1 = data1
+        self.data2 = data2
+        self.pmeFlags = pmeFlags
+        self.handled = False
+        self.inEv = 0
+        self.outEv = 0
+        self.isIncrement = 0
+
+Scenarios = {
+    'jog wheel': (midi.MIDI_CONTROLCHANGE, 0, 0x3C, 0x01),
+    'knob turn': (midi.MIDI_CONTROLCHANGE, 0, 0x13, 0x41),
+    'fader move': (midi.MIDI_PITCHBEND, 3, 0x00, 0x40),
+    'fader touch': (midi.MIDI_NOTEON, 0, mcu_buttons.Slider_4, 0x7F),
+    'play button': (midi.MIDI_NOTEON, 0, mcu_buttons.Play, 0x7F),
+    'mute button': (midi.MIDI_NOTEON, 0, mcu_buttons.Mute_2, 0x7F),
+    'unknown CC': (midi.MIDI_CONTROLCHANGE, 0, 0x70, 0x01),
+}
+
+def BaselineOnMidiMsg(self, event):
+    """
+    The if/elif chain TMackieCU.OnMidiMsg used before the dispatch table, with the same tests in the same order
+    The actions are replaced by the current handlers, so only the dispatch differs from TMackieCU.OnMidiMsg
+    """
+    if (event.midiId == midi.MIDI_CONTROLCHANGE):
+        if event.data1 == 0x3C:
+            self.OnJogWheel(event)
+        # knobs
+        elif event.data1 in [0x10, 0x11, 0x12, 0x13, 0x14, 0x15, 0x16, 0x17]:
+            self.OnEncoderTurn(event)
+        else:
+            self.OnUnknownControlChange(event)
+
+    elif event.midiId == midi.MIDI_PITCHBEND: # pitch bend (faders)
+        if event.midiChan <= 8:
+            self.OnFaderMove(event)
+
+    elif (event.midiId == midi.MIDI_NOTEON) | (event.midiId == midi.MIDI_NOTEOFF):  # NOTE
+        if event.midiId == midi.MIDI_NOTEON:
+            # slider hold
+            if (event.data1 in [mcu_buttons.Slider_1, mcu_buttons.Slider_2, mcu_buttons.Slider_3, mcu_buttons.Slider_4, mcu_buttons.Slider_5, mcu_buttons.Slider_6, mcu_buttons.Slider_7, mcu_buttons.Slider_8, mcu_buttons.Slider_Main]):
+                self.OnFaderTouch(event)
+                return
+
+            if (event.pmeFlags & midi.PME_System != 0):
+                # F1..F8
+                if self.Shift & (event.data1 in [mcu_buttons.Cut, mcu_buttons.Copy, mcu_buttons.Paste, mcu_buttons.Insert, mcu_buttons.Delete, mcu_buttons.ItemMenu, mcu_buttons.Undo, mcu_buttons.UndoRedo]):
+                    self.OnFunctionKeyButton(event)
+
+                if event.data1 == mcu_buttons.NameValue:
+                    self.OnNameValueButton(event)
+                elif event.data1 == mcu_buttons.TimeFormat:
+                    self.OnTimeFormatButton(event)
+                elif (event.data1 == mcu_buttons.FaderBankLeft) | (event.data1 == mcu_buttons.FaderBankRight):
+                    self.OnFaderBankButton(event)
+                elif (event.data1 == mcu_buttons.FaderChannelLeft) | (event.data1 == mcu_buttons.FaderChannelRight):
+                    self.OnFaderChannelButton(event)
+                elif event.data1 == mcu_buttons.Flip:
+                    self.OnFlipButton(event)
+                elif event.data1 == mcu_buttons.Smooth:
+                    self.OnSmoothButton(event)
+                elif event.data1 == mcu_buttons.Scrub:
+                    self.OnScrubButton(event)
+                elif event.data1 in [mcu_buttons.Undo, mcu_buttons.Pattern, mcu_buttons.Mixer, mcu_buttons.Channels, mcu_buttons.Tempo, mcu_buttons.Free1, mcu_buttons.Free2, mcu_buttons.Free3, mcu_buttons.Free4, mcu_buttons.Marker, mcu_buttons.Zoom, mcu_buttons.Move, mcu_buttons.Window]:
+                    self.OnJogSourceButton(event)
+                elif event.data1 in [mcu_buttons.Up, mcu_buttons.Down, mcu_buttons.Left, mcu_buttons.Right]:
+                    self.OnArrowButton(event)
+                elif event.data1 in [mcu_buttons.Pan, mcu_buttons.Sends, mcu_buttons.Equalizer, mcu_buttons.Stereo, mcu_buttons.Effects, mcu_buttons.Free]:
+                    self.OnPageButton(event)
+                elif event.data1 == mcu_buttons.Shift:
+                    self.OnShiftButton(event)
+                elif event.data1 == mcu_buttons.Edison:
+                    self.OnEdisonButton(event)
+                elif event.data1 == mcu_buttons.Metronome:
+                    self.OnMetronomeButton(event)
+                elif event.data1 == mcu_buttons.CountDown:
+                    self.OnCountDownButton(event)
+                elif event.data1 in [mcu_buttons.Cut, mcu_buttons.Copy, mcu_buttons.Paste, mcu_buttons.Insert, mcu_buttons.Delete]:
+                    self.OnCutCopyPasteButton(event)
+                elif (event.data1 == mcu_buttons.Rewind) | (event.data1 == mcu_buttons.FastForward):
+                    self.OnRewindFastForwardButton(event)
+                elif event.data1 == mcu_buttons.Stop:
+                    self.OnStopButton(event)
+                elif event.data1 == mcu_buttons.Play:
+                    self.OnPlayButton(event)
+                elif event.data1 == mcu_buttons.Record:
+                    self.OnRecordButton(event)
+                elif event.data1 == mcu_buttons.SongVSLoop:
+                    self.OnSongVSLoopButton(event)
+                elif event.data1 == mcu_buttons.Mode:
+                    self.OnModeButton(event)
+                elif event.data1 == mcu_buttons.Snap:
+                    self.OnSnapButton(event)
+                elif event.data1 == mcu_buttons.Escape:
+                    self.OnEscapeButton(event)
+                elif event.data1 == mcu_buttons.Enter:
+                    self.OnEnterButton(event)
+                elif event.data1 in [mcu_buttons.Encoder_1, mcu_buttons.Encoder_2, mcu_buttons.Encoder_3, mcu_buttons.Encoder_4, mcu_buttons.Encoder_5, mcu_buttons.Encoder_6, mcu_buttons.Encoder_7, mcu_buttons.Encoder_8]:
+                    if self.OnEncoderPress(event):
+                        return
+                elif (event.data1 >= 0) & (event.data1 <= 0x1F): # free hold buttons
+                    if self.OnFreeButton(event):
+                        return
+
+                if (event.pmeFlags & midi.PME_System_Safe != 0):
+                    if event.data1 == mcu_buttons.LinkChannel:
+                        self.OnLinkChannelButton(event)
+                    elif event.data1 == mcu_buttons.Browser:
+                        self.OnBrowserButton(event)
+                    elif event.data1 == mcu_buttons.StepSequencer:
+                        self.OnStepSequencerButton(event)
+                    elif event.data1 == mcu_buttons.Menu:
+                        self.OnMenuButton(event)
+                    elif event.data1 == mcu_buttons.ItemMenu:
+                        self.OnItemMenuButton(event)
+                    elif event.data1 == mcu_buttons.UndoRedo:
+                        self.OnUndoRedoButton(event)
+                    elif event.data1 in [mcu_buttons.In, mcu_buttons.Out, mcu_buttons.Select]:
+                        self.OnPunchButton(event)
+                    elif event.data1 == mcu_buttons.AddMarker:
+                        self.OnAddMarkerButton(event)
+                    elif (event.data1 >= mcu_buttons.Select_1) & (event.data1 <= mcu_buttons.Select_8):
+                        self.OnSelectButton(event)
+                    elif (event.data1 >= mcu_buttons.Solo_1) & (event.data1 <= mcu_buttons.Solo_8):
+                        self.OnSoloButton(event)
+                    elif (event.data1 >= mcu_buttons.Mute_1) & (event.data1 <= mcu_buttons.Mute_8):
+                        self.OnMuteButton(event)
+                    elif (event.data1 >= mcu_buttons.Record_1) & (event.data1 <= mcu_buttons.Record_8):
+                        self.OnArmButton(event)
+                    elif event.data1 == mcu_buttons.Save:
+                        self.OnSaveButton(event)
+
+                    event.handled = True
+            else:
+                event.handled = False
+        else:
+            event.handled = False
+
+Implementations = {
+    'if/elif chain': lambda event: BaselineOnMidiMsg(device_XTouch.MackieCU, event),
+    'dispatch table': lambda event: device_XTouch.MackieCU.OnMidiMsg(event),
+}
+
+def Run(iterations = 20000, repeat = 7):
+    """
+    Returns the time (in microseconds) per event for each scenario and implementation, best of a few runs to reduce noise
+    The runs of the implementations are interleaved, so a change in CPU speed affects all of them alike
+    """
+    results = {}
+    for name, (midiId, midiChan, data1, data2) in Scenarios.items():
+        results[name] = { implementation: float('inf') for implementation in Implementations.keys() }
+        for run in range(0, repeat):
+            for implementation, onMidiMsg in Implementations.items():
+                seconds = timeit.timeit(lambda: onMidiMsg(MidiEvent(midiId, midiChan, data1, data2)), number = iterations)
+                results[name][implementation] = min(results[name][implementation], seconds / iterations * 1e6)
+    return results
+
+if __name__ == '__main__':
+    print('{:<12} {:>16} {:>16}'.format('', *Implementations.keys()))
+    for name, byImplementation in Run().items():
+        print('{:<12} {:10.2f} us/event {:10.2f} us/event'.format(name, *byImplementation.values()))
@@ -0,0 +1,188 @@
+# Drives the main unit and an extender through common scenarios in the FL Studio simulator (see simulator/fl_simulator.py)
+# Reports the outgoing messages, sysex bytes and wall time per scenario and fails when a scenario exceeds its budget
+#
+#   python benchmarks/benchmark_midi_traffic.py [--json results.json] [--update-budgets]
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import midi
+
+from simulator import fl_simulator
+
+BudgetsFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'midi_traffic_budgets.json')
+BudgetHeadroom = 1.1 # budgets are written 10% above the measured traffic
+
+# button numbers, from mcu_buttons (which can only be imported inside the simulator)
+PanButton = 0x28
+FaderBankLeftButton = 0x2E
+FaderBankRightButton = 0x2F
+FlipButton = 0x32
+Slider1Button = 0x68
+
+PageNames = ['Pan', 'Stereo', 'Sends', 'Effects', 'Equalizer', 'Free'] # in mcu_pages order
+
+class Setup:
+    """ A simulated FL Studio project with a main unit and an extender """
+
+    def __init__(self, extenderCount: int = 1, trackCount: int = 127):
+        self.simulator = fl_simulator.FlSimulator(trackCount)
+        self.main = self.simulator.LoadScript('device_XTouch.py')
+        self.extenders = [self.simulator.LoadScript('device_XTouch_Ext.py', 'device_XTouch_Ext_' + str(n + 1), self.main) for n in range(0, extenderCount)]
+
+        # a project that doesn't look the same on every strip
+        randomizer = random.Random(1)
+        mixer = self.simulator.state.mixer
+        for track in mixer.tracks[1:]:
+            track.name = randomizer.choice(['Kick', 'Snare', 'Hats', 'Bass', 'Lead', 'Pad', 'Vocals', 'Insert ' + str(track.index)])
+            track.color = randomizer.randrange(0, 1 << 24)
+            track.routes = set([0] + ([randomizer.randrange(1, len(mixer.tracks))] if randomizer.random() < 0.2 else []))
+            mixer.SetEventValue(mixer.GetTrackPluginId(track.index, 0) + midi.REC_Mixer_Vol, randomizer.randrange(0, midi.FromMIDI_Max))
+            mixer.SetEventValue(mixer.GetTrackPluginId(track.index, 0) + midi.REC_Mixer_Pan, randomizer.randrange(0, midi.FromMIDI_Max))
+        mixer.tracks[0].plugins = { 0: 'Fruity Limiter', 1: 'Fruity Parametric EQ 2' }
+
+    @property
+    def devices(self):
+        return self.simulator.devices
+
+    def PressButton(self, device, button: int):
+        self.simulator.SendMidi(device, midi.MIDI_NOTEON, 0, button, 0x7F)
+        self.simulator.SendMidi(device, midi.MIDI_NOTEON, 0, button, 0x00)
+
+    def Settle(self):
+        """ Lets FL Studio handle the refreshes and idle calls that follow a change """
+        self.simulator.Run(0.1)
+
+    def Close(self):
+        self.simulator.Close()
+
+def Measure(setup: Setup, action) -> dict:
+    """ Runs the action and returns the traffic it caused on all devices """
+    setup.simulator.ClearOutput()
+    start = time.perf_counter()
+    action()
+    seconds = time.perf_counter() - start
+    output = [message for device in setup.devices for message in device.output]
+    return {
+        'messages': len(output),
+        'sysexMessages': len([message for message in output if message.kind == 'sysex']),
+        'sysexBytes': sum(message.size for message in output if message.kind == 'sysex'),
+        'bytes': sum(message.size for message in output),
+        'wallTimeMs': round(seconds * 1000, 3),
+    }
+
+def ScenarioInit(setup: Setup):
+    return Measure(setup, setup.simulator.Init)
+
+def ScenarioBank(button: int):
+    def Scenario(setup: Setup):
+        setup.simulator.Init()
+        return Measure(setup, lambda: (setup.PressButton(setup.main, button), setup.Settle()))
+    return Scenario
+
+def ScenarioPage(page: int):
+    def Scenario(setup: Setup):
+        setup.simulator.Init()
+        # start from another page, the mixer starts on the pan page
+        setup.PressButton(setup.main, PanButton + (page + 1) % len(PageNames))
+        setup.Settle()
+        return Measure(setup, lambda: (setup.PressButton(setup.main, PanButton + page), setup.Settle()))
+    return Scenario
+
+def ScenarioFlip(setup: Setup):
+    setup.simulator.Init()
+    return Measure(setup, lambda: (setup.PressButton(setup.main, FlipButton), setup.Settle()))
+
+def ScenarioMeterStream(setup: Setup):
+    """ 10 seconds of playback with signal on every track """
+    setup.simulator.Init()
+    for track in setup.simulator.state.mixer.tracks:
+        track.peaks = lambda now, phase = track.index: 0.5 + 0.5 * math.sin(now * 3 + phase)
+    return Measure(setup, lambda: setup.simulator.Run(10))
+
+def ScenarioFaderSweep(setup: Setup):
+    """ Moves the first fader of the main unit from bottom to top in half a second, 4 moves per idle tick """
+    setup.simulator.Init()
+    def Sweep():
+        simulator = setup.simulator
+        simulator.SendMidi(setup.main, midi.MIDI_NOTEON, 0, Slider1Button, 0x7F)
+        for step in range(0, 100):
+            value = round(step * 0x3FFF / 99)
+            simulator.SendMidi(setup.main, midi.MIDI_PITCHBEND, 0, value & 0x7F, value >> 7)
+            if step % 4 == 3:
+                simulator.Run(0.02)
+        simulator.SendMidi(setup.main, midi.MIDI_NOTEON, 0, Slider1Button, 0x00)
+        setup.Settle()
+    return Measure(setup, Sweep)
+
+Scenarios = dict([
+    ('init', ScenarioInit),
+    ('bank left', ScenarioBank(FaderBankLeftButton)),
+    ('bank right', ScenarioBank(FaderBankRightButton)),
+] + [('page ' + PageNames[page], ScenarioPage(page)) for page in range(0, len(PageNames))] + [
+    ('flip', ScenarioFlip),
+    ('meter stream', ScenarioMeterStream),
+    ('fader sweep', ScenarioFaderSweep),
+])
+
+def Run(extenderCount: int = 1) -> dict:
+    """ Runs all scenarios, every scenario gets a fresh project """
+    results = {}
+    for name, scenario in Scenarios.items():
+        # the scripts print to the script output window, which isn't of interest here
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup = Setup(extenderCount)
+            try:
+                results[name] = scenario(setup)
+            finally:
+                setup.Close()
+    return results
+
+def LoadBudgets() -> dict:
+    with open(BudgetsFile) as file:
+        return json.load(file)
+
+def CheckBudgets(results: dict, budgets: dict) -> list:
+    """ Returns a description of every scenario that exceeds its budget """
+    failures = []
+    for name, result in results.items():
+        for key, budget in budgets.get(name, {}).items():
+            if result[key] > budget:
+                failures.append('{}: {} {} > budget {}'.format(name, key, result[key], budget))
+    return failures
+
+def MakeBudgets(results: dict) -> dict:
+    return dict((name, { 'messages': math.ceil(result['messages'] * BudgetHeadroom), 'sysexBytes': math.ceil(result['sysexBytes'] * BudgetHeadroom) }) for name, result in results.items())
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'MIDI traffic per scenario')
+    parser.add_argument('--json', help = 'write the results to this file')
+    parser.add_argument('--update-budgets', action = 'store_true', help = 'write new budgets, based on these results')
+    args = parser.parse_args()
+
+    results = Run()
+    for name, result in results.items():
+        print('{:<16} {:6} messages {:8} sysex bytes {:10.2f} ms'.format(name, result['messages'], result['sysexBytes'], result['wallTimeMs']))
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent = 4)
+
+    if args.update_budgets:
+        with open(BudgetsFile, 'w') as file:
+            json.dump(MakeBudgets(results), file, indent = 4)
+            file.write('\n')
+    else:
+        failures = CheckBudgets(results, LoadBudgets())
+        for failure in failures:
+            print('Over budget: ' + failure)
+        sys.exit(1 if failures else 0)
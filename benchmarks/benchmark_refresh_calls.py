@@ -0,0 +1,101 @@
+# Counts the FL Studio API calls (state queries) that one OnRefresh call makes, compared with the refresh before the refresh cycle was optimized:
+# without the mixer snapshot (see mcu_mixer_snapshot.py) and re-reading the values of every strip on a mixer display refresh (see UpdateColT)
+# Also lists the calls that a device still makes more than once with the same arguments during one refresh (there should be none)
+#
+#   python benchmarks/benchmark_refresh_calls.py
+
+import collections
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__))) # for the other benchmarks, also when imported by the tests
+
+import midi
+
+import mcu_dirty_flags
+from benchmark_midi_traffic import Setup
+
+FlModules = ['device', 'general', 'mixer', 'transport', 'ui']
+OutputFunctions = ['midiOutMsg', 'midiOutNewMsg', 'midiOutSysex', 'dispatch', 'hardwareRefreshMixerTrack']
+
+Scenarios = [
+    ('Mixer_Display | Mixer_Controls', midi.HW_Dirty_Mixer_Display | midi.HW_Dirty_Mixer_Controls),
+    ('Mixer_Sel', midi.HW_Dirty_Mixer_Sel),
+    ('LEDs', midi.HW_Dirty_LEDs),
+    ('all', midi.HW_Dirty_Mixer_Sel | midi.HW_Dirty_Mixer_Display | midi.HW_Dirty_Mixer_Controls | midi.HW_Dirty_LEDs),
+]
+
+def CountCalls(counts: collections.Counter, withArgs: bool = False):
+    """ Replaces the functions of the fake FL Studio modules by functions that count their calls, per function name or per (function name, arguments) """
+    for moduleName in FlModules:
+        module = sys.modules[moduleName]
+        for name in dir(module):
+            function = getattr(module, name)
+            if name.startswith('_') or name in OutputFunctions or not callable(function) or isinstance(function, type):
+                continue
+            def CountingFunction(*args, function = function, name = moduleName + '.' + name, **kwargs):
+                counts[(name, args) if withArgs else name] += 1
+                return function(*args, **kwargs)
+            setattr(module, name, CountingFunction)
+
+def Run():
+    """ Returns scenario name -> (calls before the optimization, calls now) """
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup = Setup()
+        try:
+            setup.simulator.Init()
+            setup.Settle()
+            counts = collections.Counter()
+            CountCalls(counts)
+            for name, flags in Scenarios:
+                calls = []
+                for optimized in [False, True]:
+                    counts.clear()
+                    for device in setup.devices:
+                        if optimized:
+                            setup.simulator.Call(device, 'OnRefresh', flags)
+                        else:
+                            script = getattr(device.script, 'MackieCU', None) or getattr(device.script, 'MackieCU_Ext')
+                            if flags & midi.HW_Dirty_Mixer_Display:
+                                script.SetDirtyFlags(mcu_dirty_flags.Values) # UpdateColT used to re-read every strip
+                            # the method of the script object, which isn't wrapped in a refresh cycle
+                            setup.simulator.Call(device, None, script.OnRefresh, flags)
+                    calls.append(sum(counts.values()))
+                results[name] = tuple(calls)
+        finally:
+            setup.Close()
+    return results
+
+def FindRepeatedCalls() -> dict:
+    """ Returns scenario name -> the (function name, arguments) that a device called more than once during one refresh """
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup = Setup()
+        try:
+            setup.simulator.Init()
+            setup.Settle()
+            counts = collections.Counter()
+            CountCalls(counts, withArgs = True)
+            for name, flags in Scenarios:
+                results[name] = []
+                for device in setup.devices:
+                    counts.clear()
+                    setup.simulator.Call(device, 'OnRefresh', flags)
+                    results[name] += [call for call, count in counts.items() if count > 1]
+        finally:
+            setup.Close()
+    return results
+
+def main():
+    for name, (before, now) in Run().items():
+        print('{:32} {:5} calls before {:5} calls now ({:.0%} fewer)'.format(name, before, now, 1 - now / before))
+    for name, calls in FindRepeatedCalls().items():
+        for function, args in calls:
+            print('{}: {}{} is called more than once'.format(name, function, args))
+
+if __name__ == '__main__':
+    main()
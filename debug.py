@@ -3,6 +3,12 @@
 def PrintMidiInfo(Event):  # quick code to see info about particular midi control (check format function in python)
 	print("EVENT (handled: {}, timestamp: {}, status: {}, data1: {}, data2: {}, port: {}, sysex: {}, midiId: {}, midiChan: {}, midiChanEx: {}, isIncrement: {}, inEv: {}, outEv: {}, controlNum: {}, controlVal: {}, res: {}, note:{})".format(Event.handled, Event.timestamp, Event.status, Event.data1, Event.data2, Event.port, HexIt(Event.sysex), Event.midiId, Event.midiChan, Event.midiChanEx, Event.isIncrement, Event.inEv, Event.outEv, Event.controlNum, Event.controlVal, Event.res, Event.note))
 
+def PrintCallbackTimings(callbackTiming):  # prints the timings of the callbacks (see mcu_callback_timing)
+	print("{:<28} {:>8} {:>10} {:>10} {:>10} {:>10}".format("CALLBACK", "CALLS", "MIN (us)", "MEAN (us)", "P99 (us)", "MAX (us)"))
+	for name in callbackTiming.GetNames():
+		count, minimum, mean, p99, maximum = callbackTiming.GetStats(name)
+		print("{:<28} {:>8} {:>10.0f} {:>10.0f} {:>10.0f} {:>10.0f}".format(name, count, minimum * 1e6, mean * 1e6, p99 * 1e6, maximum * 1e6))
+
 def HexIt(SysEx):  # turns whatever is given to hexadecimal number, if it's not something you can turn, returns none
 		if SysEx:
 			return SysEx.hex()
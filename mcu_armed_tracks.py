@@ -0,0 +1,49 @@
+import mixer
+
+class McuArmedTracks:
+    """
+    Keeps track of the mixer tracks that are armed for recording, so it's known if any track is armed without asking FL Studio for every track
+    Tracks are updated one by one when they change, a full reconcile (from OnIdle) catches changes that weren't reported
+    """
+
+    def __init__(self, reconcileInterval: float):
+        self.ReconcileInterval = reconcileInterval # time between full reconciles (in seconds)
+        self.__armed = set()
+        self.__reconcilePending = True
+        self.__lastReconcileTime = 0
+
+    @property
+    def isAnyArmed(self) -> bool:
+        """ Whether or not any track is armed for recording """
+        return len(self.__armed) > 0
+
+    def IsArmed(self, trackNum: int) -> bool:
+        """ Whether or not a track is armed for recording, as of its last update or reconcile """
+        return trackNum in self.__armed
+
+    def Update(self, trackNum: int) -> bool:
+        """ Updates the armed state of a track, returns True when isAnyArmed changed """
+        wasAnyArmed = self.isAnyArmed
+        if mixer.isTrackArmed(trackNum):
+            self.__armed.add(trackNum)
+        else:
+            self.__armed.discard(trackNum)
+        return self.isAnyArmed != wasAnyArmed
+
+    def Invalidate(self):
+        """ Lets the next ReconcileIfDue call do a full reconcile (e.g. when all tracks have changed) """
+        self.__reconcilePending = True
+
+    def Reconcile(self) -> bool:
+        """ Checks all tracks, returns True when isAnyArmed changed """
+        wasAnyArmed = self.isAnyArmed
+        self.__armed = set(trackNum for trackNum in range(0, mixer.trackCount()) if mixer.isTrackArmed(trackNum))
+        self.__reconcilePending = False
+        return self.isAnyArmed != wasAnyArmed
+
+    def ReconcileIfDue(self, now: float) -> bool:
+        """ Does a full reconcile when one is pending or the interval has passed, returns True when isAnyArmed changed """
+        if not self.__reconcilePending and now - self.__lastReconcileTime < self.ReconcileInterval:
+            return False
+        self.__lastReconcileTime = now
+        return self.Reconcile()
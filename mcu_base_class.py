@@ -8,26 +8,39 @@ import transport
 import general
 import channels
 
+import debug
+import mcu_buttons
+import mcu_callback_timing
 import mcu_constants
 import mcu_device
+import mcu_device_fader_conversion
 import mcu_track
+import mcu_dirty_flags
 import mcu_pages
 import mcu_knob_mode
+import mcu_message_overlay
+import mcu_mixer_snapshot
+import mcu_refresh_transaction
+import mcu_routing_matrix
+import mcu_strip_plans
+import mcu_track_colors
 import tracknames
 
 class McuBaseClass():
     """ Shared base class for both the extender and the main mackie unit """
 
     def __init__(self, device: mcu_device.McuDevice):
-        self.MsgT = ["", ""]
+        self.MessageOverlay = mcu_message_overlay.McuMessageOverlay() # the text on the message row
         self.Tracks = [mcu_track.McuTrack() for i in range(0)] # empty array, since "import typing" is not supported
 
         self.Shift = False # indicates that the shift button is pressed
-        self.MsgDirty = False
 
         self.FirstTrack = 0 # the count mode for the tracks (0 = normal, 1 = free mode)
         self.FirstTrackT = [0, 0]
 
+        self.TrackSlots = {} # mixer track number -> indexes of the strips showing that track, rebuilt by UpdateColT
+        self.DirtyMixerTracks = set() # the mixer tracks reported by OnDirtyMixerTrack since the last refresh (-1 = all tracks), see InvalidateMixerCaches
+
         self.FreeCtrlT = [0 for x in range(mcu_constants.FreeTrackCount + 1)]  # 64+1 sliders
         self.Clicking = False
 
@@ -35,8 +48,25 @@ class McuBaseClass():
         self.Flip = False
         
         self.SmoothSpeed = 0
+        self.IsRecording = False
+
+        self.PendingFaderMoves = {} # fader index -> (event id, value, name), only the latest move per fader is sent to FL Studio, see FlushFaderMoves
+        self.LastFaderFlushTime = 0
 
         self.McuDevice = device
+        self.Snapshot = mcu_mixer_snapshot.McuMixerSnapshot() # FL Studio state, fetched once per refresh cycle
+        self.RefreshTransaction = mcu_refresh_transaction.McuRefreshTransaction(self.FlushUpdates) # coalesces the updates of page, bank & flip changes
+        self.StripPlans = mcu_strip_plans.McuStripPlans(mcu_constants.StripPlanCacheSize) # the strip settings per page & bank, prefetched from OnIdle
+        self.TrackColors = mcu_track_colors.McuTrackColors()
+        self.RoutingMatrix = mcu_routing_matrix.McuRoutingMatrix(mcu_constants.RoutingMatrixCacheSize) # the sends, for the Sends page
+
+        self.CallbackTiming = mcu_callback_timing.McuCallbackTiming(mcu_constants.CallbackTimingEnabled)
+        self.CallbackTimingPage = -1 # the callback that's shown on the display, see ShowNextCallbackTiming
+
+        # dispatch tables for incoming MIDI messages, see BuildMidiHandlers
+        self.ControlChangeHandlers = [] # data1 -> handler
+        self.NoteOnHandlers = ([], []) # shift state -> data1 -> handler
+        self.BuildMidiHandlers()
 
     def OnInit(self):
         """ Called when the script has been started """
@@ -51,8 +81,11 @@ class McuBaseClass():
         for m in range(0, len(self.FreeCtrlT)):
             self.FreeCtrlT[m] = 8192 
 
+        tracknames.InvalidateTrackNames()
+
         # init hardware
         self.McuDevice.Initialize()
+        self.SetDirtyFlags(mcu_dirty_flags.All) # the device forgot everything
         self.McuDevice.SetBackLightTimeout(2) # backlight timeout to 2 minutes
         self.McuDevice.SetClicking(self.Clicking)
 
@@ -69,17 +102,68 @@ class McuBaseClass():
             self.McuDevice.SetTextDisplay('', 1, skipIsAssignedCheck = True)
             self.McuDevice.SetScreenColors(skipIsAssignedCheck = True)
 
+        self.McuDevice.FlushOutput(ignoreLimit = True)
+
     def OnDirtyMixerTrack(self, SetTrackNum):
         """
         Called on mixer track(s) change, 'SetTrackNum' indicates track index of track that changed or -1 when all tracks changed
         collect info about 'dirty' tracks here but do not handle track(s) refresh, wait for OnRefresh event with HW_Dirty_Mixer_Controls flag
         """
-        for m in range(0, len(self.Tracks)):
-            if (self.Tracks[m].TrackNum == SetTrackNum) | (SetTrackNum == -1):
-                self.Tracks[m].Dirty = True
+        self.DirtyMixerTracks.add(SetTrackNum) # their cached names, colors, sends & strip plans are invalidated by a mixer display refresh
+        if SetTrackNum != -1 and not self.IsTrackVisible(SetTrackNum):
+            return
+
+        if SetTrackNum == -1:
+            self.SetDirtyFlags(mcu_dirty_flags.Values)
+        else:
+            # arm & solo can be changed from FL Studio or another controller as well, but they're only updated when they did change
+            armed = self.IsTrackArmed(SetTrackNum)
+            solo = mixer.isTrackSolo(SetTrackNum)
+            for m in self.TrackSlots[SetTrackNum]:
+                self.Tracks[m].DirtyFlags |= mcu_dirty_flags.Controls
+                if self.Tracks[m].Armed != armed:
+                    self.Tracks[m].DirtyFlags |= mcu_dirty_flags.Arm
+                if self.Tracks[m].Solo != solo:
+                    self.Tracks[m].DirtyFlags |= mcu_dirty_flags.Solo
+
+    def IsTrackArmed(self, trackNum: int) -> bool:
+        """ Whether or not a mixer track is armed for recording, asks FL Studio by default """
+        return mixer.isTrackArmed(trackNum)
+
+    def IsTrackVisible(self, trackNum: int) -> bool:
+        """ Whether or not a mixer track is shown on one of the strips of the device """
+        return trackNum in self.TrackSlots
+
+    def UpdateTrackSlots(self):
+        """ Rebuilds the index from mixer track number to strip, needs to be called when the tracks on the strips have changed """
+        self.TrackSlots = {}
+        for i in range(0, len(self.Tracks)):
+            self.TrackSlots.setdefault(self.Tracks[i].TrackNum, []).append(i)
+
+    def SetDirtyFlags(self, flags: int):
+        """ Marks parts of all tracks as changed (see mcu_dirty_flags) """
+        for track in self.Tracks:
+            track.DirtyFlags |= flags
+
+    def UpdateDirtyTracks(self):
+        """ Updates the parts of the tracks that have changed """
+        for n in range(0, len(self.Tracks)):
+            if self.Tracks[n].DirtyFlags & mcu_dirty_flags.Values:
+                self.UpdateTrack(n)
+
+    def UpdateRecordingState(self):
+        """ The arm buttons blink while recording, so they need to be updated when recording starts or stops """
+        isRecording = self.Snapshot.isRecording()
+        if isRecording != self.IsRecording:
+            self.IsRecording = isRecording
+            self.SetDirtyFlags(mcu_dirty_flags.Arm)
+            self.UpdateDirtyTracks()
 
     def UpdateTextDisplay(self):
         """ Updates the mixer track names and colors """
+        if self.RefreshTransaction.Defer(mcu_refresh_transaction.TextDisplay):
+            return
+
         # Update names
         s1 = ''
         for m in range(0, len(self.Tracks) - 1):
@@ -87,24 +171,36 @@ class McuBaseClass():
             if self.Page == mcu_pages.Free:
                 s = '  ' + utils.Zeros(self.Tracks[m].TrackNum + 1, 2, ' ')
             else:
-                s = tracknames.GetAsciiSafeTrackName(self.Tracks[m].TrackNum, 7)
+                if self.Tracks[m].DirtyFlags & mcu_dirty_flags.Name:
+                    self.Tracks[m].DisplayName = tracknames.GetAsciiSafeTrackName(self.Tracks[m].TrackNum, 7)
+                    self.Tracks[m].DirtyFlags &= ~mcu_dirty_flags.Name
+                s = self.Tracks[m].DisplayName
             for n in range(1, 7 - len(s) + 1):
                 s = s + ' '
             s1 = s1 + s
 
-        self.McuDevice.SetTextDisplay(s1, 1)
+        isAssigned = self.Snapshot.isAssigned()
+        if isAssigned:
+            self.McuDevice.SetTextDisplay(s1, 1, skipIsAssignedCheck = True)
 
         # Update colors
         if self.Page == mcu_pages.Free:
-            self.McuDevice.SetScreenColors() # all white
+            if isAssigned:
+                self.McuDevice.SetScreenColors(skipIsAssignedCheck = True) # all white
         else:
             colorArr = []
             for m in range(0, len(self.Tracks) - 1):
-                c = mixer.getTrackColor(self.Tracks[m].TrackNum)
-                colorArr.append(c)
-            self.McuDevice.SetScreenColors(colorArr)
+                if self.Tracks[m].DirtyFlags & mcu_dirty_flags.Color:
+                    self.Tracks[m].Color = self.TrackColors.Get(self.Tracks[m].TrackNum)
+                    self.Tracks[m].DirtyFlags &= ~mcu_dirty_flags.Color
+                colorArr.append(self.Tracks[m].Color)
+            if isAssigned:
+                self.McuDevice.SetScreenColors(colorArr, skipIsAssignedCheck = True)
 
     def UpdateMeterMode(self):
+        if self.RefreshTransaction.Defer(mcu_refresh_transaction.MeterMode):
+            return
+
         self.McuDevice.ClearMeters()
         self.McuDevice.DisableMeters() #TODO: check if it's actually required to disable and then enable again here
 
@@ -112,135 +208,248 @@ class McuBaseClass():
         self.UpdateTextDisplay()
         self.McuDevice.EnableMeters()
 
+    def UpdateMasterSectionLEDs(self):
+        """ Updates the LEDs on the master section (the extender doesn't have one) """
+        pass
+
+    def UpdateExtenderLayout(self):
+        """ Lets the extenders know which tracks to show (only the main unit has extenders) """
+        pass
+
+    def InvalidateMixerCaches(self):
+        """
+        Called when the mixer display has changed (names, colors, routing, plugins), the cached names, colors, sends & strip plans of the tracks
+        that FL Studio reported (see OnDirtyMixerTrack) need to be fetched again, those of the other tracks (e.g. of the adjacent banks) are kept
+        """
+        if len(self.DirtyMixerTracks) == 0 or -1 in self.DirtyMixerTracks:
+            # all tracks have changed, or FL Studio didn't report which ones
+            tracknames.InvalidateTrackNames()
+            self.TrackColors.Invalidate()
+            self.RoutingMatrix.Invalidate()
+            self.StripPlans.Invalidate()
+        else:
+            for trackNum in self.DirtyMixerTracks:
+                tracknames.InvalidateTrackNames(trackNum)
+                self.TrackColors.Invalidate(trackNum)
+                self.RoutingMatrix.Invalidate(trackNum)
+                self.StripPlans.Invalidate(trackNum)
+
+    def FlushUpdates(self, updates: int):
+        """ Does the updates that were deferred by a refresh transaction, each of them once """
+        with self.Snapshot:
+            if updates & mcu_refresh_transaction.Strips:
+                self.UpdateColT()
+            if updates & mcu_refresh_transaction.MeterMode:
+                self.UpdateMeterMode() # includes the text display
+            elif updates & mcu_refresh_transaction.TextDisplay:
+                self.UpdateTextDisplay()
+            if updates & mcu_refresh_transaction.MasterSectionLEDs:
+                self.UpdateMasterSectionLEDs()
+        if updates & mcu_refresh_transaction.ExtenderLayout:
+            self.UpdateExtenderLayout()
+
+    def PrefetchStripPlans(self) -> bool:
+        """
+        Builds one of the strip plans that will probably be needed next: the banks next to the current one, the other pages and
+        the tracks next to the current ones (channel left/right), the names & colors of the tracks of other banks are fetched as well
+        Returns False when all of them were cached already
+        """
+        firstTrackNum = self.FirstTrackT[self.FirstTrack]
+        trackCount = mcu_constants.FreeTrackCount if self.Page == mcu_pages.Free else self.Snapshot.trackCount()
+        candidates = [(self.Page, (firstTrackNum + offset) % trackCount) for offset in [8, -8]]
+        candidates += [(page, self.FirstTrackT[int(page == mcu_pages.Free)]) for page in range(mcu_pages.Pan, mcu_pages.Free + 1) if page != self.Page]
+        candidates += [(self.Page, (firstTrackNum + offset) % trackCount) for offset in [1, -1]]
+
+        for page, first in candidates:
+            plans = self.StripPlans.Prefetch(self.GetStripPlanKey(page, first), lambda: self.BuildStripPlans(page, first))
+            if plans is not None:
+                if page != mcu_pages.Free and first != firstTrackNum:
+                    # for the scribble strips, see UpdateTextDisplay
+                    for plan in plans[:-1]:
+                        tracknames.GetAsciiSafeTrackName(plan.TrackNum, 7)
+                        self.TrackColors.Prefetch(plan.TrackNum)
+                return True
+        return False
+
+    def PrefetchSends(self) -> bool:
+        """
+        Fetches the sends of the mixer track before or after the selected one to the tracks on the strips, so selecting it on the Sends page doesn't need to ask FL Studio
+        Returns False when both of them were cached already
+        """
+        trackCount = self.Snapshot.trackCount()
+        for source in [(self.Snapshot.trackNumber() + offset) % trackCount for offset in [1, -1]]:
+            destinations = [track.TrackNum for track in self.Tracks[:-1] if not self.RoutingMatrix.IsCached(source, track.TrackNum)]
+            if destinations:
+                sendFirstID = self.Snapshot.getTrackPluginId(source, 0) + midi.REC_Mixer_Send_First
+                for destination in destinations:
+                    self.RoutingMatrix.GetSend(source, destination, sendFirstID + destination)
+                return True
+        return False
+
     def OnUpdateMeters(self):
         """ Called when peak meters have updated values """
-        if self.Page != mcu_pages.Free:
-            for track in self.McuDevice.tracksWithMeters:
-                currentPeak = mixer.getTrackPeaks(self.Tracks[track.index].TrackNum, midi.PEAK_LR_INV)
-                track.meter.SetValue(currentPeak)
+        if self.Page != mcu_pages.Free and self.McuDevice.IsMeterUpdateDue():
+            peakValues = [mixer.getTrackPeaks(self.Tracks[track.index].TrackNum, midi.PEAK_LR_INV) for track in self.McuDevice.tracksWithMeters]
+            self.McuDevice.SetMeterValues(peakValues)
 
     def OnIdle(self):
         """ Called from time to time. Can be used to do some small tasks, mostly UI related """
-        # temp message
-        if self.MsgDirty:
+        self.FlushFaderMoves()
+
+        # messages, only the last one since the previous idle call is sent
+        if self.MessageOverlay.Update(time.time()):
             self.UpdateMsg()
-            self.MsgDirty = False
+
+        with self.Snapshot:
+            # on the Sends page, the selected track is likely to change next
+            if not (self.Page == mcu_pages.Sends and self.PrefetchSends()):
+                self.PrefetchStripPlans()
+
+        self.McuDevice.FlushOutput()
 
     def UpdateColT(self):
+        """ Sets up the strips for the current page and tracks, the strip plans are usually cached already (see mcu_strip_plans) """
+        if self.RefreshTransaction.Defer(mcu_refresh_transaction.Strips):
+            return
+
         firstTrackNum = self.FirstTrackT[self.FirstTrack]
-        CurID = mixer.getTrackPluginId(mixer.trackNumber(), 0)
+        plans = self.StripPlans.Get(self.GetStripPlanKey(self.Page, firstTrackNum), lambda: self.BuildStripPlans(self.Page, firstTrackNum))
+        for i in range(0, len(self.Tracks)):
+            previousTrackNum = self.Tracks[i].TrackNum
+            if plans[i].ApplyTo(self.Tracks[i]):
+                # the strip shows another track or other controls now, so everything needs to be updated
+                # the values of unchanged strips are still on the device, the ones that changed since are marked by OnDirtyMixerTrack
+                self.Tracks[i].DirtyFlags |= mcu_dirty_flags.Values
+                if self.Tracks[i].TrackNum != previousTrackNum:
+                    self.Tracks[i].DirtyFlags |= mcu_dirty_flags.Display
+            self.UpdateTrack(i)
+
+        self.UpdateTrackSlots()
+
+    def GetStripPlanKey(self, page: int, firstTrackNum: int):
+        """ The state the strip plans of a page & bank depend on """
+        # the other pages don't depend on the selected track, so selecting a track (e.g. by touching a fader) keeps their plans
+        selectedTrackNum = self.Snapshot.trackNumber() if page in mcu_pages.SelectedTrackPages else -1
+        return (page, firstTrackNum, selectedTrackNum, self.Flip, self.Snapshot.trackCount())
+
+    def BuildStripPlans(self, page: int, firstTrackNum: int):
+        """ Computes the event ids, names, knob modes and reset values of all strips for a page & bank """
+        if page in mcu_pages.SelectedTrackPages:
+            CurID = self.Snapshot.getTrackPluginId(self.Snapshot.trackNumber(), 0)
 
+        plans = []
         for i in range(0, len(self.Tracks)):
-            if self.Page == mcu_pages.Free:
+            plan = mcu_strip_plans.McuStripPlan()
+            if page == mcu_pages.Free:
                 # free controls
                 if i == 8:
-                    self.Tracks[i].TrackNum = mcu_constants.FreeTrackCount
+                    plan.TrackNum = mcu_constants.FreeTrackCount
                 else:
-                    self.Tracks[i].TrackNum = (firstTrackNum + i) % mcu_constants.FreeTrackCount
+                    plan.TrackNum = (firstTrackNum + i) % mcu_constants.FreeTrackCount
 
-                self.Tracks[i].KnobName = 'Knob ' + str(self.Tracks[i].TrackNum + 1)
-                self.Tracks[i].SliderName = 'Slider ' + str(self.Tracks[i].TrackNum + 1)
+                plan.KnobName = 'Knob ' + str(plan.TrackNum + 1)
+                plan.SliderName = 'Slider ' + str(plan.TrackNum + 1)
 
-                self.Tracks[i].BaseEventID = mcu_constants.FreeEventID + self.Tracks[i].TrackNum * 8 # first virtual CC
+                plan.BaseEventID = mcu_constants.FreeEventID + plan.TrackNum * 8 # first virtual CC
             else:
-                self.Tracks[i].KnobPressEventID = -1
+                plan.KnobPressEventID = -1
 
                 # mixer
                 if i == 8:
-                    self.Tracks[i].TrackNum = -2
-                    self.Tracks[i].BaseEventID = midi.REC_MainVol
-                    self.Tracks[i].SliderEventID = self.Tracks[i].BaseEventID
-                    self.Tracks[i].SliderName = 'Master Vol'
+                    plan.TrackNum = -2
+                    plan.BaseEventID = midi.REC_MainVol
+                    plan.SliderEventID = plan.BaseEventID
+                    plan.SliderName = 'Master Vol'
                 else:
-                    self.Tracks[i].TrackNum = midi.TrackNum_Master + ((firstTrackNum + i) % mixer.trackCount())
-                    self.Tracks[i].BaseEventID = mixer.getTrackPluginId(self.Tracks[i].TrackNum, 0)
-                    self.Tracks[i].SliderEventID = self.Tracks[i].BaseEventID + midi.REC_Mixer_Vol
-                    s = tracknames.GetAsciiSafeTrackName(self.Tracks[i].TrackNum)
-                    self.Tracks[i].SliderName = s + ' - Vol'
-
-                    self.Tracks[i].KnobEventID = -1
-                    self.Tracks[i].KnobResetEventID = -1
-                    self.Tracks[i].KnobResetValue = midi.FromMIDI_Max >> 1
-                    self.Tracks[i].KnobName = ''
-                    self.Tracks[i].KnobMode = mcu_knob_mode.BoostCut # parameter, pan, volume, off
-                    self.Tracks[i].KnobCenter = -1
-
-                    if self.Page == mcu_pages.Pan:
-                        self.Tracks[i].KnobEventID = self.Tracks[i].BaseEventID + midi.REC_Mixer_Pan
-                        self.Tracks[i].KnobResetEventID = self.Tracks[i].KnobEventID
-                        self.Tracks[i].KnobName = tracknames.GetAsciiSafeTrackName(self.Tracks[i].TrackNum) + ' - ' + 'Pan'
-                    elif self.Page == mcu_pages.Stereo:
-                        self.Tracks[i].KnobEventID = self.Tracks[i].BaseEventID + midi.REC_Mixer_SS
-                        self.Tracks[i].KnobResetEventID = self.Tracks[i].KnobEventID
-                        self.Tracks[i].KnobName = tracknames.GetAsciiSafeTrackName(self.Tracks[i].TrackNum) + ' - ' + 'Sep'
-                    elif self.Page == mcu_pages.Sends:
-                        self.Tracks[i].KnobEventID = CurID + midi.REC_Mixer_Send_First + self.Tracks[i].TrackNum
-                        s = mixer.getEventIDName(self.Tracks[i].KnobEventID)
-                        self.Tracks[i].KnobName = s
-                        self.Tracks[i].KnobResetValue = round(12800 * midi.FromMIDI_Max / 16000)
-                        self.Tracks[i].KnobCenter = mixer.getRouteSendActive(mixer.trackNumber(),self.Tracks[i].TrackNum)
-                        if self.Tracks[i].KnobCenter == 0:
-                            self.Tracks[i].KnobMode = mcu_knob_mode.Off
+                    plan.TrackNum = midi.TrackNum_Master + ((firstTrackNum + i) % self.Snapshot.trackCount())
+                    plan.BaseEventID = self.Snapshot.getTrackPluginId(plan.TrackNum, 0)
+                    plan.SliderEventID = plan.BaseEventID + midi.REC_Mixer_Vol
+                    s = tracknames.GetAsciiSafeTrackName(plan.TrackNum)
+                    plan.SliderName = s + ' - Vol'
+
+                    plan.KnobEventID = -1
+                    plan.KnobResetEventID = -1
+                    plan.KnobResetValue = midi.FromMIDI_Max >> 1
+                    plan.KnobName = ''
+                    plan.KnobMode = mcu_knob_mode.BoostCut # parameter, pan, volume, off
+                    plan.KnobCenter = -1
+
+                    if page == mcu_pages.Pan:
+                        plan.KnobEventID = plan.BaseEventID + midi.REC_Mixer_Pan
+                        plan.KnobResetEventID = plan.KnobEventID
+                        plan.KnobName = tracknames.GetAsciiSafeTrackName(plan.TrackNum) + ' - ' + 'Pan'
+                    elif page == mcu_pages.Stereo:
+                        plan.KnobEventID = plan.BaseEventID + midi.REC_Mixer_SS
+                        plan.KnobResetEventID = plan.KnobEventID
+                        plan.KnobName = tracknames.GetAsciiSafeTrackName(plan.TrackNum) + ' - ' + 'Sep'
+                    elif page == mcu_pages.Sends:
+                        plan.KnobEventID = CurID + midi.REC_Mixer_Send_First + plan.TrackNum
+                        plan.KnobCenter, plan.KnobName = self.RoutingMatrix.GetSend(self.Snapshot.trackNumber(), plan.TrackNum, plan.KnobEventID)
+                        plan.KnobResetValue = round(12800 * midi.FromMIDI_Max / 16000)
+                        if plan.KnobCenter == 0:
+                            plan.KnobMode = mcu_knob_mode.Off
                         else:
-                            self.Tracks[i].KnobMode = mcu_knob_mode.Wrap
-                    elif self.Page == mcu_pages.Effects:
-                        CurID = mixer.getTrackPluginId(mixer.trackNumber(), i)
-                        self.Tracks[i].KnobEventID = CurID + midi.REC_Plug_MixLevel
-                        s = mixer.getEventIDName(self.Tracks[i].KnobEventID)
-                        self.Tracks[i].KnobName = s
-                        self.Tracks[i].KnobResetValue = midi.FromMIDI_Max
-
-                        IsValid = mixer.isTrackPluginValid(mixer.trackNumber(), i)
-                        IsEnabledAuto = mixer.isTrackAutomationEnabled(mixer.trackNumber(), i)
+                            plan.KnobMode = mcu_knob_mode.Wrap
+                    elif page == mcu_pages.Effects:
+                        CurID = self.Snapshot.getTrackPluginId(self.Snapshot.trackNumber(), i)
+                        plan.KnobEventID = CurID + midi.REC_Plug_MixLevel
+                        s = mixer.getEventIDName(plan.KnobEventID)
+                        plan.KnobName = s
+                        plan.KnobResetValue = midi.FromMIDI_Max
+
+                        IsValid = mixer.isTrackPluginValid(self.Snapshot.trackNumber(), i)
+                        IsEnabledAuto = mixer.isTrackAutomationEnabled(self.Snapshot.trackNumber(), i)
                         if IsValid:
-                            self.Tracks[i].KnobMode = mcu_knob_mode.Wrap
-                            self.Tracks[i].KnobPressEventID = CurID + midi.REC_Plug_Mute
+                            plan.KnobMode = mcu_knob_mode.Wrap
+                            plan.KnobPressEventID = CurID + midi.REC_Plug_Mute
                         else:
-                            self.Tracks[i].KnobMode = mcu_knob_mode.Off
-                        self.Tracks[i].KnobCenter = int(IsValid & IsEnabledAuto)
-                    elif self.Page == mcu_pages.Equalizer:
+                            plan.KnobMode = mcu_knob_mode.Off
+                        plan.KnobCenter = int(IsValid & IsEnabledAuto)
+                    elif page == mcu_pages.Equalizer:
                         if self.McuDevice.isExtender or i >= 6:
                             # disable encoders on extenders and tracks > 6
-                            self.Tracks[i].SliderEventID = -1
-                            self.Tracks[i].KnobEventID = -1
-                            self.Tracks[i].KnobMode = mcu_knob_mode.Off
+                            plan.SliderEventID = -1
+                            plan.KnobEventID = -1
+                            plan.KnobMode = mcu_knob_mode.Off
                         elif i < 3:
                             # gain & freq
-                            self.Tracks[i].SliderEventID = CurID + midi.REC_Mixer_EQ_Gain + i
-                            self.Tracks[i].KnobResetEventID = self.Tracks[i].SliderEventID
-                            s = mixer.getEventIDName(self.Tracks[i].SliderEventID)
-                            self.Tracks[i].SliderName = s
-                            self.Tracks[i].KnobEventID = CurID + midi.REC_Mixer_EQ_Freq + i
-                            s = mixer.getEventIDName(self.Tracks[i].KnobEventID)
-                            self.Tracks[i].KnobName = s
-                            self.Tracks[i].KnobResetValue = midi.FromMIDI_Max >> 1
-                            self.Tracks[i].KnobCenter = -2
-                            self.Tracks[i].KnobMode = mcu_knob_mode.SingleDot
+                            plan.SliderEventID = CurID + midi.REC_Mixer_EQ_Gain + i
+                            plan.KnobResetEventID = plan.SliderEventID
+                            s = mixer.getEventIDName(plan.SliderEventID)
+                            plan.SliderName = s
+                            plan.KnobEventID = CurID + midi.REC_Mixer_EQ_Freq + i
+                            s = mixer.getEventIDName(plan.KnobEventID)
+                            plan.KnobName = s
+                            plan.KnobResetValue = midi.FromMIDI_Max >> 1
+                            plan.KnobCenter = -2
+                            plan.KnobMode = mcu_knob_mode.SingleDot
                         else:
                             # Q
-                            self.Tracks[i].SliderEventID = CurID + midi.REC_Mixer_EQ_Q + i - 3
-                            self.Tracks[i].KnobResetEventID = self.Tracks[i].SliderEventID
-                            s = mixer.getEventIDName(self.Tracks[i].SliderEventID)
-                            self.Tracks[i].SliderName = s
-                            self.Tracks[i].KnobEventID = self.Tracks[i].SliderEventID
-                            self.Tracks[i].KnobName = self.Tracks[i].SliderName
-                            self.Tracks[i].KnobResetValue = 17500
-                            self.Tracks[i].KnobCenter = -1
-                            self.Tracks[i].KnobMode = mcu_knob_mode.Wrap
+                            plan.SliderEventID = CurID + midi.REC_Mixer_EQ_Q + i - 3
+                            plan.KnobResetEventID = plan.SliderEventID
+                            s = mixer.getEventIDName(plan.SliderEventID)
+                            plan.SliderName = s
+                            plan.KnobEventID = plan.SliderEventID
+                            plan.KnobName = plan.SliderName
+                            plan.KnobResetValue = 17500
+                            plan.KnobCenter = -1
+                            plan.KnobMode = mcu_knob_mode.Wrap
 
                     # self.Flip knob & slider
                     if self.Flip:
-                        self.Tracks[i].KnobEventID, self.Tracks[i].SliderEventID = utils.SwapInt(self.Tracks[i].KnobEventID, self.Tracks[i].SliderEventID)
-                        s = self.Tracks[i].SliderName
-                        self.Tracks[i].SliderName = self.Tracks[i].KnobName
-                        self.Tracks[i].KnobName = s
-                        self.Tracks[i].KnobMode = mcu_knob_mode.Wrap
-                        if not (self.Page in [mcu_pages.Sends, mcu_pages.Effects, mcu_pages.Equalizer if self.McuDevice.isExtender else -1 ]):
-                            self.Tracks[i].KnobCenter = -1
-                            self.Tracks[i].KnobResetValue = round(12800 * midi.FromMIDI_Max / 16000)
-                            self.Tracks[i].KnobResetEventID = self.Tracks[i].KnobEventID
+                        plan.KnobEventID, plan.SliderEventID = utils.SwapInt(plan.KnobEventID, plan.SliderEventID)
+                        s = plan.SliderName
+                        plan.SliderName = plan.KnobName
+                        plan.KnobName = s
+                        plan.KnobMode = mcu_knob_mode.Wrap
+                        if not (page in [mcu_pages.Sends, mcu_pages.Effects, mcu_pages.Equalizer if self.McuDevice.isExtender else -1 ]):
+                            plan.KnobCenter = -1
+                            plan.KnobResetValue = round(12800 * midi.FromMIDI_Max / 16000)
+                            plan.KnobResetEventID = plan.KnobEventID
 
-            self.UpdateTrack(i)
+            plans.append(plan)
+
+        return plans
 
     def UpdateTrack(self, Num):
         """ Updates the sliders, buttons & rotary encoders for a specific track """
@@ -249,7 +458,7 @@ class McuBaseClass():
         if self.McuDevice.isExtender and Num >= 8:
             return
 
-        if device.isAssigned():
+        if self.Snapshot.isAssigned():
             if self.Page == mcu_pages.Free:
                 baseID = midi.EncodeRemoteControlID(device.getPortNumber(), 0, self.Tracks[Num].BaseEventID)
 
@@ -277,47 +486,74 @@ class McuBaseClass():
 
                         self.McuDevice.GetTrack(Num).buttons.SetButtonByIndex(buttonIndex, buttonActive, True)
             else:
-                sv = mixer.getEventValue(self.Tracks[Num].SliderEventID)
+                dirtyFlags = self.Tracks[Num].DirtyFlags
+
+                if dirtyFlags & (mcu_dirty_flags.Fader | mcu_dirty_flags.Knob):
+                    sv = self.Snapshot.getEventValue(self.Tracks[Num].SliderEventID)
 
                 if Num < 8:
                     # V-Pot
-                    center = self.Tracks[Num].KnobCenter
-                    knobMode = self.Tracks[Num].KnobMode
-                    value = 0
-
-                    if self.Tracks[Num].KnobEventID >= 0:
-                        m = mixer.getEventValue(self.Tracks[Num].KnobEventID, midi.MaxInt, False)
-                        if center < 0:
-                            if self.Tracks[Num].KnobResetEventID == self.Tracks[Num].KnobEventID:
-                                center = int(m != self.Tracks[Num].KnobResetValue)
+                    if dirtyFlags & mcu_dirty_flags.Knob:
+                        center = self.Tracks[Num].KnobCenter
+                        knobMode = self.Tracks[Num].KnobMode
+                        value = 0
+
+                        if self.Tracks[Num].KnobEventID >= 0:
+                            m = self.Snapshot.getEventValue(self.Tracks[Num].KnobEventID, midi.MaxInt, False)
+                            if center < 0:
+                                if self.Tracks[Num].KnobResetEventID == self.Tracks[Num].KnobEventID:
+                                    center = int(m != self.Tracks[Num].KnobResetValue)
+                                else:
+                                    center = int(sv != self.Tracks[Num].KnobResetValue)
+
+                            if knobMode == mcu_knob_mode.SingleDot or knobMode == mcu_knob_mode.BoostCut:
+                                value = 1 + round(m * (10 / midi.FromMIDI_Max))
+                            elif knobMode == mcu_knob_mode.Wrap:
+                                value = round(m * (11 / midi.FromMIDI_Max))
                             else:
-                                center = int(sv != self.Tracks[Num].KnobResetValue)
+                                print('Unsupported knob mode')
 
-                        if knobMode == mcu_knob_mode.SingleDot or knobMode == mcu_knob_mode.BoostCut:
-                            value = 1 + round(m * (10 / midi.FromMIDI_Max))
-                        elif knobMode == mcu_knob_mode.Wrap:
-                            value = round(m * (11 / midi.FromMIDI_Max))
-                        else:
-                            print('Unsupported knob mode')
-
-                    # device.midiOutNewMsg(midi.MIDI_CONTROLCHANGE + ((0x30 + Num) << 8) + (data1 << 16), self.Tracks[Num].LastValueIndex)
-
-                    self.McuDevice.GetTrack(Num).knob.setLedsValue(knobMode, center, value)
+                        # device.midiOutNewMsg(midi.MIDI_CONTROLCHANGE + ((0x30 + Num) << 8) + (data1 << 16), self.Tracks[Num].LastValueIndex)
 
+                        self.McuDevice.GetTrack(Num).knob.setLedsValue(knobMode, center, value)
 
                     # arm, solo, mute
-                    self.McuDevice.GetTrack(Num).buttons.SetArmButton(mixer.isTrackArmed(self.Tracks[Num].TrackNum), transport.isRecording(), True)
-                    self.McuDevice.GetTrack(Num).buttons.SetSoloButton(mixer.isTrackSolo(self.Tracks[Num].TrackNum), True)
-                    self.McuDevice.GetTrack(Num).buttons.SetMuteButton(not mixer.isTrackEnabled(self.Tracks[Num].TrackNum), True)
+                    if dirtyFlags & mcu_dirty_flags.Arm:
+                        self.Tracks[Num].Armed = self.Snapshot.isTrackArmed(self.Tracks[Num].TrackNum)
+                        self.McuDevice.GetTrack(Num).buttons.SetArmButton(self.Tracks[Num].Armed, self.Snapshot.isRecording(), True)
+                    if dirtyFlags & mcu_dirty_flags.Solo:
+                        self.Tracks[Num].Solo = self.Snapshot.isTrackSolo(self.Tracks[Num].TrackNum)
+                        self.McuDevice.GetTrack(Num).buttons.SetSoloButton(self.Tracks[Num].Solo, True)
+                    if dirtyFlags & mcu_dirty_flags.Mute:
+                        self.McuDevice.GetTrack(Num).buttons.SetMuteButton(not self.Snapshot.isTrackEnabled(self.Tracks[Num].TrackNum), True)
 
                 # slider
-                self.McuDevice.GetTrack(Num).fader.SetLevelFromFlsFader(sv, True)
+                if dirtyFlags & mcu_dirty_flags.Fader:
+                    self.McuDevice.GetTrack(Num).fader.SetLevelFromFlsFader(sv, True)
+
+            self.Tracks[Num].DirtyFlags &= ~mcu_dirty_flags.Values
+
+    def OnSendMsg(self, Msg, Duration = 0):
+        """ Shows a message, for 'Duration' milliseconds (0 = until the next message) """
+        if Duration > 0:
+            self.MessageOverlay.ShowTempText(Msg, Duration / 1000, time.time())
+        else:
+            self.MessageOverlay.SetText(Msg)
+
+    def ShowNextCallbackTiming(self):
+        """ Shows the timing of the next callback on the display, all timings are printed to the script output when starting over """
+        names = self.CallbackTiming.GetNames()
+        if len(names) == 0:
+            self.OnSendMsg('No callback timings yet')
+            return
 
-            self.Tracks[Num].Dirty = False
+        self.CallbackTimingPage = (self.CallbackTimingPage + 1) % len(names)
+        if self.CallbackTimingPage == 0:
+            debug.PrintCallbackTimings(self.CallbackTiming)
 
-    def OnSendMsg(self, Msg):
-        self.MsgT[1] = Msg
-        self.MsgDirty = True
+        name = names[self.CallbackTimingPage]
+        count, minimum, mean, p99, maximum = self.CallbackTiming.GetStats(name)
+        self.OnSendMsg('{}: {:.0f}/{:.0f}/{:.0f}us ({}/{})'.format(name, minimum * 1e6, mean * 1e6, p99 * 1e6, self.CallbackTimingPage + 1, len(names)))
 
     def SetKnobValue(self, trackNumber, midiValue, resolution = midi.EKRes):
         """ Sets the value of a knob in FL Studio (for all except free page?) (and shows it on the display) """
@@ -344,3 +580,287 @@ class McuBaseClass():
             s = ': ' + s
         self.OnSendMsg(self.Tracks[trackNumber].KnobName + s)
 
+
+    def OnMidiMsg(self, event):
+        """ Called when a MIDI message is received, looks up the handler in the dispatch tables """
+        # the most frequent messages (knobs, jog wheel and faders) are tested first
+        midiId = event.midiId
+        if midiId == midi.MIDI_CONTROLCHANGE:
+            self.ControlChangeHandlers[event.data1](event)
+        elif midiId == midi.MIDI_PITCHBEND:
+            # faders send pitch bend messages, where the channel is the index of the fader
+            if event.midiChan <= 8:
+                self.OnFaderMove(event)
+        elif midiId == midi.MIDI_NOTEON:
+            self.NoteOnHandlers[self.Shift][event.data1](event)
+        elif midiId == midi.MIDI_NOTEOFF:
+            event.handled = False
+
+    def BuildMidiHandlers(self):
+        """ Builds the dispatch tables for incoming MIDI messages, indexed by data1 (and the shift state for notes) """
+        controlChangeHandlers = self.GetControlChangeHandlers()
+        scriptButtonHandlers = self.GetScriptButtonHandlers()
+        systemButtonHandlers = self.GetSystemButtonHandlers()
+        systemSafeButtonHandlers = self.GetSystemSafeButtonHandlers()
+        shiftButtonHandlers = self.GetShiftButtonHandlers()
+        sliders = [mcu_buttons.Slider_1, mcu_buttons.Slider_2, mcu_buttons.Slider_3, mcu_buttons.Slider_4, mcu_buttons.Slider_5, mcu_buttons.Slider_6, mcu_buttons.Slider_7, mcu_buttons.Slider_8, mcu_buttons.Slider_Main]
+
+        self.ControlChangeHandlers = [controlChangeHandlers.get(data1, self.OnUnknownControlChange) for data1 in range(0, 128)]
+        self.NoteOnHandlers = ([], [])
+        for shift in [False, True]:
+            for data1 in range(0, 128):
+                if data1 in sliders:
+                    handler = self.OnFaderTouch
+                elif shift and data1 in shiftButtonHandlers:
+                    handler = self.__CreateButtonHandler(scriptButtonHandlers.get(data1), shiftButtonHandlers[data1], None)
+                else:
+                    handler = self.__CreateButtonHandler(scriptButtonHandlers.get(data1), systemButtonHandlers.get(data1), systemSafeButtonHandlers.get(data1))
+                self.NoteOnHandlers[shift].append(handler)
+
+    def __CreateButtonHandler(self, scriptHandler, systemHandler, systemSafeHandler):
+        """ Combines the handlers of a button into a single handler """
+        def OnButton(event):
+            if (scriptHandler is not None) and (event.pmeFlags & midi.PME_FromScript != 0):
+                scriptHandler(event)
+            self.DispatchButton(event, systemHandler, systemSafeHandler)
+
+        return OnButton
+
+    def DispatchButton(self, event, systemHandler, systemSafeHandler):
+        """
+        Calls the handlers of a button, depending on the flags of the event
+        If the system handler returns True, the event has been fully handled and the system safe handler is skipped
+        """
+        if (event.pmeFlags & midi.PME_System != 0):
+            if (systemHandler is not None) and systemHandler(event):
+                return
+            if (event.pmeFlags & midi.PME_System_Safe != 0):
+                if systemSafeHandler is not None:
+                    systemSafeHandler(event)
+                event.handled = True
+        else:
+            event.handled = False
+
+    def GetControlChangeHandlers(self):
+        """ Returns the handlers for control change messages (data1 -> handler) """
+        return { 0x10 + i: self.OnEncoderTurn for i in range(0, 8) }
+
+    def GetScriptButtonHandlers(self):
+        """ Returns the handlers for notes that were dispatched by another script (data1 -> handler) """
+        return {}
+
+    def GetSystemButtonHandlers(self):
+        """ Returns the handlers for buttons (data1 -> handler), return True from the handler to skip the system safe handler """
+        handlers = { data1: self.OnFreeButton for data1 in range(0, 0x20) } # free hold buttons
+        for i in range(0, 8):
+            handlers[mcu_buttons.Encoder_1 + i] = self.OnEncoderPress
+        handlers[mcu_buttons.FaderBankLeft] = self.OnFaderBankButton
+        handlers[mcu_buttons.FaderBankRight] = self.OnFaderBankButton
+        handlers[mcu_buttons.FaderChannelLeft] = self.OnFaderChannelButton
+        handlers[mcu_buttons.FaderChannelRight] = self.OnFaderChannelButton
+        return handlers
+
+    def GetSystemSafeButtonHandlers(self):
+        """ Returns the handlers for buttons that are safe to use while FL Studio is in a modal state (data1 -> handler) """
+        handlers = { mcu_buttons.LinkChannel: self.OnLinkChannelButton }
+        for i in range(0, 8):
+            handlers[mcu_buttons.Select_1 + i] = self.OnSelectButton
+            handlers[mcu_buttons.Solo_1 + i] = self.OnSoloButton
+            handlers[mcu_buttons.Mute_1 + i] = self.OnMuteButton
+            handlers[mcu_buttons.Record_1 + i] = self.OnArmButton
+        return handlers
+
+    def GetShiftButtonHandlers(self):
+        """ Returns the handlers that replace the regular button handlers while shift is held (data1 -> handler) """
+        return {}
+
+    def DecodeRelativeControlChange(self, event):
+        """ Decodes the relative value of an encoder into event.outEv, returns False if the message is not on the first channel """
+        if (event.midiChan != 0):
+            event.handled = False # for extra CCs in emulators
+            return False
+
+        event.inEv = event.data2
+        if event.inEv >= 0x40:
+            event.outEv = -(event.inEv - 0x40)
+        else:
+            event.outEv = event.inEv
+        return True
+
+    def OnUnknownControlChange(self, event):
+        if self.DecodeRelativeControlChange(event):
+            event.handled = False # for extra CCs in emulators
+
+    def OnEncoderTurn(self, event):
+        """ Rotary encoder (knob) turned """
+        if not self.DecodeRelativeControlChange(event):
+            return
+
+        Res = 0.005 + ((abs(event.outEv)-1) / 2000)
+        if self.Page == mcu_pages.Free:
+            i = event.data1 - 0x10
+            event.data1 = self.Tracks[i].BaseEventID + int(self.Tracks[i].KnobHeld)
+            event.isIncrement = 1
+            s = chr(0x2B + int(event.outEv < 0)*2) # + or - sign depending on how you rotate
+            self.OnSendMsg('Free knob ' + str(event.data1) + ': ' + s + str(abs(event.outEv)))
+            device.processMIDICC(event)
+            device.hardwareRefreshMixerTrack(self.Tracks[i].TrackNum)
+        else:
+            self.SetKnobValue(event.data1 - 0x10, event.outEv, Res)
+            event.handled = True
+
+    def OnFaderMove(self, event):
+        """ Fader moved (pitch bend, midiChan is the number of the fader (0-8)) """
+        event.inEv = event.data1 + (event.data2 << 7)
+        event.outEv = (event.inEv << 16) // 16383
+        event.inEv -= 0x2000
+
+        if self.Page == mcu_pages.Free:
+            self.FreeCtrlT[self.Tracks[event.midiChan].TrackNum] = event.data1 + (event.data2 << 7)
+            device.hardwareRefreshMixerTrack(self.Tracks[event.midiChan].TrackNum)
+            event.data1 = self.Tracks[event.midiChan].BaseEventID + 7
+            event.midiChan = 0
+            event.midiChanEx = 0
+            self.OnSendMsg('Free slider ' + str(event.data1) + ': ' + ui.getHintValue(event.outEv, 65523))
+            event.status = event.midiId = midi.MIDI_CONTROLCHANGE
+            event.isIncrement = 0
+            event.outEv = int(event.data2 / 127.0 * midi.FromMIDI_Max)
+            device.processMIDICC(event)
+        elif self.Tracks[event.midiChan].SliderEventID >= 0:
+            # slider (mixer track volume), the latest value is sent to FL Studio on the next idle tick
+            event.handled = True
+            self.PendingFaderMoves.pop(event.midiChan, None) # keep the most recently moved fader last
+            self.PendingFaderMoves[event.midiChan] = (self.Tracks[event.midiChan].SliderEventID, mcu_device_fader_conversion.McuFaderToFlFader(event.inEv + 0x2000), self.Tracks[event.midiChan].SliderName)
+
+    def FlushFaderMoves(self, force: bool = False):
+        """ Sends the latest value of each moved fader to FL Studio, so fast fader moves don't flood FL Studio with automation events """
+        if len(self.PendingFaderMoves) == 0:
+            return
+
+        now = time.time()
+        if not force and now - self.LastFaderFlushTime < mcu_constants.FaderFlushInterval:
+            return
+        self.LastFaderFlushTime = now
+
+        pendingFaderMoves = self.PendingFaderMoves
+        self.PendingFaderMoves = {}
+        for eventId, value, name in pendingFaderMoves.values():
+            mixer.automateEvent(eventId, value, midi.REC_MIDIController, self.SmoothSpeed)
+
+        # hint, only the most recently moved fader can be shown
+        n = mixer.getAutoSmoothEventValue(eventId)
+        s = mixer.getEventIDValueString(eventId, n)
+        if s != '':
+            s = ': ' + s
+        self.OnSendMsg(name + s)
+
+    def OnFaderTouch(self, event):
+        """ Fader touched or released (slider hold) """
+        faderIndex = event.data1 - mcu_buttons.Slider_1
+        if faderIndex < len(self.McuDevice.tracks): # extenders don't have a main fader
+            self.McuDevice.GetTrack(faderIndex).fader.SetTouched(event.data2 > 0)
+            if event.data2 == 0:
+                # fader released, send its final value to FL Studio and move the motor to the resulting level
+                self.FlushFaderMoves(True)
+                self.Tracks[faderIndex].DirtyFlags |= mcu_dirty_flags.Fader
+                self.UpdateTrack(faderIndex)
+
+        # Auto select channel
+        if event.data1 != mcu_buttons.Slider_Main and event.data2 > 0 and (self.Page == mcu_pages.Pan or self.Page == mcu_pages.Stereo):
+            if mixer.trackNumber() != self.Tracks[faderIndex].TrackNum:
+                mixer.setTrackNumber(self.Tracks[faderIndex].TrackNum)
+        event.handled = True
+
+    def OnFaderBankButton(self, event):
+        """ Mixer bank left/right """
+        if event.data2 > 0:
+            self.SetFirstTrack(self.FirstTrackT[self.FirstTrack] - 8 + int(event.data1 == mcu_buttons.FaderBankRight) * 16)
+
+    def OnFaderChannelButton(self, event):
+        """ Mixer channel left/right """
+        if event.data2 > 0:
+            self.SetFirstTrack(self.FirstTrackT[self.FirstTrack] - 1 + int(event.data1 == mcu_buttons.FaderChannelRight) * 2)
+
+    def OnEncoderPress(self, event):
+        """ Knob reset """
+        if self.Page == mcu_pages.Free:
+            i = event.data1 - mcu_buttons.Encoder_1
+            self.Tracks[i].KnobHeld = event.data2 > 0
+            if event.data2 > 0:
+                event.data1 = self.Tracks[i].BaseEventID + 2
+                event.outEv = 0
+                event.isIncrement = 2
+                self.OnSendMsg('Free knob switch ' + str(event.data1))
+                device.processMIDICC(event)
+            device.hardwareRefreshMixerTrack(self.Tracks[i].TrackNum)
+            return True
+        elif event.data2 > 0:
+            n = event.data1 - mcu_buttons.Encoder_1
+            if self.Page == mcu_pages.Sends:
+                if mixer.setRouteTo(mixer.trackNumber(), self.Tracks[n].TrackNum, -1) < 0:
+                    self.OnSendMsg('Cannot send to this track')
+                else:
+                    self.RoutingMatrix.Invalidate(mixer.trackNumber())
+                    self.StripPlans.Invalidate()
+                    mixer.afterRoutingChanged()
+            else:
+                self.SetKnobValue(n, midi.MaxInt)
+
+    def OnFreeButton(self, event):
+        """ Free hold buttons (the track buttons in free mode) """
+        if self.Page == mcu_pages.Free:
+            i = event.data1 % 8
+            event.data1 = self.Tracks[i].BaseEventID + 3 + event.data1 // 8
+            event.inEv = event.data2
+            event.outEv = int(event.inEv > 0) * midi.FromMIDI_Max
+            self.OnSendMsg('Free button ' + str(event.data1) + ': ' + mcu_constants.OffOnStr[event.outEv > 0])
+            device.processMIDICC(event)
+            device.hardwareRefreshMixerTrack(self.Tracks[i].TrackNum)
+            return True
+
+    def OnLinkChannelButton(self, event):
+        """ Link selected channels from the channel rack to current mixer track """
+        if event.data2 > 0:
+            if self.Shift:
+                mixer.linkTrackToChannel(midi.ROUTE_StartingFromThis)
+            else:
+                mixer.linkTrackToChannel(midi.ROUTE_ToThis)
+
+    def OnCallbackTimingButton(self, event):
+        """ Callback timing readout (min/mean/p99), only when mcu_constants.CallbackTimingEnabled is set """
+        if event.data2 > 0:
+            self.ShowNextCallbackTiming()
+
+    def OnSelectButton(self, event):
+        """ Select mixer track """
+        if event.data2 > 0:
+            i = event.data1 - mcu_buttons.Select_1
+
+            ui.showWindow(midi.widMixer)
+            mixer.setTrackNumber(self.Tracks[i].TrackNum, midi.curfxScrollToMakeVisible | midi.curfxMinimalLatencyUpdate)
+
+    def OnSoloButton(self, event):
+        """ Solo mixer track """
+        if event.data2 > 0:
+            i = event.data1 - mcu_buttons.Solo_1
+            self.Tracks[i].solomode = midi.fxSoloModeWithDestTracks
+            if self.Shift:
+                pass #function does not exist: Include(self.Tracks[i].solomode, midi.fxSoloModeWithSourceTracks)
+            mixer.soloTrack(self.Tracks[i].TrackNum, midi.fxSoloToggle, self.Tracks[i].solomode)
+            self.SetDirtyFlags(mcu_dirty_flags.Solo | mcu_dirty_flags.Mute) # soloing a track mutes the other tracks
+            mixer.setTrackNumber(self.Tracks[i].TrackNum, midi.curfxScrollToMakeVisible)
+
+    def OnMuteButton(self, event):
+        """ Mute mixer track """
+        if event.data2 > 0:
+            mixer.enableTrack(self.Tracks[event.data1 - mcu_buttons.Mute_1].TrackNum)
+
+    def OnArmButton(self, event):
+        """ Arm mixer track for recording """
+        if event.data2 > 0:
+            mixer.armTrack(self.Tracks[event.data1].TrackNum)
+            self.Tracks[event.data1].DirtyFlags |= mcu_dirty_flags.Arm
+            if mixer.isTrackArmed(self.Tracks[event.data1].TrackNum):
+                self.OnSendMsg(tracknames.GetAsciiSafeTrackName(self.Tracks[event.data1].TrackNum) + ' recording to ' + mixer.getTrackRecordingFileName(self.Tracks[event.data1].TrackNum))
+            else:
+                self.OnSendMsg(tracknames.GetAsciiSafeTrackName(self.Tracks[event.data1].TrackNum) + ' unarmed')
@@ -0,0 +1,68 @@
+# Optional timing of the callbacks FL Studio calls, to find out which one makes the script slow (see mcu_constants.CallbackTimingEnabled)
+
+import time
+
+class NoMeasurement:
+    """ Used when timing is disabled, so measuring costs next to nothing """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+class Measurement:
+    def __init__(self, timing, name: str):
+        self.__timing = timing
+        self.__name = name
+        self.__start = 0
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.__timing.Add(self.__name, time.perf_counter() - self.__start)
+        return False
+
+class McuCallbackTiming:
+    """ Keeps the durations of the latest calls of each callback """
+
+    __noMeasurement = NoMeasurement()
+
+    def __init__(self, enabled: bool, windowSize: int = 256):
+        self.Enabled = enabled
+        self.WindowSize = windowSize
+        self.__samples = {} # callback name -> durations (in seconds) of the latest calls, used as a ring buffer
+        self.__counts = {} # callback name -> number of calls
+
+    def Measure(self, name: str):
+        """ Returns a context manager that times the code inside it, e.g. 'with timing.Measure('OnIdle'):' """
+        if not self.Enabled:
+            return self.__noMeasurement
+        return Measurement(self, name)
+
+    def Add(self, name: str, seconds: float):
+        """ Adds the duration of a call """
+        samples = self.__samples.setdefault(name, [])
+        count = self.__counts.get(name, 0)
+        if len(samples) < self.WindowSize:
+            samples.append(seconds)
+        else:
+            samples[count % self.WindowSize] = seconds
+        self.__counts[name] = count + 1
+
+    def GetNames(self):
+        """ The names of the callbacks that have been timed """
+        return list(self.__samples.keys())
+
+    def GetStats(self, name: str):
+        """ Returns (number of calls, min, mean, p99, max) in seconds, over the latest calls """
+        samples = sorted(self.__samples.get(name, []))
+        if len(samples) == 0:
+            return 0, 0, 0, 0, 0
+        p99 = samples[min(int(len(samples) * 0.99), len(samples) - 1)]
+        return self.__counts[name], samples[0], sum(samples) / len(samples), p99, samples[-1]
+
+    def Clear(self):
+        self.__samples = {}
+        self.__counts = {}
@@ -12,8 +12,22 @@ Hue = 0
 Saturation = 1
 Value = 2
 
+McuColorCache = {} # FL Studio Color Value (RGB part) -> MCU Screen Color code
+McuColorCacheSize = 256 # the cache is cleared when it grows beyond this number of colors
+
 def GetMcuColor(intValue):
-    """ Get the MCU Screen Color code from an Int value (FL Studio Color Value) """
+    """ Get the MCU Screen Color code from an Int value (FL Studio Color Value), results are cached """
+    rgbValue = intValue & 0xFFFFFF
+    color = McuColorCache.get(rgbValue)
+    if color is None:
+        if len(McuColorCache) >= McuColorCacheSize:
+            McuColorCache.clear()
+        color = CalculateMcuColor(rgbValue)
+        McuColorCache[rgbValue] = color
+    return color
+
+def CalculateMcuColor(intValue):
+    """ Calculate the MCU Screen Color code from an Int value (FL Studio Color Value) """
     c_hsv = IntToHsv(intValue)
 
     # Define color mapping table
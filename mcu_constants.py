@@ -2,6 +2,20 @@
 
 FreeEventID = 400 # Base CC value for free events
 FreeTrackCount = 64 # Number of tracks in free mode
+MeterMaxRefreshRate = 25 # Maximum number of meter updates per second, per device
+MeterBallistics = False # Calculate the meter levels on a dB scale with the attack, release and peak hold times below, instead of a linear scale
+MeterAttackTime = 0.01 # in seconds
+MeterReleaseTime = 1.5 # time to fall over the full meter range, in seconds
+MeterPeakHoldTime = 0.5 # in seconds
+MeterKeepAliveInterval = 0.25 # The device lets the meters decay, so an unchanged level is sent again after this time (in seconds)
+CallbackTimingEnabled = False # Time the callbacks, shift + SMPTE/Beats shows the timings on the display and prints them to the script output
+OutputBytesPerSecond = 0 # Throughput limit for the messages sent to the device, 0 = unlimited (USB), about 3000 for a 5-pin DIN MIDI connection
+OutputMaxBurstTime = 0.05 # Unused throughput is saved for at most this time (in seconds)
+ArmedTracksReconcileInterval = 2 # Time between full checks of the armed mixer tracks (for the rude solo led), changes are usually picked up right away (in seconds)
+ExtenderTopologyCheckInterval = 1 # Time between checks of the number of extenders (in seconds)
+StripPlanCacheSize = 16 # The number of strip plans (the strip settings of a page & bank) that are kept, see mcu_strip_plans
+RoutingMatrixCacheSize = 32 # The number of mixer tracks of which the sends are kept, for the Sends page, see mcu_routing_matrix
+FaderFlushInterval = 0 # Minimum time (in seconds) between sending fader moves to FL Studio, 0 = on every idle tick
 
 PageDescriptions = ('Panning                                (press to reset)', 'Stereo separation                      (press to reset)',  'Sends for selected track              (press to enable)', 'Effects for selected track            (press to enable)', 'EQ for selected track                  (press to reset)',  'Lotsa free controls')
 OffOnStr = ('off', 'on')
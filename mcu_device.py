@@ -1,10 +1,16 @@
 import device
 import midi
 import utils
+import time
 
+import mcu_constants
 import mcu_device_track
 import mcu_device_time_display
 import mcu_colors
+import mcu_device_shadow_state
+import mcu_device_output_queue
+import mcu_device_text_display
+import mcu_meter_ballistics
 
 class McuDevice:
     """
@@ -16,53 +22,56 @@ class McuDevice:
         self.__productId = 0x15 if isExtender else 0x14 # productID used by MCU protocol
         self.__lastScreenColors = [0,0,0,0,0,0,0,0]
 
+        # last values sent to the knob rings, button LEDs and faders, used to suppress redundant messages
+        self.__shadowState = mcu_device_shadow_state.McuDeviceShadowState()
+        self.__textDisplay = mcu_device_text_display.McuDeviceTextDisplay()
+
+        # all output goes through this queue, which limits the throughput for slow connections
+        self.__outputQueue = mcu_device_output_queue.McuDeviceOutputQueue(mcu_constants.OutputBytesPerSecond, mcu_constants.OutputMaxBurstTime)
+
         # create tracks
-        self._tracks = [mcu_device_track.McuDeviceTrack(i, self.__productId, i == 8) for i in range(8 if isExtender else 9)]
+        self._tracks = [mcu_device_track.McuDeviceTrack(i, self.__productId, i == 8, self.__shadowState, self.__outputQueue) for i in range(8 if isExtender else 9)]
+        self._tracksWithMeters = [track for track in self._tracks if not track.meter is None]
+        self.__lastMeterUpdateTime = 0
+        self.__meterBallistics = mcu_meter_ballistics.McuMeterBallistics(len(self._tracksWithMeters), mcu_constants.MeterAttackTime, mcu_constants.MeterReleaseTime, mcu_constants.MeterPeakHoldTime)
 
         if not isExtender:
-            self.TimeDisplay = mcu_device_time_display.McuDeviceTimeDisplay()
+            self.TimeDisplay = mcu_device_time_display.McuDeviceTimeDisplay(self.__outputQueue)
 
 
     def Initialize(self):
         """ Initializes the MCU device """
+        self.ForceResync()
         if device.isAssigned():
-            device.midiOutSysex(bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x0C, 1, 0xF7]))
-
-    def SendMidiToExtenders(self, message): 
-        """ Dispatches a MIDI message to all receivers (extenders) """
-        receiverCount = device.dispatchReceiverCount()
-        for n in range(0, receiverCount):
-            device.dispatch(n, message)
-
-    def SendMidiToExtender(self, extenderIndex, message):
-        """ Dispatches a MIDI message to a specific receiver (extender) """
-        receiverCount = device.dispatchReceiverCount()
-        if (extenderIndex >= 0 and extenderIndex < receiverCount):
-            device.dispatch(extenderIndex, message)
-
-    def SetFirstTrackOnExtender(self, extenderIndex, firstTrack):
-        """ Dispatches a MIDI message to an extender to let them know their first track """
-        if self.isExtender:
-            return
-        self.SendMidiToExtender(extenderIndex, midi.MIDI_NOTEON + (0x7F << 8) + (firstTrack << 16))
+            self.__outputQueue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x0C, 1, 0xF7]))
+
+    def ForceResync(self):
+        """ Forgets what was sent to the device, so the next update of every control will be sent again (e.g. after (re)connecting) """
+        # queued messages are outdated by the updates that follow
+        self.__outputQueue.Clear()
+        self.__shadowState.Invalidate()
+        self.__textDisplay.Invalidate()
+        self.__lastScreenColors = [0,0,0,0,0,0,0,0]
+        for track in self.tracksWithMeters:
+            track.meter.Invalidate()
 
     def SetBackLightTimeout(self, Minutes): 
         """ Sets the backlight timeout (0 should switch off immediately, but doesn't really work well) """
         # This is code from the original script, but I don't think it does anything on the Xtouch, might do some stuff on other MCU devices though, so I'm leaving it in for now
         if device.isAssigned():
-            device.midiOutSysex(bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x0B, Minutes, 0xF7]))
+            self.__outputQueue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x0B, Minutes, 0xF7]), 'backlight')
 
     def SetClicking(self, enabled: bool):
         """ Sets clicking for transport buttons """
         # This is code from the original script, but I don't know what the clicking actually means in this case (if you do, please let me know)
         if device.isAssigned():
-            device.midiOutSysex(bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x0A, int(enabled), 0xF7]))
+            self.__outputQueue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x0A, int(enabled), 0xF7]), 'clicking')
 
     def EnableMeters(self):
         """ Enables all meters """
         if device.isAssigned():
             # set vertical meter mode (is the one that works properly on XTouch, but other MCU devices also support other ones)
-            device.midiOutSysex(bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x21, 1, 0xF7]))
+            self.__outputQueue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x21, 1, 0xF7]), 'meterMode')
             # enable meters
             self.__SetMetersActive(True, True)
 
@@ -74,9 +83,30 @@ class McuDevice:
     def ClearMeters(self):
         """ Clear peak indicators """
         if device.isAssigned():
+            self.__meterBallistics.Reset()
             for track in self.tracksWithMeters:
+                track.meter.Invalidate()
                 track.meter.SetValue(0, True)
 
+    def SetMeterValues(self, peakValues):
+        """ Sets all meters at once, using a peak value (0 = off, 1 = max, >1 = clipping) for each track with a meter """
+        if device.isAssigned():
+            if mcu_constants.MeterBallistics:
+                levels = self.__meterBallistics.Process(peakValues, time.time())
+                for n in range(0, len(levels)):
+                    self.tracksWithMeters[n].meter.SetLevel(levels[n], True)
+            else:
+                for n in range(0, len(peakValues)):
+                    self.tracksWithMeters[n].meter.SetValue(peakValues[n], True)
+
+    def IsMeterUpdateDue(self) -> bool:
+        """ Whether or not the meters can be updated again, limits the meter traffic to mcu_constants.MeterMaxRefreshRate updates per second """
+        now = time.time()
+        if now - self.__lastMeterUpdateTime < 1 / mcu_constants.MeterMaxRefreshRate:
+            return False
+        self.__lastMeterUpdateTime = now
+        return True
+
     def GetTrack(self, index):
         """ Returns the an MCU mixer track instance """
         return self.tracks[index]
@@ -84,12 +114,11 @@ class McuDevice:
     def SetTextDisplay(self, message, row:int = 0, skipIsAssignedCheck: bool = False):
         """ Sends a message to the screen (row 0 = bottom, row 1 = top) """
         if skipIsAssignedCheck or device.isAssigned():
-            lastMsgLen = 0x37
-            maxLen = 56 # The screens can only show 56 characters in total
-
-            sysex = bytearray([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x12, (lastMsgLen + 1) * row]) + bytearray(message.ljust(lastMsgLen + 1, ' ')[:maxLen], 'ascii')
-            sysex.append(0xF7)
-            device.midiOutSysex(bytes(sysex))
+            # only the changed parts of the row are sent
+            for offset, text in self.__textDisplay.GetUpdates(row, message):
+                sysex = bytearray([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x12, mcu_device_text_display.RowLength * row + offset]) + bytearray(text, 'ascii')
+                sysex.append(0xF7)
+                self.__outputQueue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes(sysex), ('text', row, offset, len(text)), ordered = True)
 
     def SetScreenColors(self, colorArray = [-10261391,-10261391,-10261391,-10261391,-10261391,-10261391,-10261391,-10261391], skipIsAssignedCheck: bool = False):
         """ Sets the colors of the screens (all white by default) """
@@ -102,7 +131,7 @@ class McuDevice:
             for color in colorArray:
                 sysex.append(mcu_colors.GetMcuColor(color))
             sysex.append(0xF7)
-            device.midiOutSysex(bytes(sysex))
+            self.__outputQueue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes(sysex), 'colors')
             self.__lastScreenColors = colorArray
 
     def SetAssignmentMessage(self, number= -1, skipIsAssignedCheck: bool = False):
@@ -115,13 +144,27 @@ class McuDevice:
 
         # send to display
         if skipIsAssignedCheck or device.isAssigned():
-            device.midiOutMsg(midi.MIDI_CONTROLCHANGE + ((0x4B) << 8) + (ord(message[0]) << 16))
-            device.midiOutMsg(midi.MIDI_CONTROLCHANGE + ((0x4A) << 8) + (ord(message[1]) << 16))
+            self.__outputQueue.SendMsg(mcu_device_output_queue.PriorityDisplay, midi.MIDI_CONTROLCHANGE + ((0x4B) << 8) + (ord(message[0]) << 16), ('assignment', 0))
+            self.__outputQueue.SendMsg(mcu_device_output_queue.PriorityDisplay, midi.MIDI_CONTROLCHANGE + ((0x4A) << 8) + (ord(message[1]) << 16), ('assignment', 1))
 
     def SetButton(self, button: int, active: int, index:int, skipIsAssignedCheck: bool = False):
-        """ Take a button and turn it on or off """
+        """ Take a button and turn it on or off (nothing is sent when the button didn't change) """
         if skipIsAssignedCheck or device.isAssigned():
-            device.midiOutNewMsg((button << 8) + active, index)
+            message = (button << 8) + active
+            if self.__shadowState.ShouldSend(index, message):
+                self.__outputQueue.SendNewMsg(mcu_device_output_queue.PriorityButton, message, index)
+
+    def SendButtonMessage(self, message: int, index: int = -1, skipIsAssignedCheck: bool = False):
+        """ Sends a raw button led message, using midiOutNewMsg when a slot index is given """
+        if skipIsAssignedCheck or device.isAssigned():
+            if index < 0:
+                self.__outputQueue.SendMsg(mcu_device_output_queue.PriorityButton, message, ('button', message & 0xFFFF))
+            else:
+                self.__outputQueue.SendNewMsg(mcu_device_output_queue.PriorityButton, message, index)
+
+    def FlushOutput(self, ignoreLimit: bool = False):
+        """ Sends the queued output, as far as the throughput allows (or all of it when ignoreLimit is set) """
+        self.__outputQueue.Flush(ignoreLimit)
 
     def __SetMetersActive(self, active: bool, skipIsAssignedCheck: bool = False):
         """ Enables or disables all meters """
@@ -137,4 +180,4 @@ class McuDevice:
     @property
     def tracksWithMeters(self):
         """ Returns all track instances with meters belonging to this MCU device """
-        return [track for track in self.tracks if not track.meter is None]
+        return self._tracksWithMeters
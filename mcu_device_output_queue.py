@@ -0,0 +1,119 @@
+# Prioritised output for the messages sent to a device, with an optional throughput limit for slow connections (5-pin DIN MIDI)
+
+import device
+import time
+import midi
+
+# priorities, lower values are sent first
+PriorityFader = 0
+PriorityButton = 1
+PriorityKnob = 2
+PriorityDisplay = 3 # text, colors, assignment & time display and setup messages
+PriorityMeter = 4
+PriorityCount = 5
+
+# kinds of messages
+KindMsg = 0
+KindNewMsg = 1
+KindSysex = 2
+
+class McuDeviceOutputQueue:
+    """
+    Sends the messages for a device, when the throughput is limited, messages are queued and sent by Flush (from OnIdle)
+    Queued messages with the same key are collapsed: only the latest one is sent, at the position of the first one
+    """
+
+    def __init__(self, bytesPerSecond: int = 0, maxBurstTime: float = 0.05):
+        self.BytesPerSecond = bytesPerSecond # 0 = unlimited, messages are sent right away
+        self.MaxBurstTime = maxBurstTime # unused throughput is saved for at most this time (in seconds)
+        self.__queues = [{} for i in range(PriorityCount)] # per priority: key -> (kind, message, slot index)
+        self.__nextKey = 0 # for messages that can't be collapsed
+        self.__allowance = 0 # number of bytes that can be sent
+        self.__lastFlushTime = -1
+
+    @property
+    def isLimited(self) -> bool:
+        """ Whether or not the throughput is limited """
+        return self.BytesPerSecond > 0
+
+    @property
+    def pendingCount(self) -> int:
+        """ The number of queued messages """
+        return sum(len(queue) for queue in self.__queues)
+
+    def SendMsg(self, priority: int, message: int, key = None):
+        """ Sends a short midi message, messages with the same key (if any) are collapsed """
+        self.__Add(priority, key, KindMsg, message, -1)
+
+    def SendNewMsg(self, priority: int, message: int, slotIndex: int):
+        """ Sends a short midi message using FL Studio's midiOutNewMsg, messages for the same slot are collapsed """
+        self.__Add(priority, ('slot', slotIndex), KindNewMsg, message, slotIndex)
+
+    def SendSysex(self, priority: int, message: bytes, key = None, ordered: bool = False):
+        """
+        Sends a sysex message, messages with the same key (if any) are collapsed
+        Set ordered for messages that overwrite (parts of) earlier ones, such as partial text updates: a collapsed message is then moved to the end of the queue
+        """
+        self.__Add(priority, key, KindSysex, message, -1, ordered)
+
+    def Flush(self, ignoreLimit: bool = False):
+        """ Sends the queued messages, highest priority first, as far as the throughput allows (or all of them when ignoreLimit is set) """
+        if not self.isLimited:
+            return
+
+        if ignoreLimit:
+            for queue in self.__queues:
+                for kind, message, slotIndex in queue.values():
+                    self.__Output(kind, message, slotIndex)
+            self.Clear()
+            return
+
+        now = time.time()
+        maxAllowance = self.BytesPerSecond * self.MaxBurstTime
+        if self.__lastFlushTime < 0:
+            self.__allowance = maxAllowance
+        else:
+            self.__allowance = min(self.__allowance + (now - self.__lastFlushTime) * self.BytesPerSecond, maxAllowance)
+        self.__lastFlushTime = now
+
+        for queue in self.__queues:
+            while len(queue) > 0:
+                key = next(iter(queue))
+                kind, message, slotIndex = queue[key]
+                size = GetMessageSize(kind, message)
+                # a message that's larger than the burst is sent when the allowance is full
+                if size > self.__allowance and self.__allowance < maxAllowance:
+                    return
+                del queue[key]
+                self.__allowance -= size
+                self.__Output(kind, message, slotIndex)
+
+    def Clear(self):
+        """ Forgets all queued messages """
+        self.__queues = [{} for i in range(PriorityCount)]
+
+    def __Add(self, priority: int, key, kind: int, message, slotIndex: int, ordered: bool = False):
+        if not self.isLimited:
+            self.__Output(kind, message, slotIndex)
+            return
+        if key is None:
+            key = self.__nextKey
+            self.__nextKey += 1
+        elif ordered:
+            self.__queues[priority].pop(key, None)
+        self.__queues[priority][key] = (kind, message, slotIndex)
+
+    def __Output(self, kind: int, message, slotIndex: int):
+        if kind == KindMsg:
+            device.midiOutMsg(message)
+        elif kind == KindNewMsg:
+            device.midiOutNewMsg(message, slotIndex)
+        else:
+            device.midiOutSysex(message)
+
+def GetMessageSize(kind: int, message) -> int:
+    """ The number of bytes a message takes on the wire """
+    if kind == KindSysex:
+        return len(message)
+    status = message & 0xF0
+    return 2 if status == midi.MIDI_PROGRAMCHANGE or status == midi.MIDI_CHANAFTERTOUCH else 3
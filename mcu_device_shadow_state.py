@@ -0,0 +1,22 @@
+class McuDeviceShadowState:
+    """
+    Keeps track of the last MIDI message that was sent to each output slot of an MCU device,
+    so redundant messages (same value as last time) can be suppressed
+    """
+
+    def __init__(self):
+        self.__lastMessages = {}
+
+    def ShouldSend(self, slotIndex: int, message: int) -> bool:
+        """ Returns True (and remembers the message) if the message differs from the last one sent on this slot """
+        if self.__lastMessages.get(slotIndex) == message:
+            return False
+        self.__lastMessages[slotIndex] = message
+        return True
+
+    def Invalidate(self, slotIndex: int = -1):
+        """ Forgets the last sent message of a slot (-1 = all slots), so the next message will always be sent """
+        if slotIndex == -1:
+            self.__lastMessages.clear()
+        else:
+            self.__lastMessages.pop(slotIndex, None)
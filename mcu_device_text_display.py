@@ -0,0 +1,49 @@
+RowLength = 56 # The screens show 56 characters per row in total (7 per channel)
+RowCount = 2
+SysexOverhead = 8 # Header (F0 00 00 66 <product id> 12 <offset>) and F7
+
+class McuDeviceTextDisplay:
+    """
+    Keeps a shadow of the text on both rows of the screens of an MCU device,
+    so only the parts of a row that changed have to be sent (the 0x12 sysex takes a start offset)
+    """
+
+    def __init__(self):
+        self.__rows = [None] * RowCount # None = unknown, the full row will be sent
+
+    def GetRow(self, row: int) -> str:
+        """ The text that was last sent to a row (or None when unknown) """
+        return self.__rows[row]
+
+    def GetUpdates(self, row: int, text: str):
+        """ Remembers the new text of a row and returns the (offset, text) spans that need to be sent, offsets are relative to the row """
+        text = text.ljust(RowLength, ' ')[:RowLength]
+        oldText = self.__rows[row]
+        self.__rows[row] = text
+        if oldText is None:
+            return [(0, text)]
+        spans = GetChangedSpans(oldText, text)
+        if sum(SysexOverhead + len(span) for offset, span in spans) >= SysexOverhead + RowLength:
+            return [(0, text)]
+        return spans
+
+    def Invalidate(self):
+        """ Forgets the text of both rows, so the next update will send full rows """
+        self.__rows = [None] * RowCount
+
+def GetChangedSpans(oldText: str, newText: str, gap: int = SysexOverhead):
+    """ Returns the (offset, text) spans where the texts differ, spans closer than 'gap' characters are merged as that's cheaper than another message """
+    spans = []
+    start = -1
+    end = -1
+    for n in range(0, len(newText)):
+        if oldText[n] != newText[n]:
+            if start < 0:
+                start = n
+            elif n - end > gap:
+                spans.append((start, newText[start:end]))
+                start = n
+            end = n + 1
+    if start >= 0:
+        spans.append((start, newText[start:end]))
+    return spans
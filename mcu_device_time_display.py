@@ -1,9 +1,12 @@
 import device
 import midi
 
+import mcu_device_output_queue
+
 class McuDeviceTimeDisplay:
-    def __init__(self):
+    def __init__(self, outputQueue: mcu_device_output_queue.McuDeviceOutputQueue):
         self.__lastTimeMsg = bytearray(10)
+        self.__outputQueue = outputQueue
 
     def SetMessage(self, message, skipIsAssignedCheck = False):
         """ Sets the message on the time display """
@@ -15,6 +18,6 @@ class McuDeviceTimeDisplay:
             #send chars that have changed
             for m in range(0, min(len(self.__lastTimeMsg), len(TimeMsg))):
                 if self.__lastTimeMsg[m] != TimeMsg[m]:
-                    device.midiOutMsg(midi.MIDI_CONTROLCHANGE + ((0x49 - m) << 8) + ((TimeMsg[m]) << 16))
+                    self.__outputQueue.SendMsg(mcu_device_output_queue.PriorityDisplay, midi.MIDI_CONTROLCHANGE + ((0x49 - m) << 8) + ((TimeMsg[m]) << 16), ('time', m))
 
         self.__lastTimeMsg = TimeMsg
@@ -2,11 +2,13 @@ import mcu_device_track_meter
 import mcu_device_track_fader
 import mcu_device_track_buttons
 import mcu_device_track_encoder_knob
+import mcu_device_shadow_state
+import mcu_device_output_queue
 
 class McuDeviceTrack:
     """ Class for controlling a single track on the Xtouch in MCU mode (Hardware abstraction) """
 
-    def __init__(self, index: int, productId: int, isMain: bool):
+    def __init__(self, index: int, productId: int, isMain: bool, shadowState: mcu_device_shadow_state.McuDeviceShadowState, outputQueue: mcu_device_output_queue.McuDeviceOutputQueue):
         self._index = index
         self._baseMidiValue = 48 + index * 6
         self._productId = productId
@@ -15,10 +17,10 @@ class McuDeviceTrack:
         self._isMain = isMain
 
         # create track meter instance, the master track does not have a meter
-        self._meter = None if self.isMain else mcu_device_track_meter.McuDeviceTrackMeter(productId, index)
-        self._fader = mcu_device_track_fader.McuDeviceTrackFader(productId, index, isMain, self._baseMidiValue)
-        self._buttons = None if self.isMain else mcu_device_track_buttons.McuDeviceTrackButtons(productId, index, self.baseMidiValue)
-        self._knob = None if self.isMain else mcu_device_track_encoder_knob.McuDeviceTrackEncoderKnob(index, self.baseMidiValue)
+        self._meter = None if self.isMain else mcu_device_track_meter.McuDeviceTrackMeter(productId, index, outputQueue)
+        self._fader = mcu_device_track_fader.McuDeviceTrackFader(productId, index, isMain, self._baseMidiValue, shadowState, outputQueue)
+        self._buttons = None if self.isMain else mcu_device_track_buttons.McuDeviceTrackButtons(productId, index, self.baseMidiValue, shadowState, outputQueue)
+        self._knob = None if self.isMain else mcu_device_track_encoder_knob.McuDeviceTrackEncoderKnob(index, self.baseMidiValue, shadowState, outputQueue)
 
     @property
     def index(self):
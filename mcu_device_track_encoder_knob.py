@@ -2,13 +2,17 @@ import device
 import midi
 
 import mcu_knob_mode
+import mcu_device_shadow_state
+import mcu_device_output_queue
 
 class McuDeviceTrackEncoderKnob:
     """ Class for controlling the encoder knob on the Xtouch in MCU mode (Hardware abstraction) """
 
-    def __init__(self, trackIndex: int, baseMidiValue: int):
+    def __init__(self, trackIndex: int, baseMidiValue: int, shadowState: mcu_device_shadow_state.McuDeviceShadowState, outputQueue: mcu_device_output_queue.McuDeviceOutputQueue):
         self.__trackIndex = trackIndex
         self.__baseMidiValue = baseMidiValue
+        self.__shadowState = shadowState
+        self.__outputQueue = outputQueue
 
     def setLedsValue(self, knobMode: int, showCenter: bool, value: int):
         """
@@ -22,7 +26,9 @@ class McuDeviceTrackEncoderKnob:
         modeBits = knobMode << 4
         dataBits = centerBits + modeBits + value
 
-        device.midiOutNewMsg(midi.MIDI_CONTROLCHANGE + (trackBits << 8) + (dataBits << 16), self.__baseMidiValue)
+        message = midi.MIDI_CONTROLCHANGE + (trackBits << 8) + (dataBits << 16)
+        if self.__shadowState.ShouldSend(self.__baseMidiValue, message): # skip if the ring already shows this value
+            self.__outputQueue.SendNewMsg(mcu_device_output_queue.PriorityKnob, message, self.__baseMidiValue)
     
     def SetLedsValueNone(self):
         """
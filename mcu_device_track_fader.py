@@ -2,15 +2,21 @@ import device
 import midi
 
 import mcu_device_fader_conversion
+import mcu_device_shadow_state
+import mcu_device_output_queue
 
 class McuDeviceTrackFader:
     """ Class for controlling a single fader on the Xtouch in MCU mode (Hardware abstraction) """
 
-    def __init__(self, productId: int, index: int, isMain: bool, baseMidiValue: int):
+    def __init__(self, productId: int, index: int, isMain: bool, baseMidiValue: int, shadowState: mcu_device_shadow_state.McuDeviceShadowState, outputQueue: mcu_device_output_queue.McuDeviceOutputQueue):
         self.__productId = productId
         self.__index = index
         self.__isMain = isMain
         self.__baseMidiValue = baseMidiValue
+        self.__shadowState = shadowState
+        self.__outputQueue = outputQueue
+        self.__isTouched = False
+        self.__lastNewMsg = -1 # the last message sent with midiOutNewMsg, FL Studio drops a message that equals the last one of its slot
 
     def SetLevelFromFlsFader(self, flFaderValue: int, skipIsAssignedCheck: bool = False):
         """ Sets the value of the fader on the Xtouch using a FL Studio Fader value """
@@ -18,9 +24,31 @@ class McuDeviceTrackFader:
         self.SetLevel(paramValue, skipIsAssignedCheck)
 
     def SetLevel(self, value: int, skipIsAssignedCheck: bool = False):
-        """ Sets the value of the fader on the Xtouch (0 to 16380) """
+        """ Sets the value of the fader on the Xtouch (0 to 16380), ignored while the fader is being touched """
+        if self.__isTouched:
+            return # don't let the motor fight the finger on the fader
         if skipIsAssignedCheck or device.isAssigned():
             data1 = value
             data2 = data1 & 127
             data1 = data1 >> 7
-            device.midiOutNewMsg(midi.MIDI_PITCHBEND + self.__index + (data2 << 8) + (data1 << 16), self.__baseMidiValue + 5)
+            message = midi.MIDI_PITCHBEND + self.__index + (data2 << 8) + (data1 << 16)
+            if self.__shadowState.ShouldSend(self.__baseMidiValue + 5, message): # don't move the motor fader if it's already there
+                if message == self.__lastNewMsg:
+                    # the motor was moved since (e.g. by hand), but FL Studio would drop this message, so send it without the slot
+                    # the key is the one SendNewMsg uses, so it replaces a queued message of the slot
+                    self.__outputQueue.SendMsg(mcu_device_output_queue.PriorityFader, message, ('slot', self.__baseMidiValue + 5))
+                else:
+                    self.__outputQueue.SendNewMsg(mcu_device_output_queue.PriorityFader, message, self.__baseMidiValue + 5)
+                    self.__lastNewMsg = message
+
+    def SetTouched(self, isTouched: bool):
+        """ Sets whether or not the fader is being touched, the next level will always be sent after releasing it """
+        self.__isTouched = isTouched
+        if not isTouched:
+            # the fader was moved by hand, so the last sent level is no longer where the motor is
+            self.__shadowState.Invalidate(self.__baseMidiValue + 5)
+
+    @property
+    def isTouched(self):
+        """ Whether or not the fader is being touched """
+        return self.__isTouched
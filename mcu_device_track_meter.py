@@ -1,23 +1,44 @@
 import device
 import midi
+import time
+
+import mcu_constants
+import mcu_device_output_queue
 
 class McuDeviceTrackMeter:
     """ Class for controlling a single track on the Xtouch in MCU mode (Hardware abstraction) """
 
-    def __init__(self, productId: int, trackIndex: int):
+    def __init__(self, productId: int, trackIndex: int, outputQueue: mcu_device_output_queue.McuDeviceOutputQueue):
         self.__trackIndex = trackIndex
         self.__productId = productId
+        self.__outputQueue = outputQueue
+        self.__lastValue = -1 # last meter value (0-15) that was sent to the device
+        self.__lastSendTime = 0
 
     def SetActive(self, active: bool, skipIsAssignedCheck: bool = False):
         """ Enables or disables the current meter """
         if skipIsAssignedCheck or device.isAssigned():
-            device.midiOutSysex(bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x20, self.__trackIndex, 3 if active else 0, 0xF7]))
+            self.__outputQueue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes([0xF0, 0x00, 0x00, 0x66, self.__productId, 0x20, self.__trackIndex, 3 if active else 0, 0xF7]), ('meterMode', self.__trackIndex))
 
     def SetValue(self, value: float, skipIsAssignedCheck: bool = False):
         """ Sets a specific meter to a certain value (0 = off, 1 = max, >1 = clipping) """
+        self.SetLevel(self.__ConvertToMeterValue(value), skipIsAssignedCheck)
+
+    def SetLevel(self, meter_value: int, skipIsAssignedCheck: bool = False):
+        """ Sets a specific meter to a certain level (0-14, 14 = clipping, 15 = off) """
         if skipIsAssignedCheck or device.isAssigned():
-            meter_value = self.__ConvertToMeterValue(value)
-            device.midiOutMsg(midi.MIDI_CHANAFTERTOUCH + (meter_value << 8) + (self.__trackIndex << 12))
+            # only send changes, but keep sending a level, otherwise the device lets it decay
+            now = time.time()
+            if meter_value == self.__lastValue and (meter_value == 0 or meter_value == 15 or now - self.__lastSendTime < mcu_constants.MeterKeepAliveInterval):
+                return
+            self.__lastValue = meter_value
+            self.__lastSendTime = now
+
+            self.__outputQueue.SendMsg(mcu_device_output_queue.PriorityMeter, midi.MIDI_CHANAFTERTOUCH + (meter_value << 8) + (self.__trackIndex << 12), ('meter', self.__trackIndex))
+
+    def Invalidate(self):
+        """ Forgets the last sent value, so the next value will always be sent """
+        self.__lastValue = -1
 
     def __ConvertToMeterValue(self, value: float):
         """ Converts an FL Studio meter float value to an MCU compatible value (one char hex) """
@@ -0,0 +1,14 @@
+# Flags that indicate which parts of a track need to be updated on the device
+
+Fader = 1 # the (motor) fader, usually the volume
+Knob = 2 # the led ring around the encoder knob
+Arm = 4
+Solo = 8
+Mute = 16
+Name = 32 # the name on the scribble strip
+Color = 64 # the color of the scribble strip
+
+Values = Fader | Knob | Arm | Solo | Mute # parts that are updated by UpdateTrack
+Controls = Fader | Knob | Mute # parts that can change by automation, arm & solo are only marked when they changed (see McuBaseClass.OnDirtyMixerTrack)
+Display = Name | Color # parts that are updated by UpdateTextDisplay
+All = Values | Display
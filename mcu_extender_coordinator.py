@@ -0,0 +1,70 @@
+import device
+import midi
+
+import mcu_extender_location
+
+LayoutNote = 0x7F # the layout message is a note on for this note, with the page & flip state as channel and the first track as velocity
+
+class McuExtenderCoordinator:
+    """
+    Lets the extenders (the receivers of the main unit) know which tracks to show, on which page and whether flip is on
+    The number of receivers is cached (see CheckTopology), the layout of all extenders is computed from the first track of the main unit
+    and each extender gets a single layout message, only when its layout changed
+    """
+
+    def __init__(self, checkInterval: float):
+        self.CheckInterval = checkInterval # time between checks of the number of receivers (in seconds)
+        self.__receiverCount = 0
+        self.__lastCheckTime = 0
+        self.__sentLayouts = {} # extender index -> last layout message
+
+    @property
+    def receiverCount(self) -> int:
+        """ The number of receivers (extenders), as of the last CheckTopology call """
+        return self.__receiverCount
+
+    def CheckTopology(self) -> bool:
+        """ Gets the number of receivers from FL Studio, returns True when it changed (the layouts need to be sent again) """
+        receiverCount = device.dispatchReceiverCount()
+        if receiverCount == self.__receiverCount:
+            return False
+        self.__receiverCount = receiverCount
+        self.__sentLayouts = {}
+        return True
+
+    def CheckTopologyIfDue(self, now: float) -> bool:
+        """ Calls CheckTopology when the interval has passed, returns True when the number of receivers changed """
+        if now - self.__lastCheckTime < self.CheckInterval:
+            return False
+        self.__lastCheckTime = now
+        return self.CheckTopology()
+
+    def SendToAll(self, message: int):
+        """ Dispatches a MIDI message to all receivers (extenders) """
+        for n in range(0, self.__receiverCount):
+            device.dispatch(n, message)
+
+    def SetLayout(self, firstTrack: int, trackCount: int, page: int, flip: bool, extenderLocation: int):
+        """ Sends the layout to the extenders that don't have it yet, firstTrack is the first track of the main unit """
+        for n, extenderFirstTrack in enumerate(GetExtenderFirstTracks(firstTrack, trackCount, self.__receiverCount, extenderLocation)):
+            message = EncodeLayout(extenderFirstTrack, page, flip)
+            if self.__sentLayouts.get(n) != message:
+                device.dispatch(n, message)
+                self.__sentLayouts[n] = message
+
+    def Invalidate(self):
+        """ Forgets the layouts that were sent, so the next SetLayout sends them to all extenders """
+        self.__sentLayouts = {}
+
+def GetExtenderFirstTracks(firstTrack: int, trackCount: int, receiverCount: int, extenderLocation: int):
+    """ The first track of each extender, the extenders are placed next to each other on the left or right of the main unit """
+    if extenderLocation == mcu_extender_location.Left:
+        return [(firstTrack - (receiverCount - n) * 8) % trackCount for n in range(0, receiverCount)]
+    return [(firstTrack + (n + 1) * 8) % trackCount for n in range(0, receiverCount)]
+
+def EncodeLayout(firstTrack: int, page: int, flip: bool) -> int:
+    return midi.MIDI_NOTEON + page + (int(flip) << 3) + (LayoutNote << 8) + (firstTrack << 16)
+
+def DecodeLayout(event):
+    """ Returns the first track, page and flip state of a layout message """
+    return event.data2, event.midiChan & 7, event.midiChan & 8 != 0
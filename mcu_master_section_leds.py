@@ -0,0 +1,44 @@
+import midi
+
+import mcu_device
+
+class McuLed:
+    """ A LED on the master section, bound to one or more state providers """
+
+    def __init__(self, button: int, slotIndex: int, providerNames, getState, values):
+        self.button = button
+        self.slotIndex = slotIndex
+        self.providerNames = providerNames
+        self.getState = getState # provider value(s) -> index in values
+        self.values = values # the messages for each state, e.g. midi.TranzPort_OffOnT
+
+class McuMasterSectionLeds:
+    """
+    The LEDs on the master section, each bound to a state provider (a function that gets the state from FL Studio or the script)
+    Every provider is called at most once per Update, only the LEDs that changed are sent (see McuDevice.SetButton)
+    """
+
+    def __init__(self, mcuDevice: mcu_device.McuDevice):
+        self.__mcuDevice = mcuDevice
+        self.__providers = {} # name -> function
+        self.__leds = []
+
+    def AddProvider(self, name: str, function):
+        """ Adds a state provider, which can be shared by several LEDs """
+        self.__providers[name] = function
+
+    def AddLed(self, button: int, slotIndex: int, providerNames, getState = bool, values = midi.TranzPort_OffOnT):
+        """ Binds a LED to a state provider (or a tuple of them), getState turns the value(s) of the provider(s) into the state of the LED """
+        if isinstance(providerNames, str):
+            providerNames = (providerNames,)
+        self.__leds.append(McuLed(button, slotIndex, providerNames, getState, values))
+
+    def Update(self):
+        """ Sends the LEDs that changed """
+        providerValues = {}
+        for led in self.__leds:
+            for name in led.providerNames:
+                if name not in providerValues:
+                    providerValues[name] = self.__providers[name]()
+            state = int(led.getState(*[providerValues[name] for name in led.providerNames]))
+            self.__mcuDevice.SetButton(led.button, led.values[state], led.slotIndex, skipIsAssignedCheck = True)
@@ -0,0 +1,42 @@
+class McuMessageOverlay:
+    """
+    The text of the message row: a message that stays until the next one, with temporary messages shown on top of it for a while
+    When a temporary message expires, the message below it is shown again, without recomputing it
+    """
+
+    def __init__(self):
+        self.__text = '' # the message below the temporary message
+        self.__tempText = None # None = no temporary message
+        self.__expireTime = 0
+        self.__dirty = False
+
+    @property
+    def text(self) -> str:
+        """ The text that should be shown """
+        return self.__text if self.__tempText is None else self.__tempText
+
+    @property
+    def isDirty(self) -> bool:
+        """ Whether or not the text changed since the last Update """
+        return self.__dirty
+
+    def SetText(self, text: str):
+        """ Shows a message until the next one (ends a temporary message) """
+        self.__text = text
+        self.__tempText = None
+        self.__dirty = True
+
+    def ShowTempText(self, text: str, duration: float, now: float):
+        """ Shows a message for 'duration' seconds, after which the previous message is shown again """
+        self.__tempText = text
+        self.__expireTime = now + duration
+        self.__dirty = True
+
+    def Update(self, now: float) -> bool:
+        """ Expires the temporary message when it's due, returns True (once) when the text needs to be sent to the device """
+        if self.__tempText is not None and now >= self.__expireTime:
+            self.__tempText = None
+            self.__dirty = True
+        dirty = self.__dirty
+        self.__dirty = False
+        return dirty
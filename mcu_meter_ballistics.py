@@ -0,0 +1,67 @@
+# Host side meter ballistics (attack, release & peak hold) on a dB scaled meter
+# The Xtouch meters show levels 0-14 (14 = clipping) and 15 clears the meter
+
+MeterRangeDb = 60 # the lowest level lights up at -60 dB, used to calculate the release speed
+SilenceThreshold = 10 ** (-100 / 20) # levels below -100 dB are considered silent
+
+# dB values at which meter levels 1-13 light up, level 14 (clipping) lights up at 0 dB and above
+LevelThresholdsDb = [-60, -54, -48, -42, -36, -30, -24, -18, -12, -9, -6, -3, -1]
+LevelThresholds = [10 ** (db / 20) for db in LevelThresholdsDb] # lookup table, as peak values (1 = 0 dB)
+
+ClipLevel = 14
+OffLevel = 15
+
+def PeakToLevel(peak: float) -> int:
+    """ Converts a peak value (0 = silence, 1 = 0 dB, >1 = clipping) to a meter level (0-15) using the dB scale """
+    if peak >= 1:
+        return ClipLevel
+    for level in range(len(LevelThresholds), 0, -1):
+        if peak >= LevelThresholds[level - 1]:
+            return level
+    return 0 if peak > 0 else OffLevel
+
+class McuMeterBallistics:
+    """ Calculates the meter levels of all tracks of a device in one pass, with attack, release and peak hold """
+
+    def __init__(self, trackCount: int, attackTime: float, releaseTime: float, peakHoldTime: float):
+        self.AttackTime = attackTime # time (in seconds) to rise over the full range of the meter, 0 = instant
+        self.ReleaseTime = releaseTime # time (in seconds) to fall over the full range of the meter, 0 = instant
+        self.PeakHoldTime = peakHoldTime # time (in seconds) a peak is held before the meter starts falling
+
+        self.__peaks = [0.0 for i in range(trackCount)] # current (ballistic) peak value per track
+        self.__holdUntil = [0.0 for i in range(trackCount)]
+        self.__lastTime = -1
+
+    def Process(self, peaks, now: float):
+        """ Returns the meter levels (0-15) for the peak values of all tracks, 'now' is the current time in seconds """
+        if self.__lastTime < 0:
+            # first update, just show the current peaks
+            attack = 0
+            release = 0
+        else:
+            elapsed = max(now - self.__lastTime, 0)
+            # rising and falling at a constant speed in dB is the same as multiplying with a constant factor
+            attack = 0 if self.AttackTime <= 0 else 10 ** (MeterRangeDb * elapsed / self.AttackTime / 20)
+            release = 0 if self.ReleaseTime <= 0 else 10 ** (-MeterRangeDb * elapsed / self.ReleaseTime / 20)
+        self.__lastTime = now
+
+        levels = []
+        for i in range(0, len(peaks)):
+            current = self.__peaks[i]
+            if peaks[i] >= current:
+                current = peaks[i] if attack == 0 else min(peaks[i], max(current, LevelThresholds[0]) * attack)
+                self.__holdUntil[i] = now + self.PeakHoldTime
+            elif now >= self.__holdUntil[i]:
+                current = max(peaks[i], current * release)
+
+            if current < SilenceThreshold:
+                current = 0.0
+            self.__peaks[i] = current
+            levels.append(PeakToLevel(current))
+        return levels
+
+    def Reset(self):
+        """ Clears all meters """
+        self.__peaks = [0.0 for i in range(len(self.__peaks))]
+        self.__holdUntil = [0.0 for i in range(len(self.__holdUntil))]
+        self.__lastTime = -1
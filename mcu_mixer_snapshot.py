@@ -0,0 +1,75 @@
+import device
+import mixer
+import transport
+
+class McuMixerSnapshot:
+    """
+    The FL Studio state that's needed to update the strips, fetched at most once per refresh cycle
+    A cycle is started with a 'with' statement (cycles can be nested), outside of a cycle all calls go straight to FL Studio
+    The state must not be changed by the script during a cycle, or the snapshot would return the old values
+    This only removes repeated calls, the values of a strip are only read again when they changed (see OnDirtyMixerTrack & UpdateColT)
+    When the caches are invalidated, every strip still needs its own plugin id & color (plus two name lengths from tracknames),
+    FL Studio's API has no calls that return these for several tracks at once
+    """
+
+    def __init__(self):
+        self.__values = None # (function, args) -> value, None when not in a refresh cycle
+        self.__depth = 0
+
+    def __enter__(self):
+        if self.__depth == 0:
+            self.__values = {}
+        self.__depth += 1
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.__depth -= 1
+        if self.__depth == 0:
+            self.__values = None
+        return False
+
+    @property
+    def isActive(self) -> bool:
+        """ Whether or not a refresh cycle is active """
+        return self.__values is not None
+
+    def Get(self, function, *args):
+        """ Calls an FL Studio function, or returns the result of an earlier call with the same arguments during this cycle """
+        if self.__values is None:
+            return function(*args)
+        key = (function, args)
+        if key in self.__values:
+            return self.__values[key]
+        value = function(*args)
+        self.__values[key] = value
+        return value
+
+    def isAssigned(self) -> bool:
+        return self.Get(device.isAssigned)
+
+    def isRecording(self) -> bool:
+        return self.Get(transport.isRecording)
+
+    def trackNumber(self) -> int:
+        return self.Get(mixer.trackNumber)
+
+    def trackCount(self) -> int:
+        return self.Get(mixer.trackCount)
+
+    def getTrackPluginId(self, index: int, plugIndex: int) -> int:
+        return self.Get(mixer.getTrackPluginId, index, plugIndex)
+
+    def getTrackColor(self, index: int) -> int:
+        return self.Get(mixer.getTrackColor, index)
+
+    def getEventValue(self, *args):
+        return self.Get(mixer.getEventValue, *args)
+
+    def isTrackArmed(self, index: int) -> bool:
+        return self.Get(mixer.isTrackArmed, index)
+
+    def isTrackSolo(self, index: int) -> bool:
+        return self.Get(mixer.isTrackSolo, index)
+
+    def isTrackEnabled(self, index: int) -> bool:
+        return self.Get(mixer.isTrackEnabled, index)
@@ -6,3 +6,5 @@ Sends = 2
 Effects = 3
 Equalizer = 4
 Free = 5
+
+SelectedTrackPages = (Sends, Effects, Equalizer) # the pages that show the controls of the selected track
@@ -0,0 +1,44 @@
+# Collects the updates of the whole device during a page, bank or flip change, so each of them is only done once at the end
+
+# updates that can be deferred
+Strips = 1 # UpdateColT, the tracks/controls on the strips
+MeterMode = 2 # UpdateMeterMode
+TextDisplay = 4 # UpdateTextDisplay, the names and colors on the scribble strips
+MasterSectionLEDs = 8 # UpdateMasterSectionLEDs (main unit only)
+ExtenderLayout = 16 # UpdateExtenderLayout (main unit only)
+
+class McuRefreshTransaction:
+    """
+    While a transaction is active (a 'with' statement, transactions can be nested), updates are only marked as pending
+    The pending updates are done once, in a fixed order, when the outermost transaction ends
+    """
+
+    def __init__(self, flush):
+        self.__flush = flush # called with the pending updates
+        self.__depth = 0
+        self.__pending = 0
+
+    def __enter__(self):
+        self.__depth += 1
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.__depth -= 1
+        if self.__depth == 0 and self.__pending != 0:
+            pending = self.__pending
+            self.__pending = 0
+            if excType is None:
+                self.__flush(pending)
+        return False
+
+    @property
+    def isActive(self) -> bool:
+        """ Whether or not a transaction is active """
+        return self.__depth > 0
+
+    def Defer(self, updates: int) -> bool:
+        """ Marks updates as pending when a transaction is active, returns False when the caller should do them right away """
+        if self.__depth == 0:
+            return False
+        self.__pending |= updates
+        return True
@@ -0,0 +1,46 @@
+import collections
+
+import mixer
+
+class McuRoutingMatrix:
+    """
+    Caches the sends of the mixer tracks for the Sends page: whether a track sends to another one and the name of the send level
+    The sends are kept per source track, for a bounded number of source tracks (the least recently used are dropped first)
+    """
+
+    def __init__(self, size: int):
+        self.Size = size # the maximum number of source tracks
+        self.__rows = collections.OrderedDict() # source track -> { destination track -> (is active, name) }, least recently used first
+
+    def GetSend(self, source: int, destination: int, eventId: int):
+        """ Returns whether the send from source to destination is active and the name of its send level event (eventId) """
+        row = self.__GetRow(source)
+        send = row.get(destination)
+        if send is None:
+            send = (mixer.getRouteSendActive(source, destination), mixer.getEventIDName(eventId))
+            row[destination] = send
+        return send
+
+    def IsCached(self, source: int, destination: int) -> bool:
+        """ Whether or not the send from source to destination is cached """
+        return destination in self.__rows.get(source, {})
+
+    def Invalidate(self, trackNum: int = -1):
+        """ Forgets the sends from and to a track (e.g. after changing its routing or its name), or of all tracks when the track number is -1 """
+        if trackNum == -1:
+            self.__rows.clear()
+        else:
+            self.__rows.pop(trackNum, None)
+            for row in self.__rows.values():
+                row.pop(trackNum, None)
+
+    def __GetRow(self, source: int):
+        row = self.__rows.get(source)
+        if row is None:
+            row = {}
+            self.__rows[source] = row
+            while len(self.__rows) > self.Size:
+                self.__rows.popitem(last = False)
+        else:
+            self.__rows.move_to_end(source)
+        return row
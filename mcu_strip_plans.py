@@ -0,0 +1,79 @@
+import collections
+
+import mcu_knob_mode
+import mcu_track
+
+class McuStripPlan:
+    """ The settings of a strip for a page (event ids, names, knob mode & reset value), as computed by McuBaseClass.BuildStripPlans """
+
+    def __init__(self):
+        self.TrackNum = 0
+        self.BaseEventID = 0
+        self.KnobEventID = 0
+        self.KnobPressEventID = 0
+        self.KnobResetEventID = 0
+        self.KnobResetValue = 0
+        self.KnobMode = mcu_knob_mode.SingleDot
+        self.KnobCenter = 0
+        self.KnobName = ""
+        self.SliderEventID = 0
+        self.SliderName = ""
+
+    def ApplyTo(self, track: mcu_track.McuTrack) -> bool:
+        """ Copies the settings to a track, returns True when the track had other settings """
+        changed = any(getattr(track, name) != value for name, value in vars(self).items())
+        track.TrackNum = self.TrackNum
+        track.BaseEventID = self.BaseEventID
+        track.KnobEventID = self.KnobEventID
+        track.KnobPressEventID = self.KnobPressEventID
+        track.KnobResetEventID = self.KnobResetEventID
+        track.KnobResetValue = self.KnobResetValue
+        track.KnobMode = self.KnobMode
+        track.KnobCenter = self.KnobCenter
+        track.KnobName = self.KnobName
+        track.SliderEventID = self.SliderEventID
+        track.SliderName = self.SliderName
+        return changed
+
+class McuStripPlans:
+    """
+    Caches the strip plans, keyed by page, first track, selected mixer track, flip state and track count (see McuBaseClass.GetStripPlanKey)
+    The plans for the other pages and the banks next to the current one are built ahead of time (from OnIdle), so page & bank changes only have to send the output
+    The cache is bounded, the least recently used plans are dropped first
+    """
+
+    def __init__(self, size: int):
+        self.Size = size # the maximum number of cached plans
+        self.__plans = collections.OrderedDict() # key -> list of McuStripPlan (one per strip), least recently used first
+
+    def Get(self, key, buildPlans):
+        """ Returns the strip plans for a key, buildPlans is called when they aren't cached """
+        plans = self.__plans.get(key)
+        if plans is None:
+            plans = self.__Add(key, buildPlans())
+        else:
+            self.__plans.move_to_end(key)
+        return plans
+
+    def Prefetch(self, key, buildPlans):
+        """ Builds the strip plans for a key when they aren't cached, returns the plans that were built (None when they were cached already) """
+        if key in self.__plans:
+            return None
+        return self.__Add(key, buildPlans())
+
+    def Invalidate(self, trackNum: int = -1):
+        """
+        Forgets the plans that depend on a mixer track (e.g. when it was renamed): the plans that show it and the plans for which it's the selected track
+        Forgets all plans when the track number is -1, e.g. when the routing or plugins have changed
+        """
+        if trackNum == -1:
+            self.__plans.clear()
+        else:
+            for key in [key for key, plans in self.__plans.items() if key[2] == trackNum or any(plan.TrackNum == trackNum for plan in plans)]:
+                del self.__plans[key]
+
+    def __Add(self, key, plans):
+        self.__plans[key] = plans
+        while len(self.__plans) > self.Size:
+            self.__plans.popitem(last = False)
+        return plans
@@ -1,4 +1,5 @@
 import mcu_knob_mode
+import mcu_dirty_flags
 
 class McuTrack:
     """ Represents data for a track on the XTouch """
@@ -16,4 +17,8 @@ class McuTrack:
         self.KnobName = "" # The name of the knob that you will see on the screen when you turn it
         self.SliderEventID = 0
         self.SliderName = "" # The name of the slider that you will see on the screen when you slide it
-        self.Dirty = False # Indicates that the mixer track has changed in FL studio
+        self.DirtyFlags = mcu_dirty_flags.All # Indicates which parts of the track have changed in FL studio (see mcu_dirty_flags)
+        self.DisplayName = "" # The name on the scribble strip, updated when the Name flag is dirty
+        self.Color = 0 # The color of the scribble strip, updated when the Color flag is dirty
+        self.Armed = False # Whether the arm led shows the track as armed, updated when the Arm flag is dirty
+        self.Solo = False # Whether the solo led shows the track as soloed, updated when the Solo flag is dirty
@@ -0,0 +1,31 @@
+import mixer
+
+import mcu_colors
+
+class McuTrackColors:
+    """
+    Caches the colors of the mixer tracks, so the scribble strips don't need to ask FL Studio for them on every bank change
+    A color is fetched again after Invalidate has been called for its track
+    """
+
+    def __init__(self):
+        self.__colors = {} # mixer track number -> FL Studio color
+
+    def Get(self, trackNum: int) -> int:
+        """ The color of a mixer track """
+        color = self.__colors.get(trackNum)
+        if color is None:
+            color = mixer.getTrackColor(trackNum)
+            self.__colors[trackNum] = color
+        return color
+
+    def Prefetch(self, trackNum: int):
+        """ Fetches the color of a track (if it isn't cached) and its color on the device """
+        mcu_colors.GetMcuColor(self.Get(trackNum))
+
+    def Invalidate(self, trackNum: int = -1):
+        """ Forgets the color of a track (e.g. when it was changed), or of all tracks when the track number is -1 """
+        if trackNum == -1:
+            self.__colors.clear()
+        else:
+            self.__colors.pop(trackNum, None)
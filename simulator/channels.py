@@ -0,0 +1,18 @@
+# Fake FL Studio channels module (see fl_state)
+
+import midi
+
+import fl_state
+
+def channelNumber(canBeNone: bool = False) -> int:
+    return fl_state.Current.channels.selectedChannel
+
+def channelCount(globalCount: bool = False) -> int:
+    return len(fl_state.Current.channels.names)
+
+def getChannelName(index: int) -> str:
+    return fl_state.Current.channels.names[index]
+
+def incEventValue(eventId: int, step: int, res: float = midi.EKRes) -> int:
+    value = fl_state.Current.mixer.GetEventValue(eventId) + round(step * res * midi.FromMIDI_Max)
+    return min(max(value, 0), midi.FromMIDI_Max)
@@ -0,0 +1,55 @@
+# Fake FL Studio device module, messages are recorded on the current device (see fl_state)
+
+import midi
+
+import fl_state
+
+def _Record(kind: str, data, slotIndex: int = -1, receiverIndex: int = -1):
+    device = fl_state.Current.currentDevice
+    message = fl_state.OutputMessage(fl_state.Current.clock(), kind, data, slotIndex, receiverIndex)
+    device.output.append(message)
+    return device
+
+def isAssigned() -> bool:
+    return fl_state.Current.currentDevice.assigned
+
+def getName() -> str:
+    return fl_state.Current.currentDevice.name
+
+def getPortNumber() -> int:
+    return fl_state.Current.currentDevice.portNumber
+
+def midiOutMsg(message: int, channel: int = -1, data1: int = -1, data2: int = -1):
+    if channel != -1:
+        message = message + channel + (data1 << 8) + (data2 << 16)
+    _Record('msg', message)
+
+def midiOutNewMsg(message: int, slotIndex: int):
+    _Record('newMsg', message, slotIndex)
+
+def midiOutSysex(message: bytes):
+    _Record('sysex', bytes(message))
+
+def dispatchReceiverCount() -> int:
+    return len(fl_state.Current.currentDevice.receivers)
+
+def dispatch(ctrlIndex: int, message: int, sysex: bytes = None):
+    device = _Record('dispatch', message if sysex is None else bytes(sysex), receiverIndex = ctrlIndex)
+    if 0 <= ctrlIndex < len(device.receivers) and device.onDispatch is not None:
+        device.onDispatch(device.receivers[ctrlIndex], message, sysex)
+
+def setHasMeters():
+    fl_state.Current.currentDevice.hasMeters = True
+
+def directFeedback(eventData):
+    pass
+
+def processMIDICC(eventData):
+    eventData.handled = True
+
+def hardwareRefreshMixerTrack(index: int):
+    # the scripts rely on this to refresh the track names as well
+    fl_state.Current.SetDirty(index, midi.HW_Dirty_Mixer_Display | midi.HW_Dirty_Mixer_Controls)
+
+def baseTrackSelect(index: int, step: int):
+    pass
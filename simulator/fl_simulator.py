@@ -0,0 +1,193 @@
+# Runs the device scripts outside of FL Studio, using the fake FL Studio API modules in this folder
+# midi and utils are used from the FL Studio API stubs (see requirements.txt)
+#
+#   with fl_simulator.FlSimulator() as simulator:
+#       main = simulator.LoadScript('device_XTouch.py')
+#       extender = simulator.LoadScript('device_XTouch_Ext.py', receiverOf = main)
+#       simulator.Init()
+#       simulator.SendMidi(main, midi.MIDI_NOTEON, 0, mcu_buttons.Play, 0x7F)
+#       simulator.Run(1.0)
+#       print(main.output)
+
+import importlib.util
+import os
+import sys
+import time
+
+SimulatorFolder = os.path.dirname(os.path.abspath(__file__))
+RepoFolder = os.path.dirname(SimulatorFolder)
+
+import midi
+
+# the fake modules import fl_state as a top level module as well
+sys.path.insert(0, SimulatorFolder)
+import fl_state
+sys.path.remove(SimulatorFolder)
+
+FlModules = ['device', 'mixer', 'transport', 'ui', 'general', 'channels', 'patterns', 'playlist']
+
+class MidiEvent:
+    """ The event object FL Studio passes to OnMidiMsg """
+
+    def __init__(self, midiId: int, midiChan: int, data1: int, data2: int, pmeFlags: int = midi.PME_System | midi.PME_System_Safe, port: int = 0):
+        self.midiId = midiId
+        self.midiChan = midiChan
+        self.midiChanEx = midiChan
+        self.status = midiId + midiChan
+        self.data1 = data1
+        self.data2 = data2
+        self.pmeFlags = pmeFlags
+        self.port = port
+        self.handled = False
+        self.timestamp = 0
+        self.sysex = None
+        self.isIncrement = 0
+        self.inEv = 0
+        self.outEv = 0
+        self.controlNum = data1
+        self.controlVal = data2
+        self.res = 0
+        self.note = data1
+
+    @staticmethod
+    def FromMessage(message: int, pmeFlags: int, port: int = 0):
+        """ Creates an event from a midi message in FL Studio's int format (status + data1 << 8 + data2 << 16) """
+        status = message & 0xFF
+        return MidiEvent(status & 0xF0, status & 0x0F, (message >> 8) & 0x7F, (message >> 16) & 0x7F, pmeFlags, port)
+
+class FlSimulator:
+    """
+    A simulated FL Studio instance with one or more device scripts loaded
+    Time is virtual by default, it only advances through Advance and Run
+    """
+
+    def __init__(self, trackCount: int = 127, virtualTime: bool = True):
+        self.now = 0.0
+        self.virtualTime = virtualTime
+        self.devices = []
+
+        # scripts need to be imported with the fake modules, the modules they replace are restored by Close
+        self.__savedModules = {}
+        for name, module in list(sys.modules.items()):
+            if name in FlModules or os.path.dirname(os.path.abspath(getattr(module, '__file__', None) or os.devnull)) == RepoFolder:
+                self.__savedModules[name] = sys.modules.pop(name)
+        self.__savedPath = list(sys.path)
+        sys.path.insert(0, SimulatorFolder)
+        sys.path.insert(1, RepoFolder)
+
+        self.state = fl_state.FlState(trackCount, self.Time)
+        fl_state.Current = self.state
+
+    def Close(self):
+        """ Unloads the scripts and restores the modules that were replaced by the fake modules """
+        for name, module in list(sys.modules.items()):
+            if name in FlModules or os.path.dirname(os.path.abspath(getattr(module, '__file__', None) or os.devnull)) == RepoFolder:
+                del sys.modules[name]
+        sys.modules.update(self.__savedModules)
+        sys.path[:] = self.__savedPath
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
+
+    def Time(self) -> float:
+        """ The current (virtual) time in seconds """
+        return self.now if self.virtualTime else time.time()
+
+    def Advance(self, seconds: float):
+        """ Advances the virtual time """
+        self.now += seconds
+
+    def LoadScript(self, fileName: str, name: str = None, receiverOf: fl_state.SimulatedDevice = None) -> fl_state.SimulatedDevice:
+        """ Loads a device script (file in the repository folder), optionally as a receiver (extender) of another device """
+        device = fl_state.SimulatedDevice(name or os.path.splitext(fileName)[0], len(self.devices))
+        device.onDispatch = self.__OnDispatch
+        if receiverOf is not None:
+            receiverOf.receivers.append(device)
+
+        spec = importlib.util.spec_from_file_location('{}_{}'.format(os.path.splitext(fileName)[0], len(self.devices)), os.path.join(RepoFolder, fileName))
+        device.script = importlib.util.module_from_spec(spec)
+        self.devices.append(device)
+        self.Call(device, None, spec.loader.exec_module, device.script)
+        return device
+
+    def Call(self, device: fl_state.SimulatedDevice, callbackName: str, *args):
+        """ Calls a callback of a script (if it has one), with the device and the time of the simulator active """
+        callback = args[0] if callbackName is None else getattr(device.script, callbackName, None)
+        if callbackName is None:
+            args = args[1:]
+        if callback is None:
+            return None
+
+        previousDevice = self.state.currentDevice
+        previousTime = time.time
+        self.state.currentDevice = device
+        if self.virtualTime:
+            time.time = self.Time
+        try:
+            return callback(*args)
+        finally:
+            time.time = previousTime
+            self.state.currentDevice = previousDevice
+
+    def CallAll(self, callbackName: str, *args):
+        """ Calls a callback on all scripts """
+        for device in self.devices:
+            self.Call(device, callbackName, *args)
+
+    def __OnDispatch(self, receiver: fl_state.SimulatedDevice, message: int, sysex: bytes):
+        if sysex is None:
+            self.Call(receiver, 'OnMidiMsg', MidiEvent.FromMessage(message, midi.PME_System | midi.PME_System_Safe | midi.PME_FromScript, receiver.portNumber))
+
+    def Init(self):
+        """ Starts all scripts, like FL Studio does when loading a project """
+        self.CallAll('OnInit')
+        self.state.SetDirty(-1, midi.HW_Dirty_Mixer_Sel | midi.HW_Dirty_Mixer_Display | midi.HW_Dirty_Mixer_Controls | midi.HW_Dirty_LEDs)
+        self.Refresh()
+
+    def DeInit(self):
+        self.CallAll('OnDeInit')
+
+    def SendMidi(self, device: fl_state.SimulatedDevice, midiId: int, midiChan: int, data1: int, data2: int, pmeFlags: int = midi.PME_System | midi.PME_System_Safe) -> MidiEvent:
+        """ Sends a midi message from the hardware to a script, returns the event after it has been handled """
+        event = MidiEvent(midiId, midiChan, data1, data2, pmeFlags, device.portNumber)
+        self.Call(device, 'OnMidiMsg', event)
+        return event
+
+    def Refresh(self):
+        """ Calls OnDirtyMixerTrack and OnRefresh for the changes that were made since the last refresh """
+        while self.state.dirtyMixerTracks or self.state.dirtyFlags:
+            dirtyMixerTracks = self.state.dirtyMixerTracks
+            flags = self.state.dirtyFlags
+            self.state.dirtyMixerTracks = []
+            self.state.dirtyFlags = 0
+            for trackIndex in dirtyMixerTracks:
+                self.CallAll('OnDirtyMixerTrack', trackIndex)
+            if flags:
+                self.CallAll('OnRefresh', flags)
+
+    def UpdateMeters(self):
+        for device in self.devices:
+            if device.hasMeters:
+                self.Call(device, 'OnUpdateMeters')
+
+    def Idle(self):
+        self.CallAll('OnIdle')
+
+    def Run(self, seconds: float, interval: float = 0.02, beforeTick = None):
+        """ Runs FL Studio's main loop for some (virtual) time, 'beforeTick' is called with the simulator before each tick """
+        end = self.now + seconds
+        while self.now + interval <= end + 1e-9:
+            self.Advance(interval)
+            if beforeTick is not None:
+                beforeTick(self)
+            self.Refresh()
+            self.UpdateMeters()
+            self.Idle()
+
+    def ClearOutput(self):
+        """ Forgets the messages that were sent by all scripts """
+        for device in self.devices:
+            device.output = []
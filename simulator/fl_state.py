@@ -0,0 +1,168 @@
+# The state of the simulated FL Studio instance, used by the fake FL Studio API modules in this folder
+
+import time
+
+import midi
+
+class OutputMessage:
+    """ A message sent by a script through the device module """
+
+    def __init__(self, timestamp: float, kind: str, data, slotIndex: int = -1, receiverIndex: int = -1):
+        self.timestamp = timestamp
+        self.kind = kind # 'msg', 'newMsg', 'sysex' or 'dispatch'
+        self.data = data # int for midi messages, bytes for sysex messages
+        self.slotIndex = slotIndex # only for 'newMsg'
+        self.receiverIndex = receiverIndex # only for 'dispatch'
+
+    @property
+    def size(self) -> int:
+        """ Number of bytes on the wire """
+        if isinstance(self.data, (bytes, bytearray)):
+            return len(self.data)
+        status = self.data & 0xF0
+        return 2 if status == midi.MIDI_PROGRAMCHANGE or status == midi.MIDI_CHANAFTERTOUCH else 3
+
+    def __repr__(self):
+        data = self.data.hex() if isinstance(self.data, (bytes, bytearray)) else hex(self.data)
+        return 'OutputMessage({:.3f}, {}, {})'.format(self.timestamp, self.kind, data)
+
+class SimulatedDevice:
+    """ A MIDI device (port) with a script assigned to it """
+
+    def __init__(self, name: str, portNumber: int, assigned: bool = True):
+        self.name = name
+        self.portNumber = portNumber
+        self.assigned = assigned
+        self.hasMeters = False
+        self.receivers = [] # devices that receive messages through device.dispatch
+        self.script = None # the loaded script module
+        self.output = [] # every OutputMessage sent by the script
+        self.onDispatch = None # called with (receiver, message, sysex) when the script dispatches a message
+
+class MixerTrack:
+    """ A mixer track, event values (volume, pan, ...) are stored in the mixer """
+
+    def __init__(self, index: int, name: str, color: int = -10261391):
+        self.index = index
+        self.name = name
+        self.color = color
+        self.enabled = True
+        self.solo = False
+        self.armed = False
+        self.peaks = 0.0 # 0 = silence, 1 = 0 dB, can also be a function taking the time in seconds
+        self.routes = set() # indexes of the tracks this track sends to
+        self.plugins = {} # slot index -> plugin name
+        self.recordingFileName = ''
+
+class Mixer:
+    """ The mixer, track 0 is the master track """
+
+    def __init__(self, trackCount: int = 127):
+        self.tracks = [MixerTrack(0, 'Master')] + [MixerTrack(n, 'Insert ' + str(n)) for n in range(1, trackCount)]
+        self.selectedTrack = 0
+        self.tempo = 130000 # BPM * 1000
+        self.eventValues = {} # REC event id -> value (0 - midi.FromMIDI_Max)
+        self.remoteLinks = {} # remote control id -> value (0.0 - 1.0) of the linked event
+
+    def GetTrackPluginId(self, index: int, plugIndex: int) -> int:
+        return midi.REC_Plug_First + ((index << 6) + plugIndex) * midi.REC_ItemRange
+
+    def DecodeEventId(self, eventId: int):
+        """ Returns the (track index, plugin index, parameter) of a mixer event, or None for other events """
+        if midi.REC_Plug_First <= eventId <= midi.REC_Plug_Last:
+            item = (eventId - midi.REC_Plug_First) // midi.REC_ItemRange
+            return item >> 6, item & 0x3F, eventId & midi.REC_ItemMask
+        return None
+
+    def GetDefaultEventValue(self, eventId: int) -> int:
+        decoded = self.DecodeEventId(eventId)
+        if eventId == midi.REC_MainVol or decoded is not None and decoded[2] == midi.REC_Mixer_Vol - midi.REC_Plug_First:
+            return round(12800 / 16000 * midi.FromMIDI_Max)
+        if decoded is not None and decoded[2] in [midi.REC_Mixer_Pan - midi.REC_Plug_First, midi.REC_Mixer_SS - midi.REC_Plug_First]:
+            return midi.FromMIDI_Max >> 1
+        return 0
+
+    def GetEventValue(self, eventId: int) -> int:
+        if eventId < 0:
+            return 0
+        return self.eventValues.get(eventId, self.GetDefaultEventValue(eventId))
+
+    def SetEventValue(self, eventId: int, value: int):
+        self.eventValues[eventId] = min(max(int(value), 0), midi.FromMIDI_Max)
+
+class Transport:
+
+    def __init__(self):
+        self.playing = False
+        self.recording = False
+        self.songPos = 0 # in ticks
+        self.loopMode = 0 # 0 = pattern, 1 = song
+        self.playbackSpeed = 1.0
+        self.commands = [] # (command, value, pmeFlags) passed to globalTransport
+        self.globalTransportResult = midi.GT_Global
+
+class Ui:
+
+    def __init__(self):
+        self.focusedWindow = midi.widMixer
+        self.visibleWindows = set([midi.widMixer])
+        self.hintMsg = ''
+        self.hintValue = ''
+        self.progTitle = 'FL Studio'
+        self.version = '21.0.3'
+        self.timeDispMin = False
+        self.snapMode = 0
+        self.focusedFormCaption = ''
+        self.closing = False
+
+class General:
+
+    def __init__(self):
+        self.useMetronome = False
+        self.precount = False
+        self.changedFlag = 0
+        self.undoLevelHint = '1/1'
+        self.recEvents = [] # (eventId, value, flags) passed to processRECEvent
+
+class Channels:
+
+    def __init__(self):
+        self.names = ['Kick', 'Clap', 'Hat', 'Snare']
+        self.selectedChannel = 0
+
+class Patterns:
+
+    def __init__(self):
+        self.names = ['Pattern 1']
+        self.selectedPattern = 1
+
+class Playlist:
+
+    def __init__(self):
+        self.visTimeBar = 1
+        self.visTimeStep = 1
+        self.visTimeTick = 0
+
+class FlState:
+    """ Everything the fake FL Studio API modules read and write """
+
+    def __init__(self, trackCount: int = 127, clock = time.time):
+        self.clock = clock # returns the current time in seconds
+        self.mixer = Mixer(trackCount)
+        self.transport = Transport()
+        self.ui = Ui()
+        self.general = General()
+        self.channels = Channels()
+        self.patterns = Patterns()
+        self.playlist = Playlist()
+        self.currentDevice = SimulatedDevice('X-Touch', 0) # the device of the script that is being called
+        self.dirtyMixerTracks = [] # track indexes for OnDirtyMixerTrack, -1 = all tracks
+        self.dirtyFlags = 0 # flags for OnRefresh
+
+    def SetDirty(self, trackIndex: int, flags: int):
+        """ Queues OnDirtyMixerTrack and OnRefresh calls, like FL Studio does after a change """
+        if trackIndex != -2 and trackIndex not in self.dirtyMixerTracks:
+            self.dirtyMixerTracks.append(trackIndex)
+        self.dirtyFlags |= flags
+
+Current = FlState()
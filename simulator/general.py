@@ -0,0 +1,20 @@
+# Fake FL Studio general module (see fl_state)
+
+import fl_state
+
+def processRECEvent(eventId: int, value: int, flags: int) -> int:
+    fl_state.Current.general.recEvents.append((eventId, value, flags))
+    fl_state.Current.mixer.SetEventValue(eventId, value)
+    return value
+
+def getUndoLevelHint() -> str:
+    return fl_state.Current.general.undoLevelHint
+
+def getUseMetronome() -> bool:
+    return fl_state.Current.general.useMetronome
+
+def getPrecount() -> bool:
+    return fl_state.Current.general.precount
+
+def getChangedFlag() -> int:
+    return fl_state.Current.general.changedFlag
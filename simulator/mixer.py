@@ -0,0 +1,124 @@
+# Fake FL Studio mixer module (see fl_state for the simulated mixer)
+
+import midi
+
+import fl_state
+
+def _Mixer():
+    return fl_state.Current.mixer
+
+def _Track(index: int):
+    return fl_state.Current.mixer.tracks[index]
+
+def trackNumber() -> int:
+    return _Mixer().selectedTrack
+
+def setTrackNumber(trackNumber: int, flags: int = 0):
+    _Mixer().selectedTrack = trackNumber
+    fl_state.Current.SetDirty(-2, midi.HW_Dirty_Mixer_Sel)
+
+def trackCount() -> int:
+    return len(_Mixer().tracks)
+
+def getTrackName(index: int, maxLen: int = 0) -> str:
+    name = _Track(index).name
+    if maxLen > 0 and len(name) > maxLen:
+        # shortened like FL Studio does: without spaces and vowels first
+        name = name.replace(' ', '')
+        if len(name) > maxLen:
+            name = name[0] + ''.join(c for c in name[1:] if c not in 'aeiou')
+    return name[:maxLen] if maxLen > 0 else name
+
+def setTrackName(index: int, name: str):
+    _Track(index).name = name
+    fl_state.Current.SetDirty(index, midi.HW_Dirty_Mixer_Display)
+
+def getTrackColor(index: int) -> int:
+    return _Track(index).color
+
+def isTrackArmed(index: int) -> bool:
+    return _Track(index).armed
+
+def armTrack(index: int):
+    _Track(index).armed = not _Track(index).armed
+    fl_state.Current.SetDirty(index, midi.HW_Dirty_Mixer_Controls | midi.HW_Dirty_LEDs)
+
+def isTrackSolo(index: int) -> bool:
+    return _Track(index).solo
+
+def soloTrack(index: int, value: int = -1, mode: int = -1):
+    track = _Track(index)
+    solo = not track.solo if value == -1 else bool(value)
+    for other in _Mixer().tracks:
+        other.solo = False
+    track.solo = solo
+    fl_state.Current.SetDirty(-1, midi.HW_Dirty_Mixer_Controls)
+
+def isTrackEnabled(index: int) -> bool:
+    return _Track(index).enabled
+
+def enableTrack(index: int):
+    _Track(index).enabled = not _Track(index).enabled
+    fl_state.Current.SetDirty(index, midi.HW_Dirty_Mixer_Controls)
+
+def isTrackPluginValid(index: int, plugIndex: int) -> bool:
+    return plugIndex in _Track(index).plugins
+
+def isTrackAutomationEnabled(index: int, plugIndex: int) -> bool:
+    return plugIndex in _Track(index).plugins
+
+def getTrackPluginId(index: int, plugIndex: int) -> int:
+    return _Mixer().GetTrackPluginId(index, plugIndex)
+
+def getTrackPeaks(index: int, mode: int) -> float:
+    peaks = _Track(index).peaks
+    return peaks(fl_state.Current.clock()) if callable(peaks) else peaks
+
+def getTrackRecordingFileName(index: int) -> str:
+    return _Track(index).recordingFileName
+
+def getRouteSendActive(index: int, destIndex: int) -> bool:
+    return destIndex in _Track(index).routes
+
+def setRouteTo(index: int, destIndex: int, value: bool):
+    if value:
+        _Track(index).routes.add(destIndex)
+    else:
+        _Track(index).routes.discard(destIndex)
+
+def afterRoutingChanged():
+    fl_state.Current.SetDirty(-1, midi.HW_Dirty_Mixer_Display)
+
+def linkTrackToChannel(mode: int):
+    pass
+
+def getCurrentTempo(asInt: bool = False):
+    tempo = _Mixer().tempo
+    return tempo if asInt else tempo / 1000
+
+def getEventValue(index: int, value: int = midi.MaxInt, smoothTarget: bool = True) -> int:
+    return _Mixer().GetEventValue(index)
+
+def getAutoSmoothEventValue(index: int, locked: int = 1) -> int:
+    return _Mixer().GetEventValue(index)
+
+def automateEvent(index: int, value: int, flags: int, speed: int = 0, isIncrement: int = 0, res: float = midi.EKRes) -> int:
+    if isIncrement:
+        value = _Mixer().GetEventValue(index) + round(value * res * midi.FromMIDI_Max)
+    _Mixer().SetEventValue(index, value)
+    decoded = _Mixer().DecodeEventId(index)
+    fl_state.Current.SetDirty(decoded[0] if decoded is not None else -1, midi.HW_Dirty_Mixer_Controls)
+    return 0
+
+def getEventIDName(index: int, shortName: bool = False) -> str:
+    decoded = _Mixer().DecodeEventId(index)
+    if decoded is None:
+        return 'Event ' + str(index)
+    trackIndex, plugIndex, parameter = decoded
+    return _Track(trackIndex).name + ' - Param ' + str(parameter)
+
+def getEventIDValueString(index: int, value: int) -> str:
+    return str(round(value * 100 / midi.FromMIDI_Max)) + '%'
+
+def remoteFindEventValue(index: int, flags: int = 0) -> float:
+    return _Mixer().remoteLinks.get(index, -1)
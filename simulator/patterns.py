@@ -0,0 +1,12 @@
+# Fake FL Studio patterns module (see fl_state)
+
+import fl_state
+
+def patternNumber() -> int:
+    return fl_state.Current.patterns.selectedPattern
+
+def patternCount() -> int:
+    return len(fl_state.Current.patterns.names)
+
+def getPatternName(index: int) -> str:
+    return fl_state.Current.patterns.names[index - 1]
@@ -0,0 +1,12 @@
+# Fake FL Studio playlist module (see fl_state)
+
+import fl_state
+
+def getVisTimeBar() -> int:
+    return fl_state.Current.playlist.visTimeBar
+
+def getVisTimeStep() -> int:
+    return fl_state.Current.playlist.visTimeStep
+
+def getVisTimeTick() -> int:
+    return fl_state.Current.playlist.visTimeTick
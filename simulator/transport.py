@@ -0,0 +1,42 @@
+# Fake FL Studio transport module (see fl_state for the simulated transport)
+
+import midi
+
+import fl_state
+
+def _Transport():
+    return fl_state.Current.transport
+
+def globalTransport(command: int, value: int, pmeflags: int = midi.PME_System, flags: int = midi.GT_All) -> int:
+    transport = _Transport()
+    transport.commands.append((command, value, pmeflags))
+    if value > 0:
+        if command == midi.FPT_Play:
+            transport.playing = not transport.playing
+        elif command == midi.FPT_Stop:
+            transport.playing = False
+            transport.recording = False
+        elif command == midi.FPT_Record:
+            transport.recording = not transport.recording
+        elif command == midi.FPT_Loop:
+            transport.loopMode = 1 - transport.loopMode
+        fl_state.Current.SetDirty(-2, midi.HW_Dirty_LEDs)
+    return transport.globalTransportResult
+
+def isPlaying() -> bool:
+    return _Transport().playing
+
+def isRecording() -> bool:
+    return _Transport().recording
+
+def getLoopMode() -> int:
+    return _Transport().loopMode
+
+def getSongPos(mode: int = -1):
+    return _Transport().songPos
+
+def setSongPos(position, mode: int = -1):
+    _Transport().songPos = position
+
+def setPlaybackSpeed(speedMultiplier: float):
+    _Transport().playbackSpeed = speedMultiplier
@@ -0,0 +1,49 @@
+# Fake FL Studio ui module (see fl_state for the simulated user interface)
+
+import fl_state
+
+def _Ui():
+    return fl_state.Current.ui
+
+def showWindow(index: int):
+    _Ui().visibleWindows.add(index)
+    _Ui().focusedWindow = index
+
+def setFocused(index: int):
+    _Ui().focusedWindow = index
+
+def getFocused(index: int) -> bool:
+    return _Ui().focusedWindow == index
+
+def getFocusedFormCaption() -> str:
+    return _Ui().focusedFormCaption
+
+def getHintMsg() -> str:
+    return _Ui().hintMsg
+
+def getHintValue(value: int, max: int) -> str:
+    return _Ui().hintValue
+
+def getProgTitle() -> str:
+    return _Ui().progTitle
+
+def getVersion(mode: int = 4):
+    return _Ui().version
+
+def getTimeDispMin() -> bool:
+    return _Ui().timeDispMin
+
+def setTimeDispMin():
+    _Ui().timeDispMin = not _Ui().timeDispMin
+
+def getSnapMode() -> int:
+    return _Ui().snapMode
+
+def selectBrowserMenuItem():
+    pass
+
+def launchAudioEditor(reuse: bool, filename: str, index: int, preset: str, presetGUID: str) -> bool:
+    return True
+
+def isClosing() -> bool:
+    return _Ui().closing
@@ -0,0 +1,17 @@
+import unittest
+
+from benchmarks import benchmark_extender_scaling
+
+class TestExtenderScaling(unittest.TestCase):
+
+    def test_find_superlinear_growth(self):
+        self.assertEqual(benchmark_extender_scaling.FindSuperlinearGrowth([10, 20, 30, 40]), [])
+        self.assertEqual(benchmark_extender_scaling.FindSuperlinearGrowth([10, 20, 30, 60, 70]), [3])
+        self.assertEqual(benchmark_extender_scaling.FindSuperlinearGrowth([10, 10, 10]), [])
+
+    def test_cost_grows_linearly(self):
+        results = benchmark_extender_scaling.Run()
+        self.assertEqual(benchmark_extender_scaling.CheckScaling(results), [])
+
+if __name__ == '__main__':
+    unittest.main()
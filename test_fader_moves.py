@@ -0,0 +1,131 @@
+import unittest
+from unittest import mock
+
+import midi
+
+import mcu_buttons
+import mcu_constants
+import mcu_dirty_flags
+import device_XTouch
+from benchmarks.benchmark_midi_dispatch import MidiEvent
+
+class TestFaderMoves(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100
+        patchers = [
+            mock.patch('time.time', lambda: self.now),
+            mock.patch('mixer.automateEvent'),
+            mock.patch('mixer.getEventIDValueString', return_value = ''),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.script = device_XTouch.TMackieCU()
+        for index, track in enumerate(self.script.Tracks):
+            track.SliderEventID = 100 + index
+            track.SliderName = 'Track ' + str(index)
+
+    def MoveFader(self, fader: int, value: int):
+        self.script.OnMidiMsg(MidiEvent(midi.MIDI_PITCHBEND, fader, value & 0x7F, value >> 7))
+
+    def Automated(self):
+        """ Returns the event ids sent to FL Studio """
+        import mixer
+        return [call.args[0] for call in mixer.automateEvent.call_args_list]
+
+    def test_only_latest_value_per_fader_is_sent(self):
+        for value in [1000, 2000, 3000]:
+            self.MoveFader(0, value)
+            self.MoveFader(1, value + 100)
+        self.assertEqual(self.Automated(), [])
+        self.script.FlushFaderMoves()
+        self.assertEqual(self.Automated(), [100, 101])
+
+    def test_most_recently_moved_fader_is_sent_last_and_shown(self):
+        with mock.patch.object(self.script, 'OnSendMsg') as onSendMsg:
+            self.MoveFader(0, 1000)
+            self.MoveFader(1, 1000)
+            self.MoveFader(0, 2000)
+            self.script.FlushFaderMoves()
+        self.assertEqual(self.Automated(), [101, 100])
+        onSendMsg.assert_called_once_with('Track 0')
+
+    def test_flush_interval(self):
+        with mock.patch.object(mcu_constants, 'FaderFlushInterval', 0.1):
+            self.MoveFader(0, 1000)
+            self.script.FlushFaderMoves()
+            self.assertEqual(len(self.Automated()), 1)
+            self.MoveFader(0, 2000)
+            self.now = 100.05
+            self.script.FlushFaderMoves()
+            self.assertEqual(len(self.Automated()), 1) # too soon
+            self.now = 100.15
+            self.script.FlushFaderMoves()
+            self.assertEqual(len(self.Automated()), 2)
+
+class TestFaderTouch(unittest.TestCase):
+
+    def setUp(self):
+        self.volume = 0
+        self.sent = []
+        self.slots = {}
+        patchers = [
+            mock.patch('mixer.automateEvent'),
+            mock.patch('mixer.getEventIDValueString', return_value = ''),
+            mock.patch('mixer.getEventValue', lambda *args: self.volume),
+            mock.patch('device.isAssigned', return_value = True),
+            mock.patch('device.midiOutMsg', lambda message: self.sent.append(message)),
+            mock.patch('device.midiOutNewMsg', self.MidiOutNewMsg),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.script = device_XTouch.TMackieCU()
+        self.script.Tracks[0].SliderEventID = 100
+        self.script.UpdateTrack(0)
+
+    def MidiOutNewMsg(self, message: int, slotIndex: int):
+        """ Like FL Studio, drops a message that equals the last one of its slot """
+        if self.slots.get(slotIndex) != message:
+            self.slots[slotIndex] = message
+            self.sent.append(message)
+
+    def Touch(self, isTouched: bool):
+        self.script.OnMidiMsg(MidiEvent(midi.MIDI_NOTEON, 0, mcu_buttons.Slider_1, 0x7F if isTouched else 0))
+
+    def MotorMoves(self):
+        return [message for message in self.sent if message & 0xFF == midi.MIDI_PITCHBEND + 0]
+
+    def test_motor_is_not_moved_while_touched(self):
+        self.Touch(True)
+        self.sent.clear()
+        self.volume = midi.FromMIDI_Max # e.g. changed by automation
+        self.script.UpdateTrack(0)
+        self.assertEqual(self.MotorMoves(), [])
+
+    def test_release_sends_move_and_resyncs_motor(self):
+        import mixer
+        self.Touch(True)
+        self.script.OnMidiMsg(MidiEvent(midi.MIDI_PITCHBEND, 0, 0, 0x40))
+        self.sent.clear()
+        self.Touch(False)
+        mixer.automateEvent.assert_called_once()
+        self.assertEqual(len(self.MotorMoves()), 1) # even when FL Studio's value is where the motor was sent last
+        self.volume = midi.FromMIDI_Max
+        self.script.Tracks[0].DirtyFlags |= mcu_dirty_flags.Fader
+        self.script.UpdateTrack(0)
+        self.assertEqual(len(self.MotorMoves()), 2)
+
+    def test_touch_selects_track(self):
+        self.script.Tracks[0].TrackNum = 5
+        with mock.patch('mixer.trackNumber', return_value = 5), mock.patch('mixer.setTrackNumber') as setTrackNumber:
+            self.Touch(True)
+            setTrackNumber.assert_not_called() # already selected
+        self.Touch(False)
+        with mock.patch('mixer.trackNumber', return_value = 2), mock.patch('mixer.setTrackNumber') as setTrackNumber:
+            self.Touch(True)
+            setTrackNumber.assert_called_once_with(5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+import midi
+from mcu_armed_tracks import McuArmedTracks
+from simulator import fl_simulator
+
+class TestMcuArmedTracks(unittest.TestCase):
+
+    def setUp(self):
+        self.armed = set()
+        patchers = [
+            mock.patch('mixer.isTrackArmed', lambda index: index in self.armed),
+            mock.patch('mixer.trackCount', lambda: 127),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_update(self):
+        armedTracks = McuArmedTracks(2)
+        self.assertFalse(armedTracks.isAnyArmed)
+        self.armed.add(5)
+        self.assertTrue(armedTracks.Update(5))
+        self.assertTrue(armedTracks.isAnyArmed)
+        self.assertTrue(armedTracks.IsArmed(5))
+        self.assertFalse(armedTracks.Update(5))
+        self.armed.clear()
+        self.assertTrue(armedTracks.Update(5))
+        self.assertFalse(armedTracks.isAnyArmed)
+        self.assertFalse(armedTracks.IsArmed(5))
+
+    def test_reconcile(self):
+        armedTracks = McuArmedTracks(2)
+        self.armed.add(100)
+        self.assertTrue(armedTracks.ReconcileIfDue(0)) # pending from the start
+        self.assertTrue(armedTracks.isAnyArmed)
+        self.armed.clear()
+        self.assertFalse(armedTracks.ReconcileIfDue(1))
+        self.assertTrue(armedTracks.isAnyArmed)
+        self.assertTrue(armedTracks.ReconcileIfDue(2))
+        self.assertFalse(armedTracks.isAnyArmed)
+
+    def test_invalidate(self):
+        armedTracks = McuArmedTracks(2)
+        armedTracks.ReconcileIfDue(0)
+        self.armed.add(100)
+        armedTracks.Invalidate()
+        self.assertTrue(armedTracks.ReconcileIfDue(0.1))
+
+class TestRudeSoloLed(unittest.TestCase):
+
+    def test_led_follows_armed_tracks(self):
+        with fl_simulator.FlSimulator() as simulator:
+            main = simulator.LoadScript('device_XTouch.py')
+            simulator.Init()
+            simulator.Run(0.1)
+            simulator.ClearOutput()
+            simulator.state.mixer.tracks[120].armed = True # not visible on the device
+            simulator.Run(2.1)
+            self.assertIn((midi.MIDI_NOTEON + (0x73 << 8) + (0x7F << 16)), [message.data for message in main.output if message.slotIndex == 16])
+
+    def test_strip_and_rude_solo_leds_agree(self):
+        with fl_simulator.FlSimulator() as simulator:
+            main = simulator.LoadScript('device_XTouch.py')
+            simulator.Init()
+            simulator.Run(0.1)
+            simulator.ClearOutput()
+            simulator.state.mixer.tracks[1].armed = True # on the first strip
+            simulator.state.SetDirty(1, midi.HW_Dirty_Mixer_Controls)
+            simulator.Run(0.1)
+            data = [message.data for message in main.output]
+            self.assertIn(midi.MIDI_NOTEON + (0x73 << 8) + (0x7F << 16), data) # rude solo
+            self.assertIn(midi.MIDI_NOTEON + (0x00 << 8) + (0x7F << 16), data) # record 1
+
+if __name__ == '__main__':
+    unittest.main()
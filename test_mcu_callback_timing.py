@@ -0,0 +1,50 @@
+import unittest
+from mcu_callback_timing import McuCallbackTiming
+
+class TestMcuCallbackTiming(unittest.TestCase):
+
+    def test_disabled_does_not_measure(self):
+        timing = McuCallbackTiming(False)
+        with timing.Measure('OnIdle'):
+            pass
+        self.assertEqual(timing.GetNames(), [])
+
+    def test_enabled_measures(self):
+        timing = McuCallbackTiming(True)
+        with timing.Measure('OnIdle'):
+            pass
+        self.assertEqual(timing.GetNames(), ['OnIdle'])
+        self.assertEqual(timing.GetStats('OnIdle')[0], 1)
+
+    def test_stats(self):
+        timing = McuCallbackTiming(True)
+        for n in range(1, 101):
+            timing.Add('OnMidiMsg', n / 1000)
+        count, minimum, mean, p99, maximum = timing.GetStats('OnMidiMsg')
+        self.assertEqual(count, 100)
+        self.assertAlmostEqual(minimum, 0.001)
+        self.assertAlmostEqual(mean, 0.0505)
+        self.assertAlmostEqual(p99, 0.1)
+        self.assertAlmostEqual(maximum, 0.1)
+
+    def test_window_keeps_latest_calls(self):
+        timing = McuCallbackTiming(True, 10)
+        for n in range(0, 25):
+            timing.Add('OnRefresh', n)
+        count, minimum, mean, p99, maximum = timing.GetStats('OnRefresh')
+        self.assertEqual(count, 25)
+        self.assertEqual(minimum, 15)
+        self.assertEqual(maximum, 24)
+
+    def test_unknown_callback(self):
+        self.assertEqual(McuCallbackTiming(True).GetStats('OnIdle'), (0, 0, 0, 0, 0))
+
+    def test_exception_is_not_swallowed(self):
+        timing = McuCallbackTiming(True)
+        with self.assertRaises(ValueError):
+            with timing.Measure('OnMidiMsg'):
+                raise ValueError()
+        self.assertEqual(timing.GetStats('OnMidiMsg')[0], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import unittest
+import mcu_colors
+
+class TestGetMcuColorCache(unittest.TestCase):
+
+    def setUp(self):
+        mcu_colors.McuColorCache.clear()
+
+    def assertSameColors(self, step):
+        for intValue in range(0, 1 << 24, step):
+            self.assertEqual(mcu_colors.GetMcuColor(intValue), mcu_colors.CalculateMcuColor(intValue), hex(intValue))
+            # second lookup comes from the cache
+            self.assertEqual(mcu_colors.GetMcuColor(intValue), mcu_colors.CalculateMcuColor(intValue), hex(intValue))
+
+    def test_same_colors_sampled(self):
+        self.assertSameColors(251)
+
+    @unittest.skipUnless(os.environ.get('MCU_EXHAUSTIVE_TESTS'), 'takes minutes, set MCU_EXHAUSTIVE_TESTS=1 to run')
+    def test_same_colors_exhaustive(self):
+        self.assertSameColors(1)
+
+    def test_alpha_is_ignored(self):
+        # FL Studio colors can be negative, the alpha part is not used
+        self.assertEqual(mcu_colors.GetMcuColor(-10261391), mcu_colors.CalculateMcuColor(-10261391 & 0xFFFFFF))
+        self.assertEqual(list(mcu_colors.McuColorCache.keys()), [-10261391 & 0xFFFFFF])
+
+    def test_cache_is_bounded(self):
+        for intValue in range(0, mcu_colors.McuColorCacheSize * 3):
+            mcu_colors.GetMcuColor(intValue)
+        self.assertLessEqual(len(mcu_colors.McuColorCache), mcu_colors.McuColorCacheSize)
+
+if __name__ == '__main__':
+    unittest.main()
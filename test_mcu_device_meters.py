@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+import mcu_constants
+import mcu_device
+from mcu_device_output_queue import McuDeviceOutputQueue
+from mcu_device_track_meter import McuDeviceTrackMeter
+
+class TestMcuDeviceTrackMeter(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.now = 100
+        patchers = [
+            mock.patch('device.midiOutMsg', lambda message: self.sent.append(message)),
+            mock.patch('time.time', lambda: self.now),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.meter = McuDeviceTrackMeter(0x14, 2, McuDeviceOutputQueue())
+
+    def Levels(self):
+        return [(message >> 8) & 0x0F for message in self.sent]
+
+    def test_changes_are_sent(self):
+        self.meter.SetLevel(5, True)
+        self.meter.SetLevel(6, True)
+        self.assertEqual(self.Levels(), [5, 6])
+        self.assertEqual(self.sent[0] >> 12, 2) # track index
+
+    def test_unchanged_level_is_suppressed(self):
+        self.meter.SetLevel(5, True)
+        self.now += mcu_constants.MeterKeepAliveInterval / 2
+        self.meter.SetLevel(5, True)
+        self.assertEqual(self.Levels(), [5])
+
+    def test_unchanged_level_is_sent_again_after_keepalive_interval(self):
+        self.meter.SetLevel(5, True)
+        self.now += mcu_constants.MeterKeepAliveInterval / 2
+        self.meter.SetLevel(5, True)
+        self.now += mcu_constants.MeterKeepAliveInterval / 2
+        self.meter.SetLevel(5, True)
+        self.assertEqual(self.Levels(), [5, 5])
+        self.now += mcu_constants.MeterKeepAliveInterval / 2
+        self.meter.SetLevel(5, True) # the interval starts again after the keepalive
+        self.assertEqual(self.Levels(), [5, 5])
+
+    def test_off_and_lowest_level_are_not_kept_alive(self):
+        for level in [15, 0]:
+            self.meter.SetLevel(level, True)
+            self.now += mcu_constants.MeterKeepAliveInterval * 2
+            self.meter.SetLevel(level, True)
+        self.assertEqual(self.Levels(), [15, 0])
+
+    def test_invalidate(self):
+        self.meter.SetLevel(5, True)
+        self.meter.Invalidate()
+        self.meter.SetLevel(5, True)
+        self.assertEqual(self.Levels(), [5, 5])
+
+class TestMeterRefreshRate(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100
+        patcher = mock.patch('time.time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.device = mcu_device.McuDevice(False)
+
+    def test_refresh_rate_is_limited(self):
+        interval = 1 / mcu_constants.MeterMaxRefreshRate
+        self.assertTrue(self.device.IsMeterUpdateDue())
+        self.now = 100 + interval / 2
+        self.assertFalse(self.device.IsMeterUpdateDue())
+        self.now = 100 + interval
+        self.assertTrue(self.device.IsMeterUpdateDue())
+        self.assertFalse(self.device.IsMeterUpdateDue())
+
+    def test_updates_per_second(self):
+        due = 0
+        for tick in range(0, 100): # OnUpdateMeters is called about every 10 ms
+            self.now += 0.01
+            due += int(self.device.IsMeterUpdateDue())
+        self.assertLessEqual(due, mcu_constants.MeterMaxRefreshRate)
+        self.assertGreaterEqual(due, mcu_constants.MeterMaxRefreshRate - 5)
+
+# This allows running the tests from the command line
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from unittest import mock
+
+import midi
+import mcu_device_output_queue
+from mcu_device_output_queue import McuDeviceOutputQueue
+from simulator import fl_simulator
+
+class TestMcuDeviceOutputQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+        self.now = 0
+        patchers = [
+            mock.patch('device.midiOutMsg', lambda message: self.sent.append(message)),
+            mock.patch('device.midiOutNewMsg', lambda message, slotIndex: self.sent.append(message)),
+            mock.patch('device.midiOutSysex', lambda message: self.sent.append(message)),
+            mock.patch('time.time', lambda: self.now),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unlimited_sends_right_away(self):
+        queue = McuDeviceOutputQueue()
+        queue.SendMsg(mcu_device_output_queue.PriorityMeter, 1, 'meter')
+        queue.SendMsg(mcu_device_output_queue.PriorityMeter, 2, 'meter')
+        self.assertEqual(self.sent, [1, 2])
+        self.assertEqual(queue.pendingCount, 0)
+
+    def test_priority_order(self):
+        queue = McuDeviceOutputQueue(3000)
+        queue.SendMsg(mcu_device_output_queue.PriorityMeter, midi.MIDI_CHANAFTERTOUCH, 'meter')
+        queue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes([0xF0, 0xF7]), 'text')
+        queue.SendNewMsg(mcu_device_output_queue.PriorityButton, 0x90, 10)
+        queue.SendNewMsg(mcu_device_output_queue.PriorityFader, 0xE0, 5)
+        self.assertEqual(self.sent, [])
+        queue.Flush()
+        self.assertEqual(self.sent, [0xE0, 0x90, bytes([0xF0, 0xF7]), midi.MIDI_CHANAFTERTOUCH])
+
+    def test_collapses_same_key(self):
+        queue = McuDeviceOutputQueue(3000)
+        queue.SendNewMsg(mcu_device_output_queue.PriorityButton, 1, 10)
+        queue.SendNewMsg(mcu_device_output_queue.PriorityButton, 2, 11)
+        queue.SendNewMsg(mcu_device_output_queue.PriorityButton, 3, 10)
+        queue.SendMsg(mcu_device_output_queue.PriorityButton, 4)
+        queue.SendMsg(mcu_device_output_queue.PriorityButton, 4)
+        self.assertEqual(queue.pendingCount, 4)
+        queue.Flush()
+        self.assertEqual(self.sent, [3, 2, 4, 4])
+
+    def test_throughput_limit(self):
+        queue = McuDeviceOutputQueue(1000, 0.03) # 30 bytes per burst
+        for n in range(20):
+            queue.SendMsg(mcu_device_output_queue.PriorityFader, midi.MIDI_PITCHBEND + n) # 3 bytes each
+        queue.Flush()
+        self.assertEqual(len(self.sent), 10)
+        queue.Flush()
+        self.assertEqual(len(self.sent), 10)
+        self.now += 0.015
+        queue.Flush()
+        self.assertEqual(len(self.sent), 15)
+        self.now += 1
+        queue.Flush()
+        self.assertEqual(len(self.sent), 20)
+
+    def test_large_message_is_sent_when_allowance_is_full(self):
+        queue = McuDeviceOutputQueue(1000, 0.01) # 10 bytes per burst
+        queue.SendSysex(mcu_device_output_queue.PriorityDisplay, bytes(64))
+        queue.Flush()
+        self.assertEqual(len(self.sent), 1)
+
+    def test_flush_ignoring_limit(self):
+        queue = McuDeviceOutputQueue(1000, 0.01)
+        for n in range(20):
+            queue.SendMsg(mcu_device_output_queue.PriorityFader, midi.MIDI_PITCHBEND + n)
+        queue.Flush(ignoreLimit = True)
+        self.assertEqual(len(self.sent), 20)
+        self.assertEqual(queue.pendingCount, 0)
+
+    def test_message_size(self):
+        self.assertEqual(mcu_device_output_queue.GetMessageSize(mcu_device_output_queue.KindMsg, midi.MIDI_NOTEON + (0x10 << 8)), 3)
+        self.assertEqual(mcu_device_output_queue.GetMessageSize(mcu_device_output_queue.KindMsg, midi.MIDI_CHANAFTERTOUCH + (0x10 << 8)), 2)
+        self.assertEqual(mcu_device_output_queue.GetMessageSize(mcu_device_output_queue.KindSysex, bytes(9)), 9)
+
+class TestLimitedOutput(unittest.TestCase):
+
+    def test_output_is_spread_over_idle_ticks(self):
+        with fl_simulator.FlSimulator() as simulator:
+            import mcu_constants
+            mcu_constants.OutputBytesPerSecond = 3000
+            main = simulator.LoadScript('device_XTouch.py')
+            simulator.Init()
+            self.assertEqual(main.output, [])
+            simulator.Run(3)
+            self.assertGreater(len(main.output), 0)
+            for second in range(1, 4):
+                total = sum(message.size for message in main.output if message.timestamp < second)
+                self.assertLessEqual(total, 3000 * (second + mcu_constants.OutputMaxBurstTime))
+
+    def test_resync_drops_queued_messages(self):
+        sent = []
+        with mock.patch('mcu_constants.OutputBytesPerSecond', 3000), mock.patch('device.midiOutSysex', lambda message: sent.append(message)):
+            import mcu_device
+            mcuDevice = mcu_device.McuDevice(False)
+            mcuDevice.SetTextDisplay('Before', skipIsAssignedCheck = True)
+            mcuDevice.ForceResync()
+            mcuDevice.FlushOutput(ignoreLimit = True)
+            self.assertEqual(sent, [])
+            mcuDevice.SetTextDisplay('Before', skipIsAssignedCheck = True) # sent again, the device didn't get it
+            mcuDevice.FlushOutput(ignoreLimit = True)
+            self.assertEqual(len(sent), 1)
+
+if __name__ == '__main__':
+    unittest.main()
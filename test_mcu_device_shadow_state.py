@@ -0,0 +1,43 @@
+import unittest
+from mcu_device_shadow_state import McuDeviceShadowState
+
+class TestMcuDeviceShadowState(unittest.TestCase):
+
+    def test_first_message_is_sent(self):
+        shadowState = McuDeviceShadowState()
+        self.assertTrue(shadowState.ShouldSend(48, 0x7F3090))
+
+    def test_duplicate_message_is_suppressed(self):
+        shadowState = McuDeviceShadowState()
+        shadowState.ShouldSend(48, 0x7F3090)
+        self.assertFalse(shadowState.ShouldSend(48, 0x7F3090))
+
+    def test_changed_message_is_sent(self):
+        shadowState = McuDeviceShadowState()
+        shadowState.ShouldSend(48, 0x7F3090)
+        self.assertTrue(shadowState.ShouldSend(48, 0x003090))
+
+    def test_slots_are_independent(self):
+        shadowState = McuDeviceShadowState()
+        shadowState.ShouldSend(48, 0x7F3090)
+        self.assertTrue(shadowState.ShouldSend(54, 0x7F3090))
+
+    def test_invalidate_slot(self):
+        shadowState = McuDeviceShadowState()
+        shadowState.ShouldSend(48, 0x7F3090)
+        shadowState.ShouldSend(54, 0x7F3190)
+        shadowState.Invalidate(48)
+        self.assertTrue(shadowState.ShouldSend(48, 0x7F3090))
+        self.assertFalse(shadowState.ShouldSend(54, 0x7F3190))
+
+    def test_invalidate_all(self):
+        shadowState = McuDeviceShadowState()
+        shadowState.ShouldSend(48, 0x7F3090)
+        shadowState.ShouldSend(54, 0x7F3190)
+        shadowState.Invalidate()
+        self.assertTrue(shadowState.ShouldSend(48, 0x7F3090))
+        self.assertTrue(shadowState.ShouldSend(54, 0x7F3190))
+
+# This allows running the tests from the command line
+if __name__ == '__main__':
+    unittest.main()
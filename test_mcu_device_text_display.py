@@ -0,0 +1,42 @@
+import unittest
+from mcu_device_text_display import McuDeviceTextDisplay, GetChangedSpans, RowLength
+
+class TestMcuDeviceTextDisplay(unittest.TestCase):
+
+    def test_first_update_sends_full_row(self):
+        textDisplay = McuDeviceTextDisplay()
+        self.assertEqual(textDisplay.GetUpdates(0, 'Hello'), [(0, 'Hello'.ljust(RowLength))])
+
+    def test_unchanged_row_sends_nothing(self):
+        textDisplay = McuDeviceTextDisplay()
+        textDisplay.GetUpdates(1, 'Insert 1')
+        self.assertEqual(textDisplay.GetUpdates(1, 'Insert 1'), [])
+
+    def test_changed_cell_is_sent(self):
+        textDisplay = McuDeviceTextDisplay()
+        textDisplay.GetUpdates(1, 'Insert1Insert2Insert3')
+        self.assertEqual(textDisplay.GetUpdates(1, 'Insert1Drums  Insert3'), [(7, 'Drums  ')])
+
+    def test_rows_are_independent(self):
+        textDisplay = McuDeviceTextDisplay()
+        textDisplay.GetUpdates(0, 'abc')
+        self.assertEqual(textDisplay.GetUpdates(1, 'abc'), [(0, 'abc'.ljust(RowLength))])
+
+    def test_full_row_when_cheaper(self):
+        textDisplay = McuDeviceTextDisplay()
+        textDisplay.GetUpdates(0, 'a' * RowLength)
+        self.assertEqual(textDisplay.GetUpdates(0, 'b' * RowLength), [(0, 'b' * RowLength)])
+
+    def test_invalidate(self):
+        textDisplay = McuDeviceTextDisplay()
+        textDisplay.GetUpdates(0, 'abc')
+        textDisplay.Invalidate()
+        self.assertIsNone(textDisplay.GetRow(0))
+        self.assertEqual(len(textDisplay.GetUpdates(0, 'abc')), 1)
+
+    def test_close_spans_are_merged(self):
+        self.assertEqual(GetChangedSpans('aaaaaaaaaa', 'baaaaaaaab'), [(0, 'baaaaaaaab')])
+        self.assertEqual(GetChangedSpans('a' * 20, 'b' + 'a' * 18 + 'b'), [(0, 'b'), (19, 'b')])
+
+if __name__ == '__main__':
+    unittest.main()
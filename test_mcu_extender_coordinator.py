@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+
+import midi
+import mcu_extender_coordinator
+import mcu_extender_location
+from mcu_extender_coordinator import McuExtenderCoordinator
+from simulator import fl_simulator
+
+class TestLayouts(unittest.TestCase):
+
+    def test_extenders_on_the_left(self):
+        self.assertEqual(mcu_extender_coordinator.GetExtenderFirstTracks(17, 127, 2, mcu_extender_location.Left), [1, 9])
+        self.assertEqual(mcu_extender_coordinator.GetExtenderFirstTracks(1, 127, 1, mcu_extender_location.Left), [120])
+
+    def test_extenders_on_the_right(self):
+        self.assertEqual(mcu_extender_coordinator.GetExtenderFirstTracks(1, 127, 2, mcu_extender_location.Right), [9, 17])
+        self.assertEqual(mcu_extender_coordinator.GetExtenderFirstTracks(120, 127, 1, mcu_extender_location.Right), [1])
+
+    def test_encode_decode(self):
+        message = mcu_extender_coordinator.EncodeLayout(100, 5, True)
+        event = mock.Mock(data2 = (message >> 16) & 0x7F, midiChan = message & 0x0F)
+        self.assertEqual(message & 0xF0, midi.MIDI_NOTEON)
+        self.assertEqual((message >> 8) & 0x7F, mcu_extender_coordinator.LayoutNote)
+        self.assertEqual(mcu_extender_coordinator.DecodeLayout(event), (100, 5, True))
+
+class TestMcuExtenderCoordinator(unittest.TestCase):
+
+    def setUp(self):
+        self.receiverCount = 3
+        self.dispatched = []
+        patchers = [
+            mock.patch('device.dispatchReceiverCount', lambda: self.receiverCount),
+            mock.patch('device.dispatch', lambda index, message: self.dispatched.append((index, message))),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unchanged_layouts_are_not_sent(self):
+        coordinator = McuExtenderCoordinator(1)
+        self.assertTrue(coordinator.CheckTopology())
+        coordinator.SetLayout(1, 127, 0, False, mcu_extender_location.Right)
+        self.assertEqual([index for index, message in self.dispatched], [0, 1, 2])
+        self.dispatched.clear()
+        coordinator.SetLayout(1, 127, 0, False, mcu_extender_location.Right)
+        self.assertEqual(self.dispatched, [])
+        coordinator.SetLayout(1, 127, 0, True, mcu_extender_location.Right)
+        self.assertEqual(len(self.dispatched), 3)
+
+    def test_topology_change(self):
+        coordinator = McuExtenderCoordinator(1)
+        coordinator.CheckTopologyIfDue(1)
+        coordinator.SetLayout(1, 127, 0, False, mcu_extender_location.Right)
+        self.receiverCount = 4
+        self.assertFalse(coordinator.CheckTopologyIfDue(1.5))
+        self.assertTrue(coordinator.CheckTopologyIfDue(2))
+        self.assertEqual(coordinator.receiverCount, 4)
+        self.dispatched.clear()
+        coordinator.SetLayout(1, 127, 0, False, mcu_extender_location.Right)
+        self.assertEqual([index for index, message in self.dispatched], [0, 1, 2, 3])
+
+class TestBankSwitch(unittest.TestCase):
+
+    def test_one_message_per_extender(self):
+        with fl_simulator.FlSimulator() as simulator:
+            main = simulator.LoadScript('device_XTouch.py')
+            extenders = [simulator.LoadScript('device_XTouch_Ext.py', 'device_XTouch_Ext_' + str(n + 1), main) for n in range(0, 4)]
+            simulator.Init()
+            simulator.Run(0.1)
+            simulator.ClearOutput()
+            simulator.SendMidi(main, midi.MIDI_NOTEON, 0, 0x2F, 0x7F) # fader bank right
+            simulator.SendMidi(main, midi.MIDI_NOTEON, 0, 0x2F, 0)
+            dispatched = [message.receiverIndex for message in main.output if message.kind == 'dispatch']
+            self.assertEqual(sorted(dispatched), [0, 1, 2, 3])
+            firstTracks = [extender.script.MackieCU_Ext.Tracks[0].TrackNum for extender in extenders]
+            self.assertEqual(firstTracks, [9, 17, 25, 33]) # on the left of the main unit, which shows 41..48
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+import midi
+from mcu_master_section_leds import McuMasterSectionLeds
+
+class TestMcuMasterSectionLeds(unittest.TestCase):
+
+    def setUp(self):
+        self.mcuDevice = mock.Mock()
+        self.leds = McuMasterSectionLeds(self.mcuDevice)
+        self.calls = 0
+        self.page = 0
+        def GetPage():
+            self.calls += 1
+            return self.page
+        self.leds.AddProvider('page', GetPage)
+        self.leds.AddProvider('recording', lambda: True)
+        for i in range(0, 6):
+            self.leds.AddLed(0x28 + i, 5 + i, 'page', lambda value, i = i: value == i)
+
+    def test_provider_is_called_once_per_update(self):
+        self.leds.Update()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.mcuDevice.SetButton.call_count, 6)
+
+    def test_led_states(self):
+        self.page = 2
+        self.leds.Update()
+        self.mcuDevice.SetButton.assert_any_call(0x2A, midi.TranzPort_OffOnT[True], 7, skipIsAssignedCheck = True)
+        self.mcuDevice.SetButton.assert_any_call(0x28, midi.TranzPort_OffOnT[False], 5, skipIsAssignedCheck = True)
+
+    def test_several_providers(self):
+        self.leds.AddLed(0x73, 16, ('page', 'recording'), lambda page, recording: 1 + int(recording) if page == 0 else 0, midi.TranzPort_OffOnBlinkT)
+        self.leds.Update()
+        self.assertEqual(self.calls, 1)
+        self.mcuDevice.SetButton.assert_any_call(0x73, midi.TranzPort_OffOnBlinkT[2], 16, skipIsAssignedCheck = True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from mcu_message_overlay import McuMessageOverlay
+from simulator import fl_simulator
+
+class TestMcuMessageOverlay(unittest.TestCase):
+
+    def test_set_text(self):
+        overlay = McuMessageOverlay()
+        overlay.SetText('Panning')
+        self.assertTrue(overlay.Update(0))
+        self.assertEqual(overlay.text, 'Panning')
+        self.assertFalse(overlay.Update(0))
+
+    def test_temp_text_expires(self):
+        overlay = McuMessageOverlay()
+        overlay.SetText('Panning')
+        overlay.ShowTempText('Volume: 0dB', 1, 10)
+        self.assertTrue(overlay.Update(10))
+        self.assertEqual(overlay.text, 'Volume: 0dB')
+        self.assertFalse(overlay.Update(10.5))
+        self.assertTrue(overlay.Update(11))
+        self.assertEqual(overlay.text, 'Panning')
+
+    def test_successive_temp_texts_collapse(self):
+        overlay = McuMessageOverlay()
+        for n in range(10):
+            overlay.ShowTempText('Volume: ' + str(n), 1, 10)
+        self.assertTrue(overlay.Update(10))
+        self.assertEqual(overlay.text, 'Volume: 9')
+        self.assertFalse(overlay.Update(10))
+
+    def test_set_text_ends_temp_text(self):
+        overlay = McuMessageOverlay()
+        overlay.ShowTempText('Volume: 0dB', 1, 10)
+        overlay.SetText('Panning')
+        self.assertEqual(overlay.text, 'Panning')
+
+class TestTempMessages(unittest.TestCase):
+
+    def test_temp_message_is_shown_for_its_duration(self):
+        with fl_simulator.FlSimulator() as simulator:
+            main = simulator.LoadScript('device_XTouch.py')
+            simulator.Init()
+            simulator.Run(0.1)
+            simulator.ClearOutput()
+            for n in range(5):
+                simulator.Call(main, 'OnSendTempMsg', 'Hint ' + str(n), 500)
+            simulator.Run(0.1)
+            texts = [message.data for message in main.output if message.kind == 'sysex' and message.data[5] == 0x12]
+            self.assertEqual(len(texts), 1)
+            self.assertIn(b'4', texts[0])
+            simulator.ClearOutput()
+            simulator.Run(0.5)
+            texts = [message.data for message in main.output if message.kind == 'sysex' and message.data[5] == 0x12]
+            self.assertEqual(len(texts), 1)
+            self.assertNotIn(b'Hint', texts[0])
+
+if __name__ == '__main__':
+    unittest.main()
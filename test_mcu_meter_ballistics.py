@@ -0,0 +1,74 @@
+import unittest
+
+import mcu_meter_ballistics
+
+class TestPeakToLevel(unittest.TestCase):
+    def test_silence_clears_meter(self):
+        self.assertEqual(mcu_meter_ballistics.PeakToLevel(0), mcu_meter_ballistics.OffLevel)
+
+    def test_below_lowest_threshold(self):
+        self.assertEqual(mcu_meter_ballistics.PeakToLevel(10 ** (-70 / 20)), 0)
+
+    def test_db_scale(self):
+        self.assertEqual(mcu_meter_ballistics.PeakToLevel(10 ** (-60 / 20)), 1)
+        self.assertEqual(mcu_meter_ballistics.PeakToLevel(10 ** (-20 / 20)), 7)
+        self.assertEqual(mcu_meter_ballistics.PeakToLevel(10 ** (-2 / 20)), 12)
+
+    def test_clipping(self):
+        self.assertEqual(mcu_meter_ballistics.PeakToLevel(1), mcu_meter_ballistics.ClipLevel)
+        self.assertEqual(mcu_meter_ballistics.PeakToLevel(1.5), mcu_meter_ballistics.ClipLevel)
+
+class TestMcuMeterBallistics(unittest.TestCase):
+    def test_first_update_shows_peaks(self):
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(3, 0.5, 1, 1)
+        self.assertEqual(ballistics.Process([0, 0.1, 1], 10), [15, 7, 14])
+
+    def test_attack(self):
+        # rising 60 dB in 0.1 seconds
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(1, 0.1, 1, 0)
+        ballistics.Process([0], 0)
+        levels = [ballistics.Process([1], t / 100)[0] for t in range(1, 12)]
+        self.assertEqual(levels, sorted(levels))
+        self.assertLess(levels[0], 14)
+        self.assertEqual(levels[-1], 14)
+
+    def test_peak_hold_then_release(self):
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(1, 0, 1.2, 0.5)
+        ballistics.Process([0.5], 0)
+        held = [ballistics.Process([0], t / 10)[0] for t in range(1, 5)]
+        self.assertEqual(held, [10] * 4)
+        released = [ballistics.Process([0], t / 10)[0] for t in range(6, 30)]
+        self.assertLess(released[0], 10)
+        self.assertEqual(released[-1], mcu_meter_ballistics.OffLevel)
+        released = [-1 if level == mcu_meter_ballistics.OffLevel else level for level in released]
+        self.assertEqual(released, sorted(released, reverse=True))
+
+    def test_release_speed(self):
+        # falling 60 dB in 1.2 seconds: 0 dB after 0.65 seconds is -32.5 dB
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(1, 0, 1.2, 0)
+        ballistics.Process([1], 0)
+        self.assertEqual(ballistics.Process([0], 0.65)[0], 5)
+
+    def test_release_stops_at_current_peak(self):
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(1, 0, 0.1, 0)
+        ballistics.Process([1], 0)
+        self.assertEqual(ballistics.Process([0.1], 1)[0], 7)
+
+    def test_plateau_keeps_level(self):
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(1, 0, 1, 0)
+        levels = [ballistics.Process([0.1], t / 25)[0] for t in range(0, 50)]
+        self.assertEqual(levels, [7] * 50)
+
+    def test_tracks_are_independent(self):
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(2, 0, 1, 1)
+        ballistics.Process([1, 0], 0)
+        self.assertEqual(ballistics.Process([0, 0.1], 0.1), [14, 7])
+
+    def test_reset(self):
+        ballistics = mcu_meter_ballistics.McuMeterBallistics(1, 0, 1, 10)
+        ballistics.Process([1], 0)
+        ballistics.Reset()
+        self.assertEqual(ballistics.Process([0], 0.1), [15])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest import mock
+
+from mcu_mixer_snapshot import McuMixerSnapshot
+
+class TestMcuMixerSnapshot(unittest.TestCase):
+
+    @mock.patch('mixer.getTrackColor')
+    def test_values_are_fetched_once_per_cycle(self, getTrackColor):
+        getTrackColor.return_value = 123
+        snapshot = McuMixerSnapshot()
+        with snapshot:
+            self.assertEqual(snapshot.getTrackColor(1), 123)
+            self.assertEqual(snapshot.getTrackColor(1), 123)
+            snapshot.getTrackColor(2)
+        self.assertEqual(getTrackColor.call_count, 2)
+
+    @mock.patch('mixer.getTrackColor')
+    def test_values_are_fetched_again_in_next_cycle(self, getTrackColor):
+        snapshot = McuMixerSnapshot()
+        with snapshot:
+            snapshot.getTrackColor(1)
+        with snapshot:
+            snapshot.getTrackColor(1)
+        self.assertEqual(getTrackColor.call_count, 2)
+
+    @mock.patch('mixer.getTrackColor')
+    def test_no_caching_outside_cycle(self, getTrackColor):
+        snapshot = McuMixerSnapshot()
+        self.assertFalse(snapshot.isActive)
+        snapshot.getTrackColor(1)
+        snapshot.getTrackColor(1)
+        self.assertEqual(getTrackColor.call_count, 2)
+
+    @mock.patch('mixer.getEventValue')
+    def test_nested_cycles(self, getEventValue):
+        snapshot = McuMixerSnapshot()
+        with snapshot:
+            snapshot.getEventValue(100)
+            with snapshot:
+                snapshot.getEventValue(100)
+            self.assertTrue(snapshot.isActive)
+            snapshot.getEventValue(100)
+            snapshot.getEventValue(100, 0, False)
+        self.assertFalse(snapshot.isActive)
+        self.assertEqual(getEventValue.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
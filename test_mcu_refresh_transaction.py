@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+import midi
+import mcu_refresh_transaction
+from mcu_refresh_transaction import McuRefreshTransaction
+from simulator import fl_simulator
+
+class TestMcuRefreshTransaction(unittest.TestCase):
+
+    def test_no_transaction(self):
+        flush = mock.Mock()
+        transaction = McuRefreshTransaction(flush)
+        self.assertFalse(transaction.Defer(mcu_refresh_transaction.Strips))
+        flush.assert_not_called()
+
+    def test_updates_are_flushed_once(self):
+        flush = mock.Mock()
+        transaction = McuRefreshTransaction(flush)
+        with transaction:
+            self.assertTrue(transaction.Defer(mcu_refresh_transaction.Strips))
+            self.assertTrue(transaction.Defer(mcu_refresh_transaction.Strips))
+            with transaction:
+                transaction.Defer(mcu_refresh_transaction.TextDisplay)
+            flush.assert_not_called()
+        flush.assert_called_once_with(mcu_refresh_transaction.Strips | mcu_refresh_transaction.TextDisplay)
+        self.assertFalse(transaction.isActive)
+
+    def test_nothing_to_flush(self):
+        flush = mock.Mock()
+        with McuRefreshTransaction(flush):
+            pass
+        flush.assert_not_called()
+
+class TestCoalescedUpdates(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = fl_simulator.FlSimulator()
+        self.main = self.simulator.LoadScript('device_XTouch.py')
+        self.extender = self.simulator.LoadScript('device_XTouch_Ext.py', receiverOf = self.main)
+        self.simulator.Init()
+        self.simulator.Run(0.1)
+        self.counts = {}
+        for device in self.simulator.devices:
+            script = getattr(device.script, 'MackieCU', None) or device.script.MackieCU_Ext
+            for name in ['UpdateColT', 'UpdateTextDisplay', 'UpdateMasterSectionLEDs']:
+                self.Count(script, name)
+
+    def tearDown(self):
+        self.simulator.Close()
+
+    def Count(self, script, name):
+        method = getattr(script, name)
+        def CountingMethod(*args):
+            if not script.RefreshTransaction.isActive:
+                self.counts[(script, name)] = self.counts.get((script, name), 0) + 1
+            return method(*args)
+        setattr(script, name, CountingMethod)
+
+    def Press(self, button: int):
+        self.simulator.SendMidi(self.main, midi.MIDI_NOTEON, 0, button, 0x7F)
+        self.simulator.SendMidi(self.main, midi.MIDI_NOTEON, 0, button, 0)
+
+    def test_page_change_updates_once(self):
+        self.Press(0x2B) # Stereo
+        self.assertEqual(sorted(self.counts.values()), [1, 1, 1, 1, 1])
+
+    def test_flip_updates_once(self):
+        self.Press(0x32)
+        self.assertEqual(sorted(self.counts.values()), [1, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
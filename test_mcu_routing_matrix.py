@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+import midi
+from mcu_routing_matrix import McuRoutingMatrix
+from simulator import fl_simulator
+
+SendsButton = 0x2A
+
+class TestMcuRoutingMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.routes = set([(1, 0)])
+        patchers = [
+            mock.patch('mixer.getRouteSendActive', side_effect = lambda source, destination: (source, destination) in self.routes),
+            mock.patch('mixer.getEventIDName', side_effect = lambda eventId: 'Send ' + str(eventId)),
+        ]
+        self.getRouteSendActive, self.getEventIDName = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+    def test_sends_are_cached(self):
+        matrix = McuRoutingMatrix(4)
+        self.assertEqual(matrix.GetSend(1, 0, 100), (True, 'Send 100'))
+        self.assertEqual(matrix.GetSend(1, 0, 100), (True, 'Send 100'))
+        self.assertEqual(matrix.GetSend(1, 2, 102), (False, 'Send 102'))
+        self.assertTrue(matrix.IsCached(1, 2))
+        self.assertFalse(matrix.IsCached(2, 1))
+        self.assertEqual(self.getRouteSendActive.call_count, 2)
+        self.assertEqual(self.getEventIDName.call_count, 2)
+
+    def test_invalidate(self):
+        matrix = McuRoutingMatrix(4)
+        matrix.GetSend(1, 0, 100)
+        matrix.GetSend(2, 0, 200)
+        matrix.GetSend(2, 1, 201)
+        self.routes.clear()
+        matrix.Invalidate(1)
+        self.assertEqual(matrix.GetSend(1, 0, 100), (False, 'Send 100'))
+        self.assertTrue(matrix.IsCached(2, 0))
+        self.assertFalse(matrix.IsCached(2, 1)) # the sends to the track are forgotten as well
+        matrix.Invalidate()
+        self.assertFalse(matrix.IsCached(2, 0))
+
+    def test_least_recently_used_tracks_are_dropped(self):
+        matrix = McuRoutingMatrix(2)
+        matrix.GetSend(1, 0, 100)
+        matrix.GetSend(2, 0, 200)
+        matrix.GetSend(1, 3, 103)
+        matrix.GetSend(3, 0, 300) # drops track 2
+        self.assertTrue(matrix.IsCached(1, 0))
+        self.assertFalse(matrix.IsCached(2, 0))
+
+class TestSendsPage(unittest.TestCase):
+
+    def test_selecting_the_next_track_is_a_cache_hit(self):
+        with fl_simulator.FlSimulator() as simulator:
+            main = simulator.LoadScript('device_XTouch.py')
+            simulator.state.mixer.tracks[1].routes.add(3)
+            simulator.Init()
+            simulator.SendMidi(main, midi.MIDI_NOTEON, 0, SendsButton, 0x7F)
+            simulator.SendMidi(main, midi.MIDI_NOTEON, 0, SendsButton, 0)
+            simulator.Run(0.5) # prefetches the plans and the sends of the tracks next to the selected one
+            import mixer
+            script = main.script.MackieCU
+            with mock.patch('mixer.getRouteSendActive') as getRouteSendActive, mock.patch('mixer.getEventIDName') as getEventIDName:
+                mixer.setTrackNumber(1)
+                simulator.Refresh()
+                getRouteSendActive.assert_not_called()
+                getEventIDName.assert_not_called()
+            self.assertEqual([track.KnobCenter for track in script.Tracks[:4]], [False, False, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from unittest import mock
+
+import midi
+import mcu_pages
+import mcu_track
+from mcu_strip_plans import McuStripPlan, McuStripPlans
+from simulator import fl_simulator
+
+SendsButton = 0x2A
+FaderBankRightButton = 0x2F
+
+class TestMcuStripPlans(unittest.TestCase):
+
+    def setUp(self):
+        self.buildPlans = mock.Mock(return_value = ['plan'])
+
+    def test_plans_are_built_once(self):
+        plans = McuStripPlans(4)
+        self.assertEqual(plans.Get('key', self.buildPlans), ['plan'])
+        plans.Get('key', self.buildPlans)
+        self.assertIsNone(plans.Prefetch('key', self.buildPlans))
+        self.buildPlans.assert_called_once_with()
+
+    def test_invalidate(self):
+        plans = McuStripPlans(4)
+        plans.Get('key', self.buildPlans)
+        plans.Invalidate()
+        plans.Get('key', self.buildPlans)
+        self.assertEqual(self.buildPlans.call_count, 2)
+
+    def test_invalidate_track(self):
+        plans = McuStripPlans(4)
+        for key, trackNums in [((0, 1, -1), [1, 2]), ((0, 3, -1), [3, 4]), ((2, 3, 1), [3, 4])]: # (page, first track, selected track)
+            plans.Get(key, lambda: [self.Plan(trackNum) for trackNum in trackNums])
+        plans.Invalidate(1) # shown by the first plan, selected track of the last one
+        self.assertIsNotNone(plans.Prefetch((0, 1, -1), self.buildPlans))
+        self.assertIsNone(plans.Prefetch((0, 3, -1), self.buildPlans))
+        self.assertIsNotNone(plans.Prefetch((2, 3, 1), self.buildPlans))
+
+    def Plan(self, trackNum: int):
+        plan = McuStripPlan()
+        plan.TrackNum = trackNum
+        return plan
+
+    def test_apply_reports_changes(self):
+        track = mcu_track.McuTrack()
+        self.assertTrue(self.Plan(3).ApplyTo(track))
+        self.assertEqual(track.TrackNum, 3)
+        self.assertFalse(self.Plan(3).ApplyTo(track))
+        self.assertTrue(self.Plan(4).ApplyTo(track))
+
+    def test_least_recently_used_plans_are_dropped(self):
+        plans = McuStripPlans(2)
+        self.assertEqual(plans.Prefetch(1, self.buildPlans), ['plan'])
+        plans.Prefetch(2, self.buildPlans)
+        plans.Get(1, self.buildPlans)
+        plans.Prefetch(3, self.buildPlans) # drops 2
+        self.assertIsNone(plans.Prefetch(1, self.buildPlans))
+        self.assertIsNotNone(plans.Prefetch(2, self.buildPlans))
+        self.assertEqual(self.buildPlans.call_count, 4)
+
+class TestPageSwitch(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = fl_simulator.FlSimulator()
+        self.main = self.simulator.LoadScript('device_XTouch.py')
+        self.simulator.Init()
+        self.simulator.Run(0.2) # prefetches all pages
+        self.script = self.main.script.MackieCU
+
+    def tearDown(self):
+        self.simulator.Close()
+
+    def Press(self, button: int):
+        self.simulator.SendMidi(self.main, midi.MIDI_NOTEON, 0, button, 0x7F)
+        self.simulator.SendMidi(self.main, midi.MIDI_NOTEON, 0, button, 0)
+
+    def test_page_switch_is_a_cache_hit(self):
+        with mock.patch('mixer.getRouteSendActive') as getRouteSendActive, mock.patch('mixer.getEventIDName') as getEventIDName:
+            self.Press(SendsButton)
+            getRouteSendActive.assert_not_called()
+            getEventIDName.assert_not_called()
+        self.assertEqual(self.script.Page, mcu_pages.Sends)
+
+    def test_bank_switch_is_a_cache_hit(self):
+        for bank in range(0, 3):
+            with mock.patch('mixer.getTrackName') as getTrackName, mock.patch('mixer.getTrackColor') as getTrackColor, mock.patch('mixer.getTrackPluginId') as getTrackPluginId:
+                self.Press(FaderBankRightButton)
+                getTrackName.assert_not_called()
+                getTrackColor.assert_not_called()
+                getTrackPluginId.assert_not_called()
+            self.assertEqual(self.script.Tracks[0].TrackNum, 9 + bank * 8)
+            self.simulator.Run(0.1) # prefetches the next bank
+
+    def test_track_selection_keeps_plans_of_other_pages(self):
+        import mixer
+        with mock.patch.object(self.script, 'BuildStripPlans', wraps = self.script.BuildStripPlans) as buildStripPlans:
+            mixer.setTrackNumber(5)
+            self.simulator.Run(0.2)
+        self.assertEqual(sorted(call.args[0] for call in buildStripPlans.call_args_list), sorted(mcu_pages.SelectedTrackPages))
+
+    def test_rename_keeps_prefetched_bank(self):
+        import mixer
+        self.assertEqual(self.script.Tracks[2].TrackNum, 3)
+        mixer.setTrackName(3, 'Bass')
+        mixer.setTrackName(11, 'Drums') # in the next bank, which was prefetched
+        self.simulator.Refresh()
+        self.assertEqual(self.script.Tracks[2].DisplayName, 'Bass')
+        with mock.patch.object(self.script, 'BuildStripPlans', wraps = self.script.BuildStripPlans) as buildStripPlans, mock.patch('mixer.getTrackName', wraps = mixer.getTrackName) as getTrackName:
+            self.Press(FaderBankRightButton)
+        self.assertEqual(buildStripPlans.call_count, 1) # the plans that show track 11 only, the other banks & pages are kept
+        self.assertEqual(set(call.args[0] for call in getTrackName.call_args_list), {11})
+        self.assertEqual(self.script.Tracks[2].TrackNum, 11)
+        self.assertEqual(self.script.Tracks[2].DisplayName, 'Drums')
+
+    def test_routing_change(self):
+        import mixer
+        self.assertEqual(self.script.Tracks[2].TrackNum, 3)
+        mixer.setRouteTo(0, 3, True)
+        mixer.afterRoutingChanged()
+        self.simulator.Run(0.2)
+        self.Press(SendsButton)
+        self.assertEqual([track.KnobCenter for track in self.script.Tracks[:4]], [False, False, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+
+from mcu_track_colors import McuTrackColors
+
+class TestMcuTrackColors(unittest.TestCase):
+
+    @mock.patch('mixer.getTrackColor')
+    def test_colors_are_cached(self, getTrackColor):
+        getTrackColor.side_effect = lambda index: index * 100
+        colors = McuTrackColors()
+        self.assertEqual(colors.Get(1), 100)
+        colors.Prefetch(1)
+        colors.Prefetch(2)
+        self.assertEqual(colors.Get(2), 200)
+        self.assertEqual(getTrackColor.call_count, 2)
+
+    @mock.patch('mixer.getTrackColor')
+    def test_invalidate(self, getTrackColor):
+        colors = McuTrackColors()
+        colors.Get(1)
+        colors.Get(2)
+        colors.Invalidate(1)
+        colors.Get(1)
+        colors.Get(2)
+        self.assertEqual(getTrackColor.call_count, 3)
+        colors.Invalidate()
+        colors.Get(2)
+        self.assertEqual(getTrackColor.call_count, 4)
+
+if __name__ == '__main__':
+    unittest.main()
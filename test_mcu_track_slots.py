@@ -0,0 +1,57 @@
+import unittest
+from unittest import mock
+
+import mcu_dirty_flags
+import device_XTouch
+
+class TestMcuTrackSlots(unittest.TestCase):
+
+    def setUp(self):
+        self.script = device_XTouch.TMackieCU()
+
+    def ShowTracks(self, trackNums: list):
+        """ Shows the given mixer tracks on the strips, like UpdateColT does """
+        for track, trackNum in zip(self.script.Tracks, trackNums):
+            track.TrackNum = trackNum
+            track.DirtyFlags = 0
+        self.script.UpdateTrackSlots()
+
+    def DirtyStrips(self):
+        return [i for i, track in enumerate(self.script.Tracks) if track.DirtyFlags != 0]
+
+    def test_track_on_two_strips(self):
+        self.ShowTracks([1, 2, 3, 0, 1, 2, 3, 0, 0]) # 4 tracks, the master track is on the last strip as well
+        self.assertEqual(self.script.TrackSlots[1], [0, 4])
+        self.assertEqual(self.script.TrackSlots[0], [3, 7, 8])
+        self.script.OnDirtyMixerTrack(1)
+        self.assertEqual(self.DirtyStrips(), [0, 4])
+
+    def test_changed_strips_rebuild_index(self):
+        self.ShowTracks(list(range(1, 9)) + [0])
+        self.assertTrue(self.script.IsTrackVisible(1))
+        self.ShowTracks(list(range(9, 17)) + [0])
+        self.assertFalse(self.script.IsTrackVisible(1))
+        self.assertEqual(self.script.TrackSlots[9], [0])
+        self.script.OnDirtyMixerTrack(1)
+        self.assertEqual(self.DirtyStrips(), [])
+        self.script.OnDirtyMixerTrack(9)
+        self.assertEqual(self.DirtyStrips(), [0])
+
+    def test_track_that_is_not_visible_is_ignored(self):
+        self.ShowTracks(list(range(1, 9)) + [0])
+        self.assertFalse(self.script.IsTrackVisible(50))
+        with mock.patch('tracknames.InvalidateTrackNames') as invalidateTrackNames, mock.patch.object(self.script.TrackColors, 'Invalidate') as invalidateColor, mock.patch('mixer.isTrackSolo') as isTrackSolo:
+            self.script.OnDirtyMixerTrack(50)
+        self.assertEqual(self.DirtyStrips(), [])
+        invalidateTrackNames.assert_not_called()
+        invalidateColor.assert_not_called()
+        isTrackSolo.assert_not_called()
+
+    def test_all_tracks(self):
+        self.ShowTracks(list(range(1, 9)) + [0])
+        self.script.OnDirtyMixerTrack(-1)
+        self.assertEqual(self.DirtyStrips(), list(range(0, 9)))
+        self.assertTrue(all(track.DirtyFlags & mcu_dirty_flags.Values == mcu_dirty_flags.Values for track in self.script.Tracks))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from unittest import mock
+
+import midi
+
+import mcu_buttons
+from benchmarks import benchmark_midi_dispatch
+
+class TestMidiDispatch(unittest.TestCase):
+
+    def test_baseline_handles_events_like_dispatch_table(self):
+        # the baseline is only a fair comparison as long as it takes the same decisions
+        scenarios = dict(benchmark_midi_dispatch.Scenarios)
+        scenarios.update({
+            'button release': (midi.MIDI_NOTEOFF, 0, mcu_buttons.Play, 0x00),
+            'unknown pitch bend': (midi.MIDI_PITCHBEND, 9, 0x00, 0x40),
+            'aftertouch': (midi.MIDI_CHANAFTERTOUCH, 0, 0x10, 0x00),
+        })
+        for name, (midiId, midiChan, data1, data2) in scenarios.items():
+            events = []
+            for onMidiMsg in benchmark_midi_dispatch.Implementations.values():
+                event = benchmark_midi_dispatch.MidiEvent(midiId, midiChan, data1, data2)
+                with mock.patch('transport.globalTransport') as globalTransport, mock.patch('mixer.enableTrack') as enableTrack:
+                    onMidiMsg(event)
+                events.append((event.handled, event.data1, event.inEv, event.outEv, globalTransport.call_args_list, enableTrack.call_args_list))
+            self.assertEqual(events[0], events[1], name)
+
+    def test_run(self):
+        results = benchmark_midi_dispatch.Run(iterations = 10, repeat = 1)
+        self.assertEqual(set(results.keys()), set(benchmark_midi_dispatch.Scenarios.keys()))
+        for byImplementation in results.values():
+            self.assertEqual(set(byImplementation.keys()), set(benchmark_midi_dispatch.Implementations.keys()))
+
+if __name__ == '__main__':
+    unittest.main()
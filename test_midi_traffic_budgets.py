@@ -0,0 +1,16 @@
+import unittest
+
+from benchmarks import benchmark_midi_traffic
+
+class TestMidiTrafficBudgets(unittest.TestCase):
+
+    def test_scenarios_are_within_budget(self):
+        results = benchmark_midi_traffic.Run()
+        failures = benchmark_midi_traffic.CheckBudgets(results, benchmark_midi_traffic.LoadBudgets())
+        self.assertEqual(failures, [])
+
+    def test_every_scenario_has_a_budget(self):
+        self.assertEqual(sorted(benchmark_midi_traffic.LoadBudgets().keys()), sorted(benchmark_midi_traffic.Scenarios.keys()))
+
+if __name__ == '__main__':
+    unittest.main()
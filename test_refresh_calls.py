@@ -0,0 +1,20 @@
+import unittest
+
+from benchmarks import benchmark_refresh_calls
+
+class TestRefreshCalls(unittest.TestCase):
+
+    def test_calls_are_reduced(self):
+        results = benchmark_refresh_calls.Run()
+        for name, (before, now) in results.items():
+            self.assertLessEqual(now, before, name)
+        before, now = results['Mixer_Display | Mixer_Controls']
+        self.assertLessEqual(now, before / 2)
+
+    def test_no_call_is_repeated_during_a_refresh(self):
+        # what's left are distinct values, one call per strip (see McuMixerSnapshot)
+        for name, calls in benchmark_refresh_calls.FindRepeatedCalls().items():
+            self.assertEqual(calls, [], name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import collections
+import unittest
+
+import midi
+import mcu_buttons
+from simulator import fl_simulator
+from benchmarks import benchmark_refresh_calls
+
+class TestFlSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = fl_simulator.FlSimulator()
+        self.main = self.simulator.LoadScript('device_XTouch.py')
+        self.extender = self.simulator.LoadScript('device_XTouch_Ext.py', receiverOf = self.main)
+        self.simulator.Init()
+
+    def tearDown(self):
+        self.simulator.Close()
+
+    def test_init_sends_to_all_devices(self):
+        self.assertTrue(any(message.kind == 'sysex' for message in self.main.output))
+        self.assertTrue(any(message.kind == 'sysex' for message in self.extender.output))
+
+    def test_extender_is_placed_next_to_main_unit(self):
+        self.assertEqual(self.main.script.MackieCU.Tracks[0].TrackNum, 9)
+        self.assertEqual(self.extender.script.MackieCU_Ext.Tracks[0].TrackNum, 1)
+
+    def test_bank_button_is_dispatched_to_extender(self):
+        self.simulator.ClearOutput()
+        self.simulator.SendMidi(self.main, midi.MIDI_NOTEON, 0, mcu_buttons.FaderBankRight, 0x7F)
+        self.simulator.Refresh()
+        self.assertEqual([message.receiverIndex for message in self.main.output if message.kind == 'dispatch'], [0])
+        self.assertEqual(self.extender.script.MackieCU_Ext.Tracks[0].TrackNum, 9)
+
+    def StripLeds(self, button: int):
+        return [(message.data >> 16) & 0x7F for message in self.main.output if message.kind == 'newMsg' and (message.data >> 8) & 0x7F == button]
+
+    def test_arm_from_fl_studio_updates_strip_led(self):
+        self.simulator.ClearOutput()
+        self.simulator.state.mixer.tracks[9].armed = True # track 9 is on the first strip of the main unit
+        self.simulator.state.SetDirty(9, midi.HW_Dirty_Mixer_Controls | midi.HW_Dirty_LEDs)
+        self.simulator.Refresh()
+        self.simulator.Idle()
+        self.assertEqual(self.StripLeds(mcu_buttons.Record_1), [0x7F])
+
+    def test_solo_from_fl_studio_updates_strip_led(self):
+        self.simulator.ClearOutput()
+        self.simulator.state.mixer.tracks[9].solo = True
+        self.simulator.state.SetDirty(9, midi.HW_Dirty_Mixer_Controls)
+        self.simulator.Refresh()
+        self.simulator.Idle()
+        self.assertEqual(self.StripLeds(mcu_buttons.Solo_1), [0x7F])
+
+    def test_automation_does_not_query_arm_and_solo_leds(self):
+        counts = collections.Counter()
+        benchmark_refresh_calls.CountCalls(counts)
+        # automation of the volume of track 9, which is on the first strip of the main unit
+        self.simulator.state.mixer.SetEventValue(self.main.script.MackieCU.Tracks[0].SliderEventID, 1000)
+        self.simulator.state.SetDirty(9, midi.HW_Dirty_Mixer_Controls)
+        self.simulator.Refresh()
+        self.assertEqual(counts['mixer.isTrackArmed'], 1) # the armed tracks of the rude solo led, which the strip compares with its arm led
+        self.assertEqual(counts['mixer.isTrackSolo'], 1) # compared with the solo led
+        self.assertEqual(counts['transport.isRecording'], 0)
+        self.assertGreater(counts['mixer.getEventValue'], 0) # the fader is updated
+
+    def test_fader_move_automates_mixer(self):
+        self.simulator.SendMidi(self.main, midi.MIDI_PITCHBEND, 0, 0, 0x7F)
+        self.simulator.Run(0.1)
+        eventId = self.main.script.MackieCU.Tracks[0].SliderEventID
+        self.assertGreater(self.simulator.state.mixer.GetEventValue(eventId), round(12800 / 16000 * midi.FromMIDI_Max))
+
+    def test_play_button(self):
+        self.simulator.SendMidi(self.main, midi.MIDI_NOTEON, 0, mcu_buttons.Play, 0x7F)
+        self.assertTrue(self.simulator.state.transport.playing)
+
+    def test_virtual_time(self):
+        self.simulator.ClearOutput()
+        self.simulator.state.mixer.tracks[9].peaks = 0.5
+        self.simulator.Run(1.0)
+        meterMessages = [message for message in self.main.output if message.kind == 'msg' and message.data & 0xF0 == midi.MIDI_CHANAFTERTOUCH]
+        self.assertGreater(len(meterMessages), 0)
+        self.assertTrue(all(0 < message.timestamp <= 1.0 for message in meterMessages))
+
+if __name__ == '__main__':
+    unittest.main()
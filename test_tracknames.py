@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+import tracknames
+
+class TestTransliterateToAscii(unittest.TestCase):
+
+    def test_ascii_is_kept(self):
+        self.assertEqual(tracknames.TransliterateToAscii('Kick 01 - (L/R)'), 'Kick 01 - (L/R)')
+
+    def test_single_character(self):
+        self.assertEqual(tracknames.TransliterateToAscii('Café'), 'Cafe')
+
+    def test_expansion(self):
+        self.assertEqual(tracknames.TransliterateToAscii('Straße'), 'Strasse')
+        self.assertEqual(tracknames.TransliterateToAscii('Щука'), 'Shchuka')
+
+    def test_expansion_is_ascii(self):
+        self.assertEqual(tracknames.TransliterateToAscii('Џ'), 'Dz')
+
+    def test_unknown_characters_are_removed(self):
+        self.assertEqual(tracknames.TransliterateToAscii('Bass\t中1\x7f'), 'Bass1')
+
+    def test_all_mapped_characters_are_ascii(self):
+        for char in tracknames.TransliterateMap:
+            self.assertTrue(all(32 <= ord(c) < 127 for c in tracknames.TransliterateToAscii(char)), char)
+
+class TestGetAsciiSafeTrackName(unittest.TestCase):
+
+    def setUp(self):
+        tracknames.InvalidateTrackNames()
+
+    def test_name_is_cached(self):
+        with mock.patch('mixer.getTrackName', return_value='Žica') as getTrackName:
+            self.assertEqual(tracknames.GetAsciiSafeTrackName(3), 'Zica')
+            self.assertEqual(tracknames.GetAsciiSafeTrackName(3), 'Zica')
+            self.assertEqual(getTrackName.call_count, 1)
+
+    def test_max_length(self):
+        with mock.patch('mixer.getTrackName', return_value='œuvre'):
+            self.assertEqual(tracknames.GetAsciiSafeTrackName(3, 4), 'oeuv')
+            self.assertEqual(tracknames.GetAsciiSafeTrackName(3), 'oeuvre')
+
+    def test_invalidate_track(self):
+        with mock.patch('mixer.getTrackName', return_value='Old'):
+            tracknames.GetAsciiSafeTrackName(1)
+            tracknames.GetAsciiSafeTrackName(2)
+        tracknames.InvalidateTrackNames(1)
+        with mock.patch('mixer.getTrackName', return_value='New'):
+            self.assertEqual(tracknames.GetAsciiSafeTrackName(1), 'New')
+            self.assertEqual(tracknames.GetAsciiSafeTrackName(2), 'Old')
+
+    def test_invalidate_all(self):
+        with mock.patch('mixer.getTrackName', return_value='Old'):
+            tracknames.GetAsciiSafeTrackName(1)
+        tracknames.InvalidateTrackNames()
+        with mock.patch('mixer.getTrackName', return_value='New'):
+            self.assertEqual(tracknames.GetAsciiSafeTrackName(1), 'New')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -88,9 +88,9 @@ TransliterateMap = {
     '\u0427': 'Ch', '\u0447': 'ch',
     '\u0428': 'Sh', '\u0448': 'sh',
     '\u0429': 'Shch', '\u0449': 'shch',
-    '\u042a': ''', '\u044a': ''',
+    '\u042a': "'", '\u044a': "'",
     '\u042b': 'Y', '\u044b': 'y',
-    '\u042c': ''', '\u044c': ''',
+    '\u042c': "'", '\u044c': "'",
     '\u042d': 'E', '\u044d': 'e',
     '\u042e': 'Iu', '\u044e': 'iu',
     '\u042f': 'Ia', '\u044f': 'ia',
@@ -124,24 +124,53 @@ TransliterateMap = {
     u'Џ': 'Dž'
 }
 
+class TransliterateTable(dict):
+    ''' Table for str.translate, characters that are not in the table are kept when they are printable ASCII and removed otherwise '''
+    def __missing__(self, code):
+        # Screens are small, so just ignore values it does not know how to transliterate
+        value = chr(code) if 32 <= code < 127 else None
+        self[code] = value
+        return value
+
+def BuildTransliterateTable(transliterateMap) -> TransliterateTable:
+    ''' Compiles the transliteration map, expansions that contain non-ascii characters themselves are transliterated once here '''
+    table = TransliterateTable((ord(char), transchar) for char, transchar in transliterateMap.items())
+    for code, transchar in list(table.items()):
+        table[code] = transchar.translate(table)
+    return table
+
+TransliterateTableCompiled = BuildTransliterateTable(TransliterateMap)
+
+TrackNameCache = {} # track index -> { max length -> ASCII safe name }
+TransliterateCache = {} # name -> ASCII safe name
+TransliterateCacheSize = 1024 # the cache is cleared when it grows beyond this number of names
+
 def GetAsciiSafeTrackName(index: int, maxLength: int = 0) -> str:
-    ''' Gets an ASCII compatible track name value '''
+    ''' Gets an ASCII compatible track name value, names are cached until InvalidateTrackNames is called for the track '''
+    names = TrackNameCache.setdefault(index, {})
+    if maxLength in names:
+        return names[maxLength]
+
     unicodeTrackName = mixer.getTrackName(index, maxLength)
     transliterated = TransliterateToAscii(unicodeTrackName)
     if maxLength > 0:
         transliterated = transliterated[:maxLength]
+    names[maxLength] = transliterated
     return transliterated
 
+def InvalidateTrackNames(index: int = -1):
+    ''' Forgets the cached name of a track (e.g. when it was renamed), or of all tracks when the index is -1 '''
+    if index == -1:
+        TrackNameCache.clear()
+    else:
+        TrackNameCache.pop(index, None)
+
 def TransliterateToAscii(unicodeValue):
     ''' Gets an ASCII compatible value for non-ascii characters (Basic Transliteration) '''
-    converted = ''
-    for char in unicodeValue:
-        transchar = ''
-        if char in TransliterateMap: # not ascii compatible, but is known in the dictionairy
-            transchar = TransliterateMap[char]
-        elif 32 <= ord(char) < 127: # ascii printable characters
-            transchar = char
-        else: # Screens are small, so just ignore values it does not know how to transliterate
-            transchar = ''
-        converted += transchar
+    converted = TransliterateCache.get(unicodeValue)
+    if converted is None:
+        if len(TransliterateCache) >= TransliterateCacheSize:
+            TransliterateCache.clear()
+        converted = unicodeValue.translate(TransliterateTableCompiled)
+        TransliterateCache[unicodeValue] = converted
     return converted